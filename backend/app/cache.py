@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class HitCounter:
+    """
+    キャッシュのヒット数・ミス数（スレッドセーフ）
+
+    TTLCache・ContentReadCache・MetadataCache で共通に使い、
+    stats() の hits / misses / hit_rate を同じ形式で返す。
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """ヒット数・ミス数・ヒット率を返す"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class TTLCache:
+    """
+    有効期限（TTL）付きのLRUキャッシュ（プロセス内・スレッドセーフ）
+
+    Args:
+        maxsize (int): 保持する最大件数。超えた場合は最も古く参照されたものから削除
+        ttl (float): 既定の有効期限（秒）
+        timer (Callable[[], float]): 現在時刻を返す関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.counter = HitCounter()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    del self._data[key]
+                self.counter.record(hit=False)
+                return default
+            self._data.move_to_end(key)
+            self.counter.record(hit=True)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        self.counter.reset()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """ヒット数・ミス数・ヒット率・件数を返す"""
+        return {**self.counter.stats(), "size": len(self)}
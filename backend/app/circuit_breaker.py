@@ -0,0 +1,135 @@
+"""
+外部API（作品メタデータの提供元）ごとのサーキットブレーカー
+
+連続して失敗した提供元への呼び出しを一定時間止め（open）、
+期限後は1件だけ試行（half-open）して成功すれば再開（closed）する。
+提供元の障害時にリクエストがタイムアウトを待ち続けないようにする。
+"""
+
+import threading
+import time
+from typing import Any, Callable
+
+from app.config import settings
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため呼び出さなかった場合の例外"""
+
+
+class CircuitBreaker:
+    """
+    Args:
+        name (str): 提供元の名前
+        failure_threshold (int): openにする連続失敗回数
+        reset_timeout (float): openからhalf-openに移るまでの時間（秒）
+        timer (Callable[[], float]): 現在時刻を返す関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timer = timer
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """呼び出してよいかを返す（half-openでは試行中の1件のみ許可）"""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN:
+                if self.timer() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = STATE_HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state == STATE_HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = STATE_OPEN
+                self.opened_at = self.timer()
+            self._probing = False
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        func を呼び出し、結果に応じて状態を更新する
+
+        :raises CircuitOpenError: openのため呼び出さなかった場合
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """提供元ごとのサーキットブレーカーを返す（プロセス内で共有）"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.circuit_breaker_failure_threshold,
+                reset_timeout=settings.circuit_breaker_reset_timeout,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        for breaker in _breakers.values():
+            breaker.reset()
+
+
+def breaker_states() -> dict:
+    """提供元ごとの状態と連続失敗回数を返す"""
+    with _breakers_lock:
+        return {
+            name: {"state": breaker.state, "failures": breaker.failures}
+            for name, breaker in _breakers.items()
+        }
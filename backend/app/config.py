@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    アプリケーション全体の設定（環境変数から読み込み、プロセスで1回のみ生成）
+
+    フィールド名を大文字にした環境変数の値が設定される（例: aws_region -> AWS_REGION）
+    """
+
+    # AWS共通
+    aws_region: str = "ap-northeast-1"
+    environment: str = "local"
+    domain: Optional[str] = None
+
+    # DynamoDB
+    dynamodb_content_table_name: str = "ContentTable"
+    dynamodb_user_table_name: str = "USER"
+    dynamodb_max_pool_connections: int = 50
+    dynamodb_connect_timeout: float = 2
+    dynamodb_read_timeout: float = 5
+    dynamodb_max_attempts: int = 5
+    dynamodb_tcp_keepalive: bool = True
+    # 集計アイテムのデータ移行（python -m app.db.migrations summary）が完了済みか
+    # Trueの場合、書き込みで作成される集計アイテムを集計済みとして扱う
+    content_summary_backfilled: bool = False
+
+    # Cognito / Google ログイン
+    cognito_user_pool_id: Optional[str] = None
+    cognito_app_client_id: Optional[str] = None
+    cognito_domain: Optional[str] = None
+    google_client_id: Optional[str] = None
+    redirect_uri: Optional[str] = None
+
+    # 認証関連のキャッシュ
+    jwks_cache_lifespan: int = 3600
+    jwks_fetch_timeout: int = 5
+    id_token_cache_maxsize: int = 1024
+    user_profile_cache_ttl: float = 60
+    user_profile_cache_maxsize: int = 1024
+
+    # 外部API呼び出し（読み取りタイムアウトは external_api_timeout）
+    http_connect_timeout: float = 2
+    http_max_retries: int = 2
+    http_backoff_factor: float = 0.2
+    http_backoff_jitter: float = 0.2
+    http_pool_maxsize: int = 10
+    http_hedge_enabled: bool = False
+    http_hedge_min_samples: int = 20
+
+    # 外部APIの提供元ごとのサーキットブレーカー
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout: float = 30
+
+    # レコメンド
+    bedrock_region: str = "ap-northeast-1"
+    tmdb_api_key: Optional[str] = None
+    external_api_timeout: float = 5
+    recommendation_lookup_workers: int = 6
+    recommendation_lookup_budget: float = 8
+    recommendation_cache_ttl: float = 6 * 60 * 60
+    recommendation_degraded_cache_ttl: float = 60
+    recommendation_cache_maxsize: int = 1024
+
+    # レコメンドの非同期ジョブ（memory / dynamodb）
+    recommendation_job_backend: str = "memory"
+    recommendation_job_table_name: str = "RecommendationJob"
+    recommendation_job_ttl: float = 60 * 60
+    # 待機中・実行中のまま止まったとみなすまでの秒数（ワーカーの実行時間の上限より長くする）
+    recommendation_job_stale_after: float = 5 * 60
+    recommendation_job_workers: int = 2
+    recommendation_job_function_name: Optional[str] = None
+
+    # 外部APIの作品メタデータキャッシュ（memory / sqlite / dynamodb）
+    metadata_cache_backend: str = "memory"
+    metadata_cache_maxsize: int = 10000
+    metadata_cache_positive_ttl: float = 7 * 24 * 60 * 60
+    metadata_cache_negative_ttl: float = 60 * 60
+    metadata_cache_sqlite_path: str = "/tmp/metadata_cache.sqlite3"
+    metadata_cache_table_name: str = "MetadataCache"
+
+    # 一覧・直近の履歴の読み取りキャッシュ（プロセス内、書き込み時に破棄）
+    content_read_cache_enabled: bool = True
+    content_read_cache_ttl: float = 30
+    content_read_cache_maxsize: int = 1024
+    # 書き込み後に読み取り結果を保存し始めるまでの秒数（GSIの反映待ち）
+    content_read_cache_settle_seconds: float = 5
+    # データのバージョンの加算から一覧APIのETagを返すまでの秒数（GSIの反映待ち）
+    content_etag_settle_seconds: float = 5
+
+    # コンテンツの一括登録（1回の取り込みの最大行数・1回に書き込む行数）
+    bulk_import_max_rows: int = 5000
+    bulk_import_chunk_size: int = 100
+
+    # 運用向けの診断情報（未設定の場合は /diagnostics を公開しない）
+    diagnostics_token: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    # ローカル開発用の.envを読み込んだ上で設定を生成
+    load_dotenv()
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,182 @@
+"""
+content_crud の非同期版
+
+boto3 は同期APIのため、各DB操作をスレッドプールで実行し、
+DynamoDBの応答待ちの間もイベントループが他のリクエストを処理できるようにする。
+引数・返却値・例外は content_crud の同名関数と同じ。
+（同期版の content_crud はデータ移行スクリプトやテストから引き続き利用する）
+"""
+
+from typing import Any, AsyncIterator, List, Optional
+
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.crud import content_crud
+from app.schemas.content import ContentData, RegisterContentData, watchlistData
+
+
+async def add_content(content: RegisterContentData, table: Any):
+    return await run_in_threadpool(content_crud.add_content, content, table)
+
+
+async def update_content(content: RegisterContentData, table: Any):
+    return await run_in_threadpool(content_crud.update_content, content, table)
+
+
+async def get_existing_contents(
+    user_id: str, table: Any, content_ids: List[str]
+) -> dict[str, dict]:
+    return await run_in_threadpool(
+        content_crud.get_existing_contents, user_id, table, content_ids
+    )
+
+
+async def batch_add_contents(
+    user_id: str, contents: List[RegisterContentData], table: Any
+) -> None:
+    return await run_in_threadpool(
+        content_crud.batch_add_contents, user_id, contents, table
+    )
+
+
+async def get_contents_by_ids(
+    user_id: str,
+    table: Any,
+    content_ids: List[str],
+    attributes: Optional[List[str]] = None,
+) -> dict[str, dict]:
+    return await run_in_threadpool(
+        content_crud.get_contents_by_ids,
+        user_id,
+        table,
+        content_ids,
+        attributes,
+    )
+
+
+async def get_search_postings(
+    user_id: str, table: Any, tokens: List[str]
+) -> Optional[dict[str, set[str]]]:
+    return await run_in_threadpool(
+        content_crud.get_search_postings, user_id, table, tokens
+    )
+
+
+async def update_best(
+    ranked: List[ContentData], unranked: list[dict], table: Any
+) -> None:
+    return await run_in_threadpool(
+        content_crud.update_best, ranked, unranked, table
+    )
+
+
+async def get_user_summary(user_id: str, table: Any) -> Optional[dict]:
+    return await run_in_threadpool(
+        content_crud.get_user_summary, user_id, table
+    )
+
+
+async def get_data_version(
+    user_id: str, table: Any
+) -> tuple[int, Optional[float]]:
+    return await run_in_threadpool(
+        content_crud.get_data_version, user_id, table
+    )
+
+
+async def get_years(userId: str, table: Any):
+    return await run_in_threadpool(content_crud.get_years, userId, table)
+
+
+async def query_year_contents_page(
+    user_id: str,
+    table: Any,
+    year: int,
+    limit: Optional[int] = None,
+    exclusive_start_key: Optional[dict] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    return await run_in_threadpool(
+        content_crud.query_year_contents_page,
+        user_id,
+        table,
+        year,
+        limit,
+        exclusive_start_key,
+    )
+
+
+async def query_year_contents_by_date_page(
+    user_id: str,
+    table: Any,
+    year: int,
+    limit: Optional[int] = None,
+    exclusive_start_key: Optional[dict] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    return await run_in_threadpool(
+        content_crud.query_year_contents_by_date_page,
+        user_id,
+        table,
+        year,
+        limit,
+        exclusive_start_key,
+    )
+
+
+async def iter_year_contents(
+    user_id: str, table: Any, year: int, page_size: Optional[int] = None
+) -> AsyncIterator[dict]:
+    # 1ページずつスレッドプールで取得し、全ページ分を遅延して返す
+    start_key = None
+    while True:
+        items, start_key = await query_year_contents_page(
+            user_id, table, year, page_size, start_key
+        )
+        for item in items:
+            yield item
+        if not start_key:
+            break
+
+
+async def get_year_contents(user_id: str, table: Any, year: int) -> list[dict]:
+    return await run_in_threadpool(
+        content_crud.get_year_contents, user_id, table, year
+    )
+
+
+async def get_year_best(user_id: str, year: int, table: Any) -> list[dict]:
+    return await run_in_threadpool(
+        content_crud.get_year_best, user_id, year, table
+    )
+
+
+async def add_watchlist(content: watchlistData, table: Any):
+    return await run_in_threadpool(content_crud.add_watchlist, content, table)
+
+
+async def get_watchlist_contents(user_id: str, table: Any) -> list[dict]:
+    return await run_in_threadpool(
+        content_crud.get_watchlist_contents, user_id, table
+    )
+
+
+async def iter_user_content_pages(
+    user_id: str, table: Any, page_size: Optional[int] = None
+) -> AsyncIterator[list[dict]]:
+    # 1ページずつスレッドプールで取得する
+    pages = content_crud.iter_user_content_pages(user_id, table, page_size)
+    async for page in iterate_in_threadpool(pages):
+        yield page
+
+
+async def delete_watchlist_contents(user_id: str, table: Any, content_id: str):
+    return await run_in_threadpool(
+        content_crud.delete_watchlist_contents, user_id, table, content_id
+    )
+
+
+async def get_recent_contents(
+    user_id: str, table: Any, content_type: str
+) -> list[dict]:
+    return await run_in_threadpool(
+        content_crud.get_recent_contents, user_id, table, content_type
+    )
@@ -1,90 +1,938 @@
-from typing import Any, List
+import time
+import traceback
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional
 
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 
+from app.config import settings
 from app.schemas.content import ContentData, RegisterContentData, watchlistData
+from app.search_tokenizer import index_tokens
 
+# ウォッチリスト状態を表すstatusの値
+WATCHLIST_STATUS = "to_watch"
+# ウォッチリスト用スパースGSI（userId + watchlist_at）
+WATCHLIST_INDEX = "WatchlistIndex"
+WATCHLIST_SORT_KEY = "watchlist_at"
 
-def add_content(content: RegisterContentData, table: Any):
+# 年間ベスト用GSI（userId + year_rank）。year_rankは「年度#順位(0埋め4桁)」
+YEAR_RANK_INDEX = "YearRankIndex"
+YEAR_RANK_KEY = "year_rank"
+
+# 年度別の一覧を日付順にページングするGSI（userId + year_date）
+# year_dateは「年度#日付」。年度のあるコンテンツのみ索引される
+YEAR_DATE_INDEX = "YearDateIndex"
+YEAR_DATE_KEY = "year_date"
+
+# transact_write_itemsで1回に実行できるアイテム数の上限
+TRANSACT_WRITE_LIMIT = 100
+# batch_get_itemで1回に取得できるキー数の上限
+BATCH_GET_LIMIT = 100
+# batch_write_itemで1回に書き込めるアイテム数の上限
+BATCH_WRITE_LIMIT = 25
+# batch_write_itemの未処理のアイテム（UnprocessedItems）を送信する回数の上限
+BATCH_WRITE_MAX_ATTEMPTS = 8
+
+# ユーザー単位の集計アイテム（年度・種別ごとの件数）
+# yearを持たないため各GSIには索引されない
+# システムのアイテムのcontentIdは RESERVED_CONTENT_ID_PREFIX（"#"）で始める
+SUMMARY_CONTENT_ID = "#summary"
+SUMMARY_COUNT_PREFIX = "count#"
+# ユーザー単位のデータのバージョン（集計アイテムの属性）
+# コンテンツを変更する全ての書き込みで1ずつ加算し、一覧APIのETagに使う
+DATA_VERSION_ATTRIBUTE = "version"
+# データのバージョンを加算した時刻（エポックミリ秒、集計アイテムの属性）
+# GSIは結果整合性のため、書き込み直後の一覧は変更前の場合がある。
+# 加算から一定時間はETagを返さず、変更前の一覧に新しいETagが付かないようにする
+DATA_WRITTEN_AT_ATTRIBUTE = "written_at"
+# 既存アイテムから件数を集計済みであることを示す属性（集計アイテムの属性）
+# データ移行前の書き込みで作成された集計アイテムは一部の件数しか含まないため、
+# この属性がない集計アイテムの件数は使わない
+SUMMARY_COMPLETE_ATTRIBUTE = "complete"
+# データ移行の完了後は、書き込みで作成される集計アイテムも集計済みとする
+# （移行前から登録済みのユーザーの集計アイテムは全てデータ移行で作成済みのため）
+SUMMARY_BACKFILLED = settings.content_summary_backfilled
+
+# ユーザー単位の全文検索の転置インデックス
+# トークンをハッシュでバケットに、コンテンツIDをハッシュでページに振り分け、
+# バケット×ページごとに1アイテム（contentId="#search#07#03" 形式）とし、
+# トークンを属性名、コンテンツIDの文字列セットを値として保持する
+# 1アイテムにはユーザーのコンテンツの約1/SEARCH_PAGESの、バケットのトークン分が入るため、
+# アイテムサイズは登録件数に比例して増える（タイトル12文字・メモ40文字（約90トークン）、
+# UUIDのコンテンツIDで試算すると最大のアイテムは2,000件で約34KB、20,000件で約316KB）。
+# アイテムサイズの上限400KBを超えると更新に失敗し、失敗の記録により全件からの検索に
+# 切り替わるため、2万件を大きく超えるユーザーが出る場合はSEARCH_PAGESを増やして再作成する
+# yearを持たないため各GSIには索引されない
+# バケット数・ページ数を変更した場合は python -m app.db.migrations search_index で再作成すること
+SEARCH_CONTENT_ID_PREFIX = "#search#"
+SEARCH_BUCKETS = 32
+SEARCH_PAGES = 16
+# 1回の更新式に含めるトークン数の上限（更新式の長さの上限対策）
+SEARCH_UPDATE_TOKENS = 50
+# 転置インデックスの更新のトランザクションを送信する回数の上限
+# （同じアイテムを更新する他のトランザクションとの競合で取り消された場合に再送する。
+# ADD・DELETEは冪等のため再送しても結果は変わらない）
+SEARCH_TRANSACT_ATTEMPTS = 3
+# 転置インデックスの更新に失敗したことを記録するアイテム
+# 記録がある間は転置インデックスを使わずに全件から検索する（search_index のデータ移行で削除）
+SEARCH_STATE_CONTENT_ID = "#search"
+SEARCH_STALE_ATTRIBUTE = "stale"
+
+# コンテンツ編集時の更新式（ウォッチリストから登録済みになるためstatusを削除）
+UPDATE_CONTENT_SET_EXPRESSION = (
+    "SET #ty = :ty, #ti = :ti, #d = :d, #y = :y, #n = :n, #l = :l"
+)
+UPDATE_CONTENT_REMOVE_EXPRESSION = "REMOVE #s, #wa"
+
+
+def year_rank_value(year: Any, rank: Any) -> str:
+    # 文字列比較で順位順に並ぶよう順位を0埋めする（例: 2024#0003）
+    return f"{int(year)}#{int(rank):04d}"
+
+
+def year_date_value(year: Any, date: str) -> str:
+    # 年度で前方一致し、年度内は日付の文字列順に並ぶ（例: 2024#2024-01-02）
+    return f"{int(year)}#{date}"
+
+
+def _content_item(content: RegisterContentData) -> dict:
+    # 登録するアイテム（年度のあるコンテンツにはYearDateIndexのソートキーを付与）
     item = content.dict()
-    table.put_item(Item=item)
+    if item.get("year") is not None:
+        item[YEAR_DATE_KEY] = year_date_value(item["year"], item["date"])
+    return item
 
 
-def update_content(content: RegisterContentData, table: Any):
-    response = table.update_item(
-        Key={"contentId": content.contentId, "userId": content.userId},
-        UpdateExpression="SET #ty = :ty, #ti = :ti, #d = :d, #y = :y, #n = :n,\
-            #l = :l REMOVE #s",
-        ConditionExpression="attribute_exists(userId) AND\
-            attribute_exists(contentId)",
+def _summary_key(user_id: str) -> dict:
+    return {"contentId": SUMMARY_CONTENT_ID, "userId": user_id}
+
+
+def summary_count_attributes(year: Any, content_type: Any) -> list[str]:
+    # 年度別・年度×種別の件数を保持する属性名（例: count#2024, count#2024#movie）
+    if year is None:
+        return []
+    attributes = [f"{SUMMARY_COUNT_PREFIX}{int(year)}"]
+    if content_type:
+        type_value = getattr(content_type, "value", content_type)
+        attributes.append(f"{SUMMARY_COUNT_PREFIX}{int(year)}#{type_value}")
+    return attributes
+
+
+def _summary_deltas(old: Optional[dict], new: Optional[dict]) -> dict:
+    # 変更前後のアイテムから集計アイテムの増減値を算出（増減なしの属性は除外）
+    deltas = {}
+    for item, sign in ((old, -1), (new, 1)):
+        if not item:
+            continue
+        for name in summary_count_attributes(
+            item.get("year"), item.get("type")
+        ):
+            deltas[name] = deltas.get(name, 0) + sign
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def _summary_add_args(user_id: str, deltas: dict) -> dict:
+    # 集計アイテムの件数とデータのバージョンを加算し、加算した時刻を記録する更新式
+    names = {"#v": DATA_VERSION_ATTRIBUTE}
+    values = {":v": 1}
+    clauses = ["#v :v"]
+    for i, (name, delta) in enumerate(sorted(deltas.items())):
+        names[f"#c{i}"] = name
+        values[f":c{i}"] = delta
+        clauses.append(f"#c{i} :c{i}")
+    names["#wt"] = DATA_WRITTEN_AT_ATTRIBUTE
+    values[":wt"] = int(time.time() * 1000)
+    assignments = ["#wt = :wt"]
+    if SUMMARY_BACKFILLED:
+        names["#cm"] = SUMMARY_COMPLETE_ATTRIBUTE
+        values[":cm"] = True
+        assignments.append("#cm = :cm")
+    expression = "ADD " + ", ".join(clauses) + " SET " + ", ".join(assignments)
+    return {
+        "Key": _summary_key(user_id),
+        "UpdateExpression": expression,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+
+
+def bump_data_version(user_id: str, table: Any) -> None:
+    """
+    ユーザーのデータのバージョンを加算するメソッド。
+    集計アイテムを更新しない書き込みの後に呼び出す
+    （書き込みより先に加算すると、変更前のデータに新しいETagが付く場合があるため）。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: なし
+    """
+    table.update_item(**_summary_add_args(user_id, {}))
+
+
+def get_data_version(user_id: str, table: Any) -> tuple[int, Optional[float]]:
+    """
+    ユーザーのデータのバージョンと最後に加算した時刻を取得するメソッド。
+    直前の書き込みを反映するため強い整合性で読み込む。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: データのバージョン（集計アイテムが未作成の場合は0）と、
+        最後に加算した時刻（エポック秒。記録前の集計アイテムの場合はNone）
+    """
+    response = table.get_item(
+        Key=_summary_key(user_id),
+        ProjectionExpression="#v, #wt",
         ExpressionAttributeNames={
-            "#ty": "type",
-            "#ti": "title",
-            "#d": "date",
-            "#y": "year",
-            "#n": "notes",
-            "#l": "link",
-            "#s": "status",
+            "#v": DATA_VERSION_ATTRIBUTE,
+            "#wt": DATA_WRITTEN_AT_ATTRIBUTE,
         },
-        ExpressionAttributeValues={
-            ":ty": content.type,
-            ":ti": content.title,
-            ":d": content.date,
-            ":y": content.year,
-            ":n": content.notes,
-            ":l": content.link,
-        },
-        ReturnValues="ALL_NEW",  # 更新後の完全なアイテムを返却
+        ConsistentRead=True,
+    )
+    item = response.get("Item", {})
+    written_at = item.get(DATA_WRITTEN_AT_ATTRIBUTE)
+    return (
+        int(item.get(DATA_VERSION_ATTRIBUTE, 0)),
+        None if written_at is None else int(written_at) / 1000,
     )
-    return response.get("Attributes")
 
 
-def update_best(contents: List[ContentData], table: Any):
-    for content in contents:
-        table.update_item(
-            Key={"contentId": content.contentId, "userId": content.userId},
-            UpdateExpression="SET #rnk = :r",
-            ExpressionAttributeNames={
-                "#rnk": "rank"  # rank をエイリアス #rnk として定義
-            },
-            ExpressionAttributeValues={":r": content.rank},
-        )
+def _summary_update(user_id: str, table: Any, deltas: dict) -> dict:
+    # 集計アイテムを更新するトランザクション要素を作成
+    return {
+        "Update": {
+            "TableName": table.name,
+            **_summary_add_args(user_id, deltas),
+        }
+    }
 
 
-def delete_best(contents: list[ContentData], table: Any):
-    for content in contents:
-        table.update_item(
-            Key={
-                "contentId": content["contentId"],
-                "userId": content["userId"],
-            },
-            UpdateExpression="REMOVE #rnk",  # エイリアスを使用
-            ExpressionAttributeNames={
-                "#rnk": "rank"  # rank をエイリアス #rnk として定義
+def search_bucket_id(token: str) -> str:
+    # トークンを振り分けるバケット（ページのアイテムのcontentIdの接頭辞）
+    bucket = zlib.crc32(token.encode()) % SEARCH_BUCKETS
+    return f"{SEARCH_CONTENT_ID_PREFIX}{bucket:02d}"
+
+
+def search_item_id(token: str, content_id: str) -> str:
+    # トークン・コンテンツIDを保持するバケット×ページのアイテムのcontentId
+    page = zlib.crc32(content_id.encode()) % SEARCH_PAGES
+    return f"{search_bucket_id(token)}#{page:02d}"
+
+
+def search_bucket_item_ids(bucket_id: str) -> list[str]:
+    # バケットの全ページのアイテムのcontentId
+    return [f"{bucket_id}#{page:02d}" for page in range(SEARCH_PAGES)]
+
+
+def search_index_tokens(item: Optional[dict]) -> set[str]:
+    # 登録済みのコンテンツ（yearあり）のタイトル・メモのみ索引する
+    if not item or item.get("year") is None:
+        return set()
+    return index_tokens(item.get("title"), item.get("notes"))
+
+
+def _search_item_updates(
+    user_id: str, table: Any, item_id: str, postings: dict[str, dict]
+) -> Iterator[dict]:
+    # 1アイテム分のトークンにコンテンツIDを追加（ADD）・削除（DELETE）する
+    # トランザクション要素（SEARCH_UPDATE_TOKENS件ごとに1要素とする）
+    clauses = [
+        (action, token, ids)
+        for action in ("ADD", "DELETE")
+        for token, ids in sorted(postings.get(action, {}).items())
+    ]
+    while clauses:
+        chunk = clauses[:SEARCH_UPDATE_TOKENS]
+        clauses = clauses[SEARCH_UPDATE_TOKENS:]
+        expression = []
+        for action in ("ADD", "DELETE"):
+            parts = [
+                f"#t{i} :t{i}"
+                for i, (clause_action, _, _) in enumerate(chunk)
+                if clause_action == action
+            ]
+            if parts:
+                expression.append(f"{action} " + ", ".join(parts))
+        yield {
+            "Update": {
+                "TableName": table.name,
+                "Key": {"contentId": item_id, "userId": user_id},
+                "UpdateExpression": " ".join(expression),
+                "ExpressionAttributeNames": {
+                    f"#t{i}": token for i, (_, token, _) in enumerate(chunk)
+                },
+                "ExpressionAttributeValues": {
+                    f":t{i}": ids for i, (_, _, ids) in enumerate(chunk)
+                },
+            }
+        }
+
+
+def _transact_search_updates(table: Any, updates: List[dict]) -> None:
+    # 競合で取り消された場合は待機時間を延ばしながら再送する
+    for attempt in range(SEARCH_TRANSACT_ATTEMPTS):
+        if attempt:
+            time.sleep(min(0.05 * 2**attempt, 1))
+        try:
+            table.meta.client.transact_write_items(TransactItems=updates)
+            return
+        except ClientError as e:
+            reasons = {
+                reason.get("Code")
+                for reason in e.response.get("CancellationReasons", [])
+            }
+            if (
+                "TransactionConflict" not in reasons
+                or attempt == SEARCH_TRANSACT_ATTEMPTS - 1
+            ):
+                raise
+
+
+def update_search_index(
+    user_id: str,
+    table: Any,
+    changes: List[tuple[Optional[dict], Optional[dict]]],
+) -> None:
+    """
+    コンテンツの変更前後のアイテムから転置インデックスを差分更新するメソッド。
+    アイテムごとの追加・削除を1つの更新式にまとめ、transact_write_itemsで
+    TRANSACT_WRITE_LIMIT件ずつ更新する（1件の登録・編集は最大SEARCH_BUCKETS件の
+    アイテムの更新のため、1回のリクエストで済む）。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param changes: (変更前のアイテム, 変更後のアイテム) のリスト。
+        新規登録の場合は変更前、削除の場合は変更後をNoneとする
+    :return: なし
+    """
+    # アイテム -> ADD/DELETE -> トークン -> コンテンツIDのセット
+    postings: dict[str, dict[str, dict]] = {}
+    for old, new in changes:
+        content_id = (new or old)["contentId"]
+        before = search_index_tokens(old)
+        after = search_index_tokens(new)
+        for action, tokens in (
+            ("ADD", after - before),
+            ("DELETE", before - after),
+        ):
+            for token in tokens:
+                item_id = search_item_id(token, content_id)
+                postings.setdefault(item_id, {}).setdefault(
+                    action, {}
+                ).setdefault(token, set()).add(content_id)
+
+    # 同じトークンの追加と削除は1つの更新式に含められないため、後で削除を別に実行する
+    conflicts: dict[str, dict[str, dict]] = {}
+    for item_id, actions in postings.items():
+        for token in set(actions.get("ADD", {})) & set(
+            actions.get("DELETE", {})
+        ):
+            conflicts.setdefault(item_id, {}).setdefault("DELETE", {})[
+                token
+            ] = actions["DELETE"].pop(token)
+
+    for batch in (postings, conflicts):
+        # 1回のトランザクションには同じアイテムを2回含められないため、
+        # 同じアイテムの2件目以降の要素は次のトランザクションに回す
+        transactions: List[List[dict]] = []
+        for item_id, actions in sorted(batch.items()):
+            updates = _search_item_updates(user_id, table, item_id, actions)
+            for i, update in enumerate(updates):
+                while len(transactions) <= i:
+                    transactions.append([])
+                transactions[i].append(update)
+        for updates in transactions:
+            while updates:
+                chunk = updates[:TRANSACT_WRITE_LIMIT]
+                updates = updates[TRANSACT_WRITE_LIMIT:]
+                _transact_search_updates(table, chunk)
+
+
+def mark_search_index_stale(user_id: str, table: Any) -> None:
+    """
+    転置インデックスの更新に失敗したことを記録するメソッド。
+    記録がある間の検索は転置インデックスを使わずに全件から行う
+    （python -m app.db.migrations search_index で再作成すると記録は削除される）。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: なし
+    """
+    table.update_item(
+        Key={"contentId": SEARCH_STATE_CONTENT_ID, "userId": user_id},
+        UpdateExpression="SET #s = :s",
+        ExpressionAttributeNames={"#s": SEARCH_STALE_ATTRIBUTE},
+        ExpressionAttributeValues={":s": True},
+    )
+
+
+def _refresh_search_index(
+    user_id: str,
+    table: Any,
+    changes: List[tuple[Optional[dict], Optional[dict]]],
+) -> None:
+    # 転置インデックスの更新に失敗してもコンテンツの書き込みは成功とする
+    # （検索結果は取得したコンテンツで再確認するため、不要なトークンは無視される。
+    # トークンが欠けると検索で見つからなくなるため、失敗を記録して全件からの検索に切り替える。
+    # python -m app.db.migrations search_index で再作成できる）
+    try:
+        update_search_index(user_id, table, changes)
+    except Exception:
+        traceback.print_exc()
+        try:
+            mark_search_index_stale(user_id, table)
+        except Exception:
+            traceback.print_exc()
+
+
+def get_search_postings(
+    user_id: str, table: Any, tokens: List[str]
+) -> Optional[dict[str, set[str]]]:
+    """
+    転置インデックスからトークンごとのコンテンツIDを取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param tokens: 検索語のトークン
+    :return: トークンごとのコンテンツIDのセット（該当なしのトークンは含まない）。
+        転置インデックスの更新に失敗している場合None
+    """
+    tokens = sorted(set(tokens))
+    # トークンのバケットの全ページを取得する
+    item_ids = [
+        item_id
+        for bucket_id in sorted({search_bucket_id(t) for t in tokens})
+        for item_id in search_bucket_item_ids(bucket_id)
+    ]
+    items = get_contents_by_ids(
+        user_id,
+        table,
+        [SEARCH_STATE_CONTENT_ID, *item_ids],
+        [*tokens, SEARCH_STALE_ATTRIBUTE],
+    )
+    if items.pop(SEARCH_STATE_CONTENT_ID, {}).get(SEARCH_STALE_ATTRIBUTE):
+        return None
+
+    postings = {}
+    for item in items.values():
+        for token in tokens:
+            if item.get(token):
+                postings.setdefault(token, set()).update(item[token])
+    return postings
+
+
+def add_content(content: RegisterContentData, table: Any):
+    item = _content_item(content)
+    deltas = _summary_deltas(None, item)
+    if not deltas:
+        table.put_item(Item=item)
+        bump_data_version(content.userId, table)
+        return
+
+    # コンテンツ登録と集計アイテムの更新を同一トランザクションで実行
+    # 登録済みのコンテンツ（yearあり）の上書きは件数が重複するため不可とする
+    table.meta.client.transact_write_items(
+        TransactItems=[
+            {
+                "Put": {
+                    "TableName": table.name,
+                    "Item": item,
+                    "ConditionExpression": "attribute_not_exists(#y)",
+                    "ExpressionAttributeNames": {"#y": "year"},
+                }
             },
+            _summary_update(content.userId, table, deltas),
+        ]
+    )
+    _refresh_search_index(content.userId, table, [(None, item)])
+
+
+def _batch_get_items(
+    table: Any, keys: List[dict], attributes: Optional[List[str]] = None
+) -> Iterator[dict]:
+    # batch_get_itemでまとめて取得し、未処理のキー（UnprocessedKeys）は
+    # 待機時間を延ばしながら再取得する
+    projection = {}
+    if attributes:
+        names = {f"#a{i}": name for i, name in enumerate(attributes)}
+        projection = {
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+    while keys:
+        chunk = keys[:BATCH_GET_LIMIT]
+        keys = keys[BATCH_GET_LIMIT:]
+        request = {
+            table.name: {"Keys": chunk, "ConsistentRead": True, **projection}
+        }
+        attempt = 0
+        while request:
+            if attempt:
+                time.sleep(min(0.05 * 2**attempt, 1))
+            response = table.meta.client.batch_get_item(RequestItems=request)
+            yield from response.get("Responses", {}).get(table.name, [])
+            request = response.get("UnprocessedKeys")
+            attempt += 1
+
+
+def get_contents_by_ids(
+    user_id: str,
+    table: Any,
+    content_ids: List[str],
+    attributes: Optional[List[str]] = None,
+) -> dict[str, dict]:
+    """
+    コンテンツをbatch_get_itemでまとめて取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param content_ids: コンテンツIDのリスト
+    :param attributes: 取得する属性（未指定の場合は全属性）
+    :return: コンテンツIDごとのアイテム（存在しないコンテンツは含まない）
+    """
+    if attributes and "contentId" not in attributes:
+        attributes = ["contentId", *attributes]
+    keys = [
+        {"contentId": content_id, "userId": user_id}
+        for content_id in dict.fromkeys(content_ids)
+    ]
+    return {
+        item["contentId"]: item
+        for item in _batch_get_items(table, keys, attributes)
+    }
+
+
+def get_existing_contents(
+    user_id: str, table: Any, content_ids: List[str]
+) -> dict[str, dict]:
+    """
+    登録済みのコンテンツをまとめて取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param content_ids: コンテンツIDのリスト
+    :return: コンテンツIDごとのアイテム（contentId・年度・種別のみ）
+    """
+    return get_contents_by_ids(
+        user_id, table, content_ids, ["contentId", "year", "type"]
+    )
+
+
+class BatchWriteError(Exception):
+    """一括登録で一部のコンテンツを書き込めなかった場合の例外"""
+
+    def __init__(self, unwritten: List[str], cause: Exception):
+        super().__init__(str(cause))
+        # 書き込めなかったコンテンツID（それ以外のコンテンツは書き込み済み）
+        self.unwritten = unwritten
+
+
+def _batch_put_items(table: Any, items: List[dict]) -> Iterator[dict]:
+    # batch_write_itemでまとめて書き込み、書き込みが確定したアイテムを順に返す
+    # 未処理のアイテム（UnprocessedItems）は待機時間を延ばしながら再送し、
+    # 上限回数を超えても残る場合は送出する
+    while items:
+        pending = items[:BATCH_WRITE_LIMIT]
+        items = items[BATCH_WRITE_LIMIT:]
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(min(0.05 * 2**attempt, 1))
+            response = table.meta.client.batch_write_item(
+                RequestItems={
+                    table.name: [
+                        {"PutRequest": {"Item": item}} for item in pending
+                    ]
+                }
+            )
+            unprocessed = {
+                request["PutRequest"]["Item"]["contentId"]
+                for request in response.get("UnprocessedItems", {}).get(
+                    table.name, []
+                )
+            }
+            for item in pending:
+                if item["contentId"] not in unprocessed:
+                    yield item
+            pending = [
+                item for item in pending if item["contentId"] in unprocessed
+            ]
+            if not pending:
+                break
+        else:
+            raise RuntimeError(
+                f"{len(pending)} items remained unprocessed after "
+                f"{BATCH_WRITE_MAX_ATTEMPTS} attempts"
+            )
+
+
+def batch_add_contents(
+    user_id: str, contents: List[RegisterContentData], table: Any
+) -> None:
+    """
+    コンテンツをbatch_write_itemでまとめて登録し、集計アイテムの件数を加算するメソッド。
+    途中で失敗した場合も、書き込み済みのコンテンツの件数・データのバージョン・
+    転置インデックスは更新した上でBatchWriteErrorを送出する。
+    登録済みのコンテンツ（yearあり）は件数が重複するため、呼び出し側で除外しておくこと。
+
+    :param user_id: ユーザーID
+    :param contents: 登録するコンテンツ
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: なし
+    """
+    # 同じリクエストに同じキーは含められないため、コンテンツIDの重複は後の行を残す
+    items = list(
+        {
+            content.contentId: _content_item(content) for content in contents
+        }.values()
+    )
+    written = []
+    try:
+        for item in _batch_put_items(table, items):
+            written.append(item)
+    except Exception as e:
+        written_ids = {item["contentId"] for item in written}
+        raise BatchWriteError(
+            [
+                item["contentId"]
+                for item in items
+                if item["contentId"] not in written_ids
+            ],
+            e,
+        ) from e
+    finally:
+        if written:
+            # 集計アイテム（件数・データのバージョン）は1回の更新でまとめて加算する
+            deltas = {}
+            for item in written:
+                for name, delta in _summary_deltas(None, item).items():
+                    deltas[name] = deltas.get(name, 0) + delta
+            table.update_item(**_summary_add_args(user_id, deltas))
+            _refresh_search_index(
+                user_id, table, [(None, item) for item in written]
+            )
+
+
+def update_content(content: RegisterContentData, table: Any):
+    key = {"contentId": content.contentId, "userId": content.userId}
+    old = table.get_item(Key=key, ConsistentRead=True).get("Item")
+
+    names = {
+        "#ty": "type",
+        "#ti": "title",
+        "#d": "date",
+        "#y": "year",
+        "#n": "notes",
+        "#l": "link",
+        "#s": "status",
+        "#wa": WATCHLIST_SORT_KEY,
+        "#yd": YEAR_DATE_KEY,
+    }
+    values = {
+        ":ty": content.type,
+        ":ti": content.title,
+        ":d": content.date,
+        ":y": content.year,
+        ":n": content.notes,
+        ":l": content.link,
+    }
+    condition = "attribute_exists(userId) AND\
+            attribute_exists(contentId)"
+    if old:
+        # 取得時点から年度・種別が変わっていないことを条件とする（集計の整合性担保）
+        condition += " AND #ty = :oty"
+        values[":oty"] = old.get("type")
+        if old.get("year") is None:
+            condition += " AND attribute_not_exists(#y)"
+        else:
+            condition += " AND #y = :oy"
+            values[":oy"] = old["year"]
+
+    set_expression = UPDATE_CONTENT_SET_EXPRESSION
+    remove_expression = UPDATE_CONTENT_REMOVE_EXPRESSION
+    # 年度・日付の変更に合わせてYearDateIndexのソートキーも更新
+    if content.year is None:
+        remove_expression += ", #yd"
+    else:
+        set_expression += ", #yd = :yd"
+        values[":yd"] = year_date_value(content.year, content.date)
+    if old and old.get("rank") is not None and old.get("year") != content.year:
+        # 順位付きのコンテンツの年度が変わる場合は年間ベストの索引も移動
+        names["#yrk"] = YEAR_RANK_KEY
+        if content.year is None:
+            remove_expression += ", #yrk"
+        else:
+            set_expression += ", #yrk = :yrk"
+            values[":yrk"] = year_rank_value(content.year, old["rank"])
+
+    update = {
+        "Key": key,
+        "UpdateExpression": f"{set_expression} {remove_expression}",
+        "ConditionExpression": condition,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+
+    deltas = _summary_deltas(old, {"year": content.year, "type": content.type})
+    if not old or not deltas:
+        response = table.update_item(
+            **update,
+            ReturnValues="ALL_NEW",  # 更新後の完全なアイテムを返却
         )
+        attributes = response.get("Attributes")
+        bump_data_version(content.userId, table)
+        if old:
+            _refresh_search_index(content.userId, table, [(old, attributes)])
+        return attributes
+
+    # 年度・種別が変わる場合は集計アイテムと同一トランザクションで更新
+    table.meta.client.transact_write_items(
+        TransactItems=[
+            {"Update": {"TableName": table.name, **update}},
+            _summary_update(content.userId, table, deltas),
+        ]
+    )
+    # トランザクションは更新後の値を返さないため、取得済みのアイテムに反映して返却
+    attributes = {**old}
+    attributes.update(
+        {
+            "type": content.type,
+            "title": content.title,
+            "date": content.date,
+            "year": content.year,
+            "notes": content.notes,
+            "link": content.link,
+        }
+    )
+    attributes.pop("status", None)
+    attributes.pop(WATCHLIST_SORT_KEY, None)
+    attributes.pop(YEAR_DATE_KEY, None)
+    if ":yd" in values:
+        attributes[YEAR_DATE_KEY] = values[":yd"]
+    if "#yrk" in names:
+        attributes.pop(YEAR_RANK_KEY, None)
+        if ":yrk" in values:
+            attributes[YEAR_RANK_KEY] = values[":yrk"]
+    _refresh_search_index(content.userId, table, [(old, attributes)])
+    return attributes
+
+
+def update_best(
+    ranked: List[ContentData], unranked: list[dict], table: Any
+) -> None:
+    """
+    年間ベストの順位を更新するメソッド。
+    順位の付与・削除とデータのバージョンの加算をtransact_write_itemsでまとめて実行する
+    （件数がトランザクション上限を超える場合は分割して実行）。
+
+    :param ranked: 順位を付与（変更）するコンテンツ
+    :param unranked: 順位を削除するコンテンツ（DynamoDBのアイテム）
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: なし
+    """
+    transact_items = [
+        {
+            "Update": {
+                "TableName": table.name,
+                "Key": {
+                    "contentId": content.contentId,
+                    "userId": content.userId,
+                },
+                "UpdateExpression": "SET #rnk = :r, #yr = :yr",
+                # 存在しないアイテムを新規作成しないよう存在チェック
+                "ConditionExpression": "attribute_exists(contentId)",
+                "ExpressionAttributeNames": {
+                    "#rnk": "rank",  # rank をエイリアス #rnk として定義
+                    "#yr": YEAR_RANK_KEY,
+                },
+                "ExpressionAttributeValues": {
+                    ":r": content.rank,
+                    ":yr": year_rank_value(content.year, content.rank),
+                },
+            }
+        }
+        for content in ranked
+    ] + [
+        {
+            "Update": {
+                "TableName": table.name,
+                "Key": {
+                    "contentId": content["contentId"],
+                    "userId": content["userId"],
+                },
+                "UpdateExpression": "REMOVE #rnk, #yr",  # エイリアスを使用
+                "ExpressionAttributeNames": {
+                    "#rnk": "rank",
+                    "#yr": YEAR_RANK_KEY,
+                },
+            }
+        }
+        for content in unranked
+    ]
+    if not transact_items:
+        return
+    user_id = ranked[0].userId if ranked else unranked[0]["userId"]
+    transact_items.append(_summary_update(user_id, table, {}))
+
+    while transact_items:
+        chunk = transact_items[:TRANSACT_WRITE_LIMIT]
+        transact_items = transact_items[TRANSACT_WRITE_LIMIT:]
+        table.meta.client.transact_write_items(TransactItems=chunk)
+
+
+def get_user_summary(user_id: str, table: Any) -> Optional[dict]:
+    """
+    ユーザーの集計アイテム（年度・種別ごとの件数）を取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 年度ごとの件数（例: {"2024": {"total": 3, "movie": 2}}）。
+        集計アイテムが未作成・未集計（データ移行前）の場合None
+    """
+    # 直前の書き込みを反映するため強い整合性で読み込む
+    response = table.get_item(Key=_summary_key(user_id), ConsistentRead=True)
+    item = response.get("Item")
+    # データ移行前の書き込みで作成された集計アイテムは一部の件数しか含まないため使わない
+    if item is None or not item.get(SUMMARY_COMPLETE_ATTRIBUTE):
+        return None
+
+    summary = {}
+    for name, count in item.items():
+        if not name.startswith(SUMMARY_COUNT_PREFIX):
+            continue
+        attribute = name.removeprefix(SUMMARY_COUNT_PREFIX)
+        year, _, content_type = attribute.partition("#")
+        summary.setdefault(year, {"total": 0})
+        summary[year][content_type or "total"] = int(count)
+    return summary
 
 
 def get_years(userId: str, table: Any):
-    response = table.query(
-        IndexName="YearIndex",
-        KeyConditionExpression=Key("userId").eq(userId),
-        ProjectionExpression="#yr",
-        ExpressionAttributeNames={"#yr": "year"},  # year を予約語として回避
-    )
+    summary = get_user_summary(userId, table)
+    if summary is not None:
+        return [
+            year for year, counts in summary.items() if counts["total"] > 0
+        ]
 
-    # `year`のみのリストを取得し、重複を排除
-    years = list({item["year"] for item in response.get("Items", [])})
+    # 集計アイテムが未作成・未集計（データ移行前）の場合はYearIndexから算出
+    params = {
+        "IndexName": "YearIndex",
+        "KeyConditionExpression": Key("userId").eq(userId),
+        "ProjectionExpression": "#yr",
+        "ExpressionAttributeNames": {"#yr": "year"},  # year を予約語として回避
+    }
+
+    # `year`のみのリストを全ページ分取得し、重複を排除
+    years = list(
+        {
+            item["year"]
+            for page in _iter_query_pages(table, params)
+            for item in page
+        }
+    )
     return years
 
 
-def get_year_contents(user_id: str, table: Any, year: int) -> list[dict]:
-    response = table.query(
-        IndexName="YearIndex",
-        KeyConditionExpression=Key("userId").eq(user_id)
+def query_year_contents_page(
+    user_id: str,
+    table: Any,
+    year: int,
+    limit: Optional[int] = None,
+    exclusive_start_key: Optional[dict] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    """
+    指定年度のコンテンツを1ページ分だけ取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param year: 対象年度
+    :param limit: 1ページあたりの最大件数（未指定の場合はDynamoDBの上限1MBまで）
+    :param exclusive_start_key: 前ページのLastEvaluatedKey
+    :return: (コンテンツのリスト, 次ページのLastEvaluatedKey（最終ページの場合None）)
+    """
+    params = {
+        "IndexName": "YearIndex",
+        "KeyConditionExpression": Key("userId").eq(user_id)
         & Key("year").eq(year),
+    }
+    if limit:
+        params["Limit"] = limit
+    if exclusive_start_key:
+        params["ExclusiveStartKey"] = exclusive_start_key
+
+    response = table.query(**params)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+
+def query_year_contents_by_date_page(
+    user_id: str,
+    table: Any,
+    year: int,
+    limit: Optional[int] = None,
+    exclusive_start_key: Optional[dict] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    """
+    指定年度のコンテンツを日付の昇順で1ページ分だけ取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param year: 対象年度
+    :param limit: 1ページあたりの最大件数（未指定の場合はDynamoDBの上限1MBまで）
+    :param exclusive_start_key: 前ページのLastEvaluatedKey
+    :return: (コンテンツのリスト, 次ページのLastEvaluatedKey（最終ページの場合None）)
+    """
+    params = {
+        "IndexName": YEAR_DATE_INDEX,
+        "KeyConditionExpression": Key("userId").eq(user_id)
+        & Key(YEAR_DATE_KEY).begins_with(f"{int(year)}#"),
+    }
+    if limit:
+        params["Limit"] = limit
+    if exclusive_start_key:
+        params["ExclusiveStartKey"] = exclusive_start_key
+
+    response = table.query(**params)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+
+def is_year_date_page_key(key: dict, user_id: str, year: int) -> bool:
+    """
+    query_year_contents_by_date_page のLastEvaluatedKeyとして妥当かを判定する。
+    他ユーザー・他年度のキーや、余分な属性を含むキーは受け付けない。
+    """
+    if set(key) != {"contentId", "userId", YEAR_DATE_KEY}:
+        return False
+    if not all(isinstance(value, str) for value in key.values()):
+        return False
+    return key["userId"] == user_id and key[YEAR_DATE_KEY].startswith(
+        f"{int(year)}#"
     )
-    items = response.get("Items", [])
+
+
+def iter_year_contents(
+    user_id: str, table: Any, year: int, page_size: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    指定年度のコンテンツをLastEvaluatedKeyを辿って全ページ分遅延取得するジェネレータ。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param year: 対象年度
+    :param page_size: 1回のクエリで取得する最大件数
+    :return: コンテンツを1件ずつ返すイテレータ
+    """
+    start_key = None
+    while True:
+        items, start_key = query_year_contents_page(
+            user_id, table, year, page_size, start_key
+        )
+        yield from items
+        if not start_key:
+            break
+
+
+def get_year_contents(user_id: str, table: Any, year: int) -> list[dict]:
+    items = iter_year_contents(user_id, table, year)
 
     # date属性で昇順に並び替え
     sorted_items = sorted(items, key=lambda x: x.get("date", ""))
@@ -101,44 +949,130 @@ def get_year_contents(user_id: str, table: Any, year: int) -> list[dict]:
 
 
 def get_year_best(user_id: str, year: int, table: Any) -> list[dict]:
+    """
+    指定年度の年間ベストを順位順に取得するメソッド。
+
+    :param user_id: ユーザーID
+    :param year: 対象年度
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 順位が付与されたコンテンツ（順位の昇順）
+    """
     response = table.query(
-        IndexName="RankIndex",
-        KeyConditionExpression=Key("userId").eq(user_id),
-        FilterExpression=Attr("year").eq(year),
+        IndexName=YEAR_RANK_INDEX,
+        KeyConditionExpression=Key("userId").eq(user_id)
+        & Key(YEAR_RANK_KEY).begins_with(f"{int(year)}#"),
     )
     return response.get("Items", [])
 
 
 def add_watchlist(content: watchlistData, table: Any):
     item = content.dict()
+    # WatchlistIndexのソートキーを付与（ウォッチリスト状態のアイテムのみ索引される）
+    if item.get("status") == WATCHLIST_STATUS:
+        item[WATCHLIST_SORT_KEY] = datetime.now(timezone.utc).isoformat()
     table.put_item(Item=item)
+    bump_data_version(content.userId, table)
+
+
+def _iter_query_pages(table: Any, params: dict) -> Iterator[list[dict]]:
+    # LastEvaluatedKeyを辿ってクエリ結果を1ページずつ返す
+    params = dict(params)
+    while True:
+        response = table.query(**params)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        params["ExclusiveStartKey"] = last_key
 
 
 def get_watchlist_contents(user_id: str, table: Any) -> list[dict]:
     """
     ウォッチリストのコンテンツを取得するメソッド。
+    WatchlistIndexをユーザー単位でクエリし、登録順に全ページ分取得する。
 
     :param user_id: ユーザーID
     :param table: DynamoDBのテーブルオブジェクト
     :return: ウォッチリストのコンテンツ（リスト形式）
     """
-    response = table.scan(
-        FilterExpression=Attr("userId").eq(user_id)
-        & Attr("status").eq("to_watch")
+    params = {
+        "IndexName": WATCHLIST_INDEX,
+        "KeyConditionExpression": Key("userId").eq(user_id),
+    }
+    return [item for page in _iter_query_pages(table, params) for item in page]
+
+
+def iter_user_content_pages(
+    user_id: str, table: Any, page_size: Optional[int] = None
+) -> Iterator[list[dict]]:
+    """
+    ユーザーの全コンテンツを1ページずつ遅延取得するジェネレータ。
+    登録済みのコンテンツ（yearあり）はYearIndexから年度順に、
+    ウォッチリストのコンテンツはWatchlistIndexから登録順に取得する
+    （集計アイテムはどちらにも索引されないため含まれない）。
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param page_size: 1回のクエリで取得する最大件数
+    :return: コンテンツのリストを1ページずつ返すイテレータ
+    """
+    limit = {"Limit": page_size} if page_size else {}
+    yield from _iter_query_pages(
+        table,
+        {
+            "IndexName": "YearIndex",
+            "KeyConditionExpression": Key("userId").eq(user_id),
+            **limit,
+        },
     )
-    return response.get("Items", [])
+    for page in _iter_query_pages(
+        table,
+        {
+            "IndexName": WATCHLIST_INDEX,
+            "KeyConditionExpression": Key("userId").eq(user_id),
+            **limit,
+        },
+    ):
+        # 年度が付与済みのアイテムはYearIndexで取得済み
+        yield [item for item in page if item.get("year") is None]
 
 
 def delete_watchlist_contents(user_id: str, table: Any, content_id: str):
     """
     ウォッチリストのコンテンツを削除するメソッド。
+    年度を持つコンテンツの場合は集計アイテムも同一トランザクションで更新する。
 
     :param user_id: ユーザーID
     :param table: DynamoDBのテーブルオブジェクト
     :param content_id: 削除対象のコンテンツコンテンツID
     :return: なし
     """
-    table.delete_item(Key={"contentId": content_id, "userId": user_id})
+    key = {"contentId": content_id, "userId": user_id}
+    old = table.get_item(Key=key, ConsistentRead=True).get("Item")
+    deltas = _summary_deltas(old, None)
+    if not deltas:
+        table.delete_item(Key=key)
+        bump_data_version(user_id, table)
+        return
+
+    table.meta.client.transact_write_items(
+        TransactItems=[
+            {
+                "Delete": {
+                    "TableName": table.name,
+                    "Key": key,
+                    "ConditionExpression": "#y = :oy AND #ty = :oty",
+                    "ExpressionAttributeNames": {"#y": "year", "#ty": "type"},
+                    "ExpressionAttributeValues": {
+                        ":oy": old["year"],
+                        ":oty": old.get("type"),
+                    },
+                }
+            },
+            _summary_update(user_id, table, deltas),
+        ]
+    )
+    _refresh_search_index(user_id, table, [(old, None)])
 
 
 def get_recent_contents(
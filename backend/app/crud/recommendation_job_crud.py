@@ -0,0 +1,185 @@
+"""
+レコメンドジョブの保存先
+
+ジョブはユーザー・種別・履歴から決まるIDをキー（jobId）として保存する。
+保存先は設定（RECOMMENDATION_JOB_BACKEND）で切り替える。
+    memory   : プロセス内（ローカル開発用）
+    dynamodb : DynamoDBテーブル（期限切れのジョブはTTL属性 expiresAt で削除）
+
+待機中・実行中のまま RECOMMENDATION_JOB_STALE_AFTER 秒以上更新されていないジョブは
+（ワーカーへの受け渡し・ワーカーの実行が途中で止まったとみなし）同じIDで再登録できる。
+"""
+
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from botocore.exceptions import ClientError
+
+from app.config import settings
+
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+
+
+class MemoryJobStore:
+    """プロセス内のジョブ保存先"""
+
+    def __init__(
+        self,
+        timer: Callable[[], float] = time.time,
+        stale_after: float = settings.recommendation_job_stale_after,
+    ):
+        self.timer = timer
+        self.stale_after = stale_after
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> bool:
+        with self._lock:
+            current = self._jobs.get(job["jobId"])
+            if current is not None and not _replaceable(
+                current, self.timer(), self.stale_after
+            ):
+                return False
+            self._jobs[job["jobId"]] = dict(job)
+            return True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["expiresAt"] <= self.timer():
+                return None
+            return dict(job)
+
+    def claim(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != JOB_STATUS_PENDING:
+                return False
+            job["status"] = JOB_STATUS_RUNNING
+            job["updatedAt"] = int(self.timer())
+            return True
+
+    def finish(self, job_id: str, fields: dict) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updatedAt=int(self.timer()))
+
+
+class DynamoDBJobStore:
+    """DynamoDBテーブルのジョブ保存先（キー: jobId）"""
+
+    def __init__(
+        self,
+        table: Any,
+        timer: Callable[[], float] = time.time,
+        stale_after: float = settings.recommendation_job_stale_after,
+    ):
+        self.table = table
+        self.timer = timer
+        self.stale_after = stale_after
+
+    def create(self, job: dict) -> bool:
+        now = self.timer()
+        try:
+            # 実行中・完了済みの同じジョブがある場合は作成しない（重複の排除）
+            self.table.put_item(
+                Item=job,
+                ConditionExpression=(
+                    "attribute_not_exists(jobId) OR #s = :failed"
+                    " OR expiresAt <= :now"
+                    " OR (#s IN (:pending, :running) AND updatedAt <= :stale)"
+                ),
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={
+                    ":failed": JOB_STATUS_FAILED,
+                    ":pending": JOB_STATUS_PENDING,
+                    ":running": JOB_STATUS_RUNNING,
+                    ":now": int(now),
+                    ":stale": int(now - self.stale_after),
+                },
+            )
+        except ClientError as e:
+            if (
+                e.response["Error"]["Code"]
+                != "ConditionalCheckFailedException"
+            ):
+                raise
+            return False
+        return True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        # TTLによる削除は遅れる場合があるため、取得時にも期限を確認する
+        response = self.table.get_item(
+            Key={"jobId": job_id}, ConsistentRead=True
+        )
+        job = response.get("Item")
+        if job is None or job["expiresAt"] <= self.timer():
+            return None
+        return job
+
+    def claim(self, job_id: str) -> bool:
+        try:
+            # 待機中のジョブのみ実行中にする（同じジョブを二重に実行しない）
+            self.table.update_item(
+                Key={"jobId": job_id},
+                UpdateExpression="SET #s = :running, updatedAt = :now",
+                ConditionExpression="#s = :pending",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={
+                    ":running": JOB_STATUS_RUNNING,
+                    ":pending": JOB_STATUS_PENDING,
+                    ":now": int(self.timer()),
+                },
+            )
+        except ClientError as e:
+            if (
+                e.response["Error"]["Code"]
+                != "ConditionalCheckFailedException"
+            ):
+                raise
+            return False
+        return True
+
+    def finish(self, job_id: str, fields: dict) -> None:
+        fields = {**fields, "updatedAt": int(self.timer())}
+        names = {f"#f{i}": name for i, name in enumerate(fields)}
+        self.table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="SET "
+            + ", ".join(f"#f{i} = :f{i}" for i in range(len(fields))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={
+                f":f{i}": value for i, value in enumerate(fields.values())
+            },
+        )
+
+
+def _replaceable(job: dict, now: float, stale_after: float) -> bool:
+    # 失敗・期限切れ・待機中や実行中のまま止まったジョブは同じIDで再登録できる
+    if job["status"] == JOB_STATUS_FAILED or job["expiresAt"] <= now:
+        return True
+    return (
+        job["status"] in (JOB_STATUS_PENDING, JOB_STATUS_RUNNING)
+        and job["updatedAt"] <= now - stale_after
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_store() -> Any:
+    """設定に応じたジョブの保存先を作成し、プロセス内で共有する"""
+    backend = settings.recommendation_job_backend
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "dynamodb":
+        from app.db.dynamodb import dynamodb
+
+        return DynamoDBJobStore(
+            dynamodb.Table(settings.recommendation_job_table_name)
+        )
+    raise ValueError(f"Unknown recommendation job backend: {backend}")
@@ -1,6 +1,17 @@
+from app.cache import TTLCache
+from app.config import settings
 from app.db.dynamodb import user_table
 from app.schemas.user import User
 
+# ユーザープロフィール（有料会員フラグ等）のプロセス内キャッシュ
+# 有料会員フラグはアプリ外（決済・運用側）でユーザーテーブルを直接更新するため、
+# 他プロセスでの更新と同様にTTL経過後に反映される
+USER_PROFILE_CACHE_TTL = settings.user_profile_cache_ttl
+USER_PROFILE_CACHE_MAXSIZE = settings.user_profile_cache_maxsize
+user_profile_cache = TTLCache(
+    maxsize=USER_PROFILE_CACHE_MAXSIZE, ttl=USER_PROFILE_CACHE_TTL
+)
+
 
 def save_user(user: User):
     try:
@@ -12,6 +23,33 @@ def save_user(user: User):
                 "name": name,  # ユーザー名
             }
         )
+        user_profile_cache.pop(user_id)
         print("User saved successfully:", response)
     except Exception as e:
         print("Error saving user:", e)
+
+
+def load_user_profile(user_id: str) -> dict:
+    """
+    ユーザーテーブルからプロフィールを取得し、キャッシュに保存する
+
+    :param user_id: ユーザーID
+    :return: ユーザーのアイテム（存在しない場合は空のdict）
+    """
+    response = user_table.get_item(Key={"userId": user_id})
+    profile = response.get("Item") or {}
+    user_profile_cache.set(user_id, profile)
+    return profile
+
+
+def get_user_profile(user_id: str) -> dict:
+    """
+    ユーザーのプロフィールを取得する（キャッシュがあればDBアクセスを行わない）
+
+    :param user_id: ユーザーID
+    :return: ユーザーのアイテム（存在しない場合は空のdict）
+    """
+    profile = user_profile_cache.get(user_id)
+    if profile is None:
+        profile = load_user_profile(user_id)
+    return profile
@@ -1,30 +1,46 @@
-import os
 from typing import Any
 
 import boto3
-from dotenv import load_dotenv
+from botocore.config import Config
 
-load_dotenv()
+from app.config import settings
 
-# 環境変数からリージョンとテーブル名を取得
-AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-1")
-CONTENT_TABLE_NAME = os.getenv("DYNAMODB_CONTENT_TABLE_NAME", "ContentTable")
-USER_TABLE_NAME = os.getenv("DYNAMODB_USER_TABLE_NAME", "USER")
+# 設定からリージョンとテーブル名を取得
+AWS_REGION = settings.aws_region
+CONTENT_TABLE_NAME = settings.dynamodb_content_table_name
+USER_TABLE_NAME = settings.dynamodb_user_table_name
 
-# DynamoDBリソースを初期化
-dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+# 接続プール・タイムアウト・リトライの設定
+# プールサイズはスレッドプールの同時実行数（既定40）以上にしておく
+DYNAMODB_MAX_POOL_CONNECTIONS = settings.dynamodb_max_pool_connections
+DYNAMODB_CONNECT_TIMEOUT = settings.dynamodb_connect_timeout
+DYNAMODB_READ_TIMEOUT = settings.dynamodb_read_timeout
+DYNAMODB_MAX_ATTEMPTS = settings.dynamodb_max_attempts
+DYNAMODB_TCP_KEEPALIVE = settings.dynamodb_tcp_keepalive
+
+
+def build_boto_config() -> Config:
+    """DynamoDBクライアント用のbotocore設定を作成する"""
+    return Config(
+        max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS,
+        connect_timeout=DYNAMODB_CONNECT_TIMEOUT,
+        read_timeout=DYNAMODB_READ_TIMEOUT,
+        tcp_keepalive=DYNAMODB_TCP_KEEPALIVE,
+        retries={"max_attempts": DYNAMODB_MAX_ATTEMPTS, "mode": "adaptive"},
+    )
+
+
+# DynamoDBリソースをプロセスで1つだけ初期化し、全リクエストで共有する
+# ほぼ全てのリクエストで利用するため、遅延させずに起動時（Lambdaの初期化フェーズ）に作成する
+dynamodb = boto3.resource(
+    "dynamodb", region_name=AWS_REGION, config=build_boto_config()
+)
 
 # テーブルインスタンスを取得
+# query / put_item などの操作のみ利用し、load() などで属性を変更しないこと
 content_table = dynamodb.Table(CONTENT_TABLE_NAME)
 user_table = dynamodb.Table(USER_TABLE_NAME)
 
 
 async def get_content_table() -> Any:
-    return dynamodb.Table(CONTENT_TABLE_NAME)
-
-
-# try:
-#     table.load()
-#     print("DynamoDB table loaded successfully.")
-# except Exception as e:
-#     print(f"Error loading DynamoDB table: {e}")
+    return content_table
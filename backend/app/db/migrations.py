@@ -0,0 +1,398 @@
+"""
+コンテンツテーブルのデータ移行（バックフィル）スクリプト
+
+GSI追加などでアイテムに新しい属性が必要になった場合に、既存アイテムへ
+属性を付与するための処理をまとめる。各処理は冪等で、再実行しても問題ない。
+
+実行例（docker コンテナ内で実行することを前提）:
+    python -m app.db.migrations watchlist
+    python -m app.db.migrations summary
+    python -m app.db.migrations year_rank
+    python -m app.db.migrations year_date
+    python -m app.db.migrations search_index
+"""
+
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from app.crud.content_crud import (
+    DATA_VERSION_ATTRIBUTE,
+    SEARCH_CONTENT_ID_PREFIX,
+    SEARCH_STATE_CONTENT_ID,
+    SUMMARY_COMPLETE_ATTRIBUTE,
+    SUMMARY_CONTENT_ID,
+    WATCHLIST_SORT_KEY,
+    WATCHLIST_STATUS,
+    YEAR_DATE_KEY,
+    YEAR_RANK_KEY,
+    search_index_tokens,
+    search_item_id,
+    bump_data_version,
+    summary_count_attributes,
+    year_date_value,
+    year_rank_value,
+)
+from app.db.dynamodb import content_table
+
+# 集計アイテムの再作成を繰り返す回数の上限（実行中の書き込みと競合した場合）
+SUMMARY_BACKFILL_ATTEMPTS = 5
+
+
+def _scan_all(table: Any, **params) -> Any:
+    # LastEvaluatedKeyを辿ってテーブル全体をスキャンする
+    while True:
+        response = table.scan(**params)
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        params["ExclusiveStartKey"] = last_key
+
+
+def _bump_data_versions(table: Any, user_ids: set[str]) -> None:
+    # 属性を付与したユーザーのデータのバージョンを加算する
+    # （GSIの結果が変わるため、移行前のETagで304を返し続けないようにする）
+    for user_id in sorted(user_ids):
+        bump_data_version(user_id, table)
+
+
+def backfill_watchlist_index(table: Any) -> int:
+    """
+    ウォッチリスト状態の既存アイテムにWatchlistIndexのソートキーを付与する。
+
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 更新したアイテム数
+    """
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("status").eq(WATCHLIST_STATUS)
+        & Attr(WATCHLIST_SORT_KEY).not_exists(),
+        ProjectionExpression="contentId, userId",
+    )
+    # 既存アイテムの登録日時は不明なため、移行日時をソートキーとする
+    migrated_at = datetime.now(timezone.utc).isoformat()
+    count = 0
+    touched: set[str] = set()
+    try:
+        for item in items:
+            try:
+                table.update_item(
+                    Key={
+                        "contentId": item["contentId"],
+                        "userId": item["userId"],
+                    },
+                    UpdateExpression="SET #wa = :wa",
+                    ConditionExpression=(
+                        "#s = :s AND attribute_not_exists(#wa)"
+                    ),
+                    ExpressionAttributeNames={
+                        "#wa": WATCHLIST_SORT_KEY,
+                        "#s": "status",
+                    },
+                    ExpressionAttributeValues={
+                        ":wa": migrated_at,
+                        ":s": WATCHLIST_STATUS,
+                    },
+                )
+            except ClientError as e:
+                # スキャン後に更新・削除されたアイテムはスキップ
+                code = e.response["Error"]["Code"]
+                if code != "ConditionalCheckFailedException":
+                    raise
+                continue
+            touched.add(item["userId"])
+            count += 1
+    finally:
+        _bump_data_versions(table, touched)
+    return count
+
+
+def _scan_summary_versions(table: Any) -> dict[str, int]:
+    # ユーザーごとの集計アイテムのデータのバージョン（強い整合性で読み込む）
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("contentId").eq(SUMMARY_CONTENT_ID),
+        ProjectionExpression="userId, #v",
+        ExpressionAttributeNames={"#v": DATA_VERSION_ATTRIBUTE},
+        ConsistentRead=True,
+    )
+    return {
+        item["userId"]: int(item.get(DATA_VERSION_ATTRIBUTE, 0))
+        for item in items
+    }
+
+
+def _scan_summary_counts(table: Any) -> dict[str, dict[str, int]]:
+    # ユーザーごとの年度・種別ごとの件数（強い整合性で読み込む）
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("year").exists(),
+        ProjectionExpression="contentId, userId, #y, #ty",
+        ExpressionAttributeNames={"#y": "year", "#ty": "type"},
+        ConsistentRead=True,
+    )
+    counts: dict[str, dict[str, int]] = {}
+    for item in items:
+        if item["contentId"] == SUMMARY_CONTENT_ID:
+            continue
+        user_counts = counts.setdefault(item["userId"], {})
+        for name in summary_count_attributes(item["year"], item.get("type")):
+            user_counts[name] = user_counts.get(name, 0) + 1
+    return counts
+
+
+def _put_user_summary(
+    table: Any, user_id: str, counts: dict[str, int], version: Optional[int]
+) -> bool:
+    # 読み込み時点のバージョンから集計アイテムが更新されていない場合のみ置き換える
+    # （データのバージョンは引き継いで加算する。バージョンが戻ると変更前のETagが
+    # 再び一致してしまうため）
+    if version is None:
+        condition = {"ConditionExpression": "attribute_not_exists(contentId)"}
+    else:
+        condition = {
+            "ConditionExpression": "#v = :v",
+            "ExpressionAttributeNames": {"#v": DATA_VERSION_ATTRIBUTE},
+            "ExpressionAttributeValues": {":v": version},
+        }
+    try:
+        table.put_item(
+            Item={
+                "contentId": SUMMARY_CONTENT_ID,
+                "userId": user_id,
+                DATA_VERSION_ATTRIBUTE: (version or 0) + 1,
+                SUMMARY_COMPLETE_ATTRIBUTE: True,
+                **counts,
+            },
+            **condition,
+        )
+    except ClientError as e:
+        code = e.response["Error"]["Code"]
+        if code != "ConditionalCheckFailedException":
+            raise
+        return False
+    return True
+
+
+def backfill_user_summary(table: Any) -> int:
+    """
+    既存アイテムからユーザーごとの集計アイテム（年度・種別ごとの件数）を再作成し、
+    集計済みの属性を付与する。
+    集計アイテムのバージョンを読み込んだ後に件数を集計し、バージョンが変わっていない
+    場合のみ置き換える。実行中に書き込みがあったユーザーは再集計する。
+
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 作成した集計アイテム数
+    """
+    pending: Optional[set[str]] = None  # Noneの場合は全ユーザーが対象
+    count = 0
+    for _ in range(SUMMARY_BACKFILL_ATTEMPTS):
+        # 件数より先にバージョンを読み込む（読み込み後の書き込みは必ずバージョンを変える）
+        versions = _scan_summary_versions(table)
+        counts = _scan_summary_counts(table)
+        users = set(versions) | set(counts)
+        if pending is not None:
+            users &= pending
+
+        conflicts = set()
+        for user_id in sorted(users):
+            if _put_user_summary(
+                table, user_id, counts.get(user_id, {}), versions.get(user_id)
+            ):
+                count += 1
+            else:
+                conflicts.add(user_id)
+        if not conflicts:
+            return count
+        pending = conflicts
+    raise RuntimeError(
+        f"Summary backfill did not converge for users: {sorted(pending)}"
+    )
+
+
+def backfill_year_rank_index(table: Any) -> int:
+    """
+    順位付きの既存アイテムにYearRankIndexのソートキー（年度#順位）を付与する。
+
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 更新したアイテム数
+    """
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("rank").exists()
+        & Attr("year").exists()
+        & Attr(YEAR_RANK_KEY).not_exists(),
+        ProjectionExpression="contentId, userId, #y, #rnk",
+        ExpressionAttributeNames={"#y": "year", "#rnk": "rank"},
+    )
+    count = 0
+    touched: set[str] = set()
+    try:
+        for item in items:
+            try:
+                table.update_item(
+                    Key={
+                        "contentId": item["contentId"],
+                        "userId": item["userId"],
+                    },
+                    UpdateExpression="SET #yr = :yr",
+                    # スキャン後に順位・年度が変わっていないことを条件とする
+                    ConditionExpression="#rnk = :r AND #y = :y",
+                    ExpressionAttributeNames={
+                        "#yr": YEAR_RANK_KEY,
+                        "#rnk": "rank",
+                        "#y": "year",
+                    },
+                    ExpressionAttributeValues={
+                        ":yr": year_rank_value(item["year"], item["rank"]),
+                        ":r": item["rank"],
+                        ":y": item["year"],
+                    },
+                )
+            except ClientError as e:
+                code = e.response["Error"]["Code"]
+                if code != "ConditionalCheckFailedException":
+                    raise
+                continue
+            touched.add(item["userId"])
+            count += 1
+    finally:
+        _bump_data_versions(table, touched)
+    return count
+
+
+def backfill_year_date_index(table: Any) -> int:
+    """
+    年度のある既存アイテムにYearDateIndexのソートキー（年度#日付）を付与する。
+
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 更新したアイテム数
+    """
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("year").exists()
+        & Attr("date").exists()
+        & Attr(YEAR_DATE_KEY).not_exists(),
+        ProjectionExpression="contentId, userId, #y, #d",
+        ExpressionAttributeNames={"#y": "year", "#d": "date"},
+    )
+    count = 0
+    touched: set[str] = set()
+    try:
+        for item in items:
+            try:
+                table.update_item(
+                    Key={
+                        "contentId": item["contentId"],
+                        "userId": item["userId"],
+                    },
+                    UpdateExpression="SET #yd = :yd",
+                    # スキャン後に年度・日付が変わっていないことを条件とする
+                    ConditionExpression="#y = :y AND #d = :d",
+                    ExpressionAttributeNames={
+                        "#yd": YEAR_DATE_KEY,
+                        "#y": "year",
+                        "#d": "date",
+                    },
+                    ExpressionAttributeValues={
+                        ":yd": year_date_value(item["year"], item["date"]),
+                        ":y": item["year"],
+                        ":d": item["date"],
+                    },
+                )
+            except ClientError as e:
+                code = e.response["Error"]["Code"]
+                if code != "ConditionalCheckFailedException":
+                    raise
+                continue
+            touched.add(item["userId"])
+            count += 1
+    finally:
+        _bump_data_versions(table, touched)
+    return count
+
+
+def backfill_search_index(table: Any) -> int:
+    """
+    既存アイテムからユーザーごとの全文検索の転置インデックスを再作成する。
+    トークンを含まなくなったアイテム（バケット数・ページ数の変更前のアイテムを含む）は削除し、
+    更新の失敗の記録も削除する。
+
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: 作成したアイテム数
+    """
+    # 再作成中の更新の失敗は記録が残るよう、コンテンツの読み込みより先に削除する
+    states = _scan_all(
+        table,
+        FilterExpression=Attr("contentId").eq(SEARCH_STATE_CONTENT_ID),
+        ProjectionExpression="contentId, userId",
+        ConsistentRead=True,
+    )
+    for state in states:
+        table.delete_item(
+            Key={"contentId": state["contentId"], "userId": state["userId"]}
+        )
+
+    items = _scan_all(
+        table,
+        FilterExpression=Attr("year").exists()
+        | Attr("contentId").begins_with(SEARCH_CONTENT_ID_PREFIX),
+        ProjectionExpression="contentId, userId, #y, #ti, #n",
+        ExpressionAttributeNames={"#y": "year", "#ti": "title", "#n": "notes"},
+        ConsistentRead=True,
+    )
+    # ユーザー -> アイテム -> トークン -> コンテンツIDのセット
+    indexes: dict[str, dict[str, dict[str, set]]] = {}
+    # 作成済みの転置インデックスのアイテムのキー
+    existing: list[dict] = []
+    for item in items:
+        if item["contentId"].startswith(SEARCH_CONTENT_ID_PREFIX):
+            existing.append(
+                {"contentId": item["contentId"], "userId": item["userId"]}
+            )
+            continue
+        if item["contentId"] == SUMMARY_CONTENT_ID:
+            continue
+        index = indexes.setdefault(item["userId"], {})
+        for token in search_index_tokens(item):
+            index.setdefault(
+                search_item_id(token, item["contentId"]), {}
+            ).setdefault(token, set()).add(item["contentId"])
+
+    count = 0
+    for user_id, index in indexes.items():
+        for item_id, postings in sorted(index.items()):
+            table.put_item(
+                Item={"contentId": item_id, "userId": user_id, **postings}
+            )
+            count += 1
+    for key in existing:
+        if key["contentId"] not in indexes.get(key["userId"], {}):
+            table.delete_item(Key=key)
+    return count
+
+
+MIGRATIONS: dict[str, Callable[[Any], int]] = {
+    "watchlist": backfill_watchlist_index,
+    "summary": backfill_user_summary,
+    "year_rank": backfill_year_rank_index,
+    "year_date": backfill_year_date_index,
+    "search_index": backfill_search_index,
+}
+
+
+def main(argv: list[str]) -> None:
+    names = argv or list(MIGRATIONS)
+    for name in names:
+        if name not in MIGRATIONS:
+            raise SystemExit(f"Unknown migration: {name}")
+        count = MIGRATIONS[name](content_table)
+        print(f"{name}: {count} items updated")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,244 @@
+"""
+外部API呼び出し用の共通HTTPクライアント
+
+ホストごとにキープアライブの接続プールを持つ requests.Session を
+プロセス内で共有し、TLSハンドシェイクを毎回行わないようにする。
+全ての呼び出しに接続・読み取りタイムアウトを設定し、
+一時的なエラー（接続失敗・429・5xx）はジッター付きの指数バックオフで再試行する。
+ホストごとのレイテンシ・エラー数を記録し、stats() で参照できる。
+hedged_get は応答が直近のp95を超えた場合に同じGETをもう1件送り、
+先に成功した方を返す（遅延の大きい一部のリクエストの影響を抑える）。
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from functools import lru_cache
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+# 再試行の対象とするステータスコード
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# パーセンタイルの算出に使う直近のレイテンシの件数
+LATENCY_WINDOW = 256
+
+
+class HostMetrics:
+    """1ホスト分の呼び出し回数・エラー数・レイテンシ"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, elapsed_ms: float, error: bool) -> None:
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        self.latencies.append(elapsed_ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """直近のレイテンシのパーセンタイル（ミリ秒）。記録がない場合はNone"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.requests if self.requests else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+        }
+
+
+class HTTPClient:
+    """
+    接続プール・タイムアウト・再試行・メトリクス付きのHTTPクライアント
+
+    Args:
+        connect_timeout (float): 接続タイムアウト（秒）
+        read_timeout (float): 読み取りタイムアウト（秒）
+        max_retries (int): 再試行の最大回数
+        backoff_factor (float): 指数バックオフの係数（秒）
+        backoff_jitter (float): バックオフに加えるランダムな待ち時間の上限（秒）
+        pool_maxsize (int): ホストごとに保持する最大接続数
+        hedge_enabled (bool): hedged_get で追加のリクエストを送るか
+        hedge_min_samples (int): 追加のリクエストを送るのに必要なレイテンシの記録数
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        backoff_factor: float,
+        backoff_jitter: float,
+        pool_maxsize: int,
+        hedge_enabled: bool = False,
+        hedge_min_samples: int = 20,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.pool_maxsize = pool_maxsize
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_samples = hedge_min_samples
+        self._session = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._metrics: dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> Any:
+        # 起動時間短縮のため、初回の呼び出し時にrequestsを読み込みセッションを作成する
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+
+    def _build_session(self) -> Any:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            status_forcelist=RETRY_STATUS_CODES,
+            # POST（トークン取得など）は再送しない
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            backoff_factor=self.backoff_factor,
+            backoff_jitter=self.backoff_jitter,
+            # 再試行後も失敗した場合は最後のレスポンスを返す
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> Any:
+        """
+        リクエストを送信する（引数は requests.Session.request と同じ）
+
+        timeout を指定しない場合は既定の接続・読み取りタイムアウトを使う。
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        started = time.perf_counter()
+        error = True
+        try:
+            response = self.session.request(method, url, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            self._record(host, (time.perf_counter() - started) * 1000, error)
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Any:
+        return self.request("POST", url, **kwargs)
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """追加のリクエストを送るまでの待ち時間（秒）。送らない場合はNone"""
+        if not self.hedge_enabled:
+            return None
+        with self._lock:
+            metrics = self._metrics.get(host)
+            if metrics is None or (
+                len(metrics.latencies) < self.hedge_min_samples
+            ):
+                return None
+            return metrics.percentile(0.95) / 1000
+
+    def hedged_get(self, url: str, **kwargs) -> Any:
+        """
+        GETリクエストを送信し、直近のp95を超えても応答がない場合は
+        同じリクエストをもう1件送って先に成功した方のレスポンスを返す
+
+        無効な場合・レイテンシの記録が少ない場合は get と同じ。
+        """
+        delay = self.hedge_delay(urlsplit(url).netloc)
+        if delay is None:
+            return self.get(url, **kwargs)
+
+        executor = self._get_hedge_executor()
+        first = executor.submit(self.get, url, **kwargs)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+
+        second = executor.submit(self.get, url, **kwargs)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        # 両方失敗した場合は最初のリクエストの例外を送出する
+        return first.result()
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.pool_maxsize,
+                    thread_name_prefix="http-hedge",
+                )
+            return self._hedge_executor
+
+    def _record(self, host: str, elapsed_ms: float, error: bool) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.record(elapsed_ms, error)
+
+    def host_metrics(self, host: str) -> Optional[HostMetrics]:
+        return self._metrics.get(host)
+
+    def stats(self) -> dict:
+        """ホストごとのメトリクスを返す"""
+        with self._lock:
+            return {
+                host: metrics.snapshot()
+                for host, metrics in self._metrics.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> HTTPClient:
+    """設定に応じたHTTPクライアントを作成し、プロセス内で共有する"""
+    return HTTPClient(
+        connect_timeout=settings.http_connect_timeout,
+        read_timeout=settings.external_api_timeout,
+        max_retries=settings.http_max_retries,
+        backoff_factor=settings.http_backoff_factor,
+        backoff_jitter=settings.http_backoff_jitter,
+        pool_maxsize=settings.http_pool_maxsize,
+        hedge_enabled=settings.http_hedge_enabled,
+        hedge_min_samples=settings.http_hedge_min_samples,
+    )
@@ -0,0 +1,108 @@
+"""
+起動時（コールドスタート時）のモジュール読み込み時間のレポート
+
+`python -X importtime` で対象モジュールを別プロセスで読み込み、
+読み込みに時間がかかっているモジュールを自身の時間・累積時間の順に表示する。
+
+実行例:
+    python -m app.import_report
+    python -m app.import_report --top 30 --max-ms 800
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """
+    `-X importtime` の出力（標準エラー）を解析する。
+
+    :param output: 出力文字列
+    :return: モジュールごとの読み込み時間（マイクロ秒）
+    """
+    results = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # ヘッダ行はスキップ
+            continue
+        results.append(
+            ImportTime(
+                module=fields[2].strip(),
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+            )
+        )
+    return results
+
+
+def measure(module: str) -> list[ImportTime]:
+    # キャッシュ済みのモジュールの影響を受けないよう別プロセスで計測する
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return parse_importtime(completed.stderr)
+
+
+def total_ms(results: list[ImportTime], module: str) -> float:
+    """対象モジュールの累積読み込み時間（ミリ秒）を返す"""
+    for result in results:
+        if result.module == module:
+            return result.cumulative_us / 1000
+    return 0.0
+
+
+def format_report(results: list[ImportTime], module: str, top: int) -> str:
+    lines = [f"{module}: {total_ms(results, module):.1f} ms", ""]
+    for title, key in (
+        ("self", lambda r: r.self_us),
+        ("cumulative", lambda r: r.cumulative_us),
+    ):
+        lines.append(f"Top {top} by {title} time (ms)")
+        for result in sorted(results, key=key, reverse=True)[:top]:
+            lines.append(f"{key(result) / 1000:10.1f}  {result.module}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="累積時間がこの値を超えた場合に終了コード1を返す",
+    )
+    args = parser.parse_args(argv)
+
+    results = measure(args.module)
+    print(format_report(results, args.module, args.top))
+    if (
+        args.max_ms is not None
+        and total_ms(results, args.module) > args.max_ms
+    ):
+        print(f"import time exceeds {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
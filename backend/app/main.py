@@ -7,18 +7,27 @@ from app.routers import (
     add_content,
     add_watchlist,
     delete_watchlist,
+    diagnostics,
     edit_content,
+    export_contents,
     get_recommendation,
     get_watchlist,
     get_year_contents,
     get_years,
     google_callback,
     google_login,
+    import_contents,
     login,
     logout,
+    recommendation_jobs,
+    search_contents,
     update_best,
     users,
 )
+from app.services.recommendation_job_service import (
+    JOB_EVENT_KEY,
+    run_recommendation_job,
+)
 
 app = FastAPI()
 origins = [
@@ -35,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 全てのHTTPメソッドを許可
     allow_headers=["*"],  # 全てのヘッダーを許可
+    expose_headers=["X-Next-Cursor"],  # ページングのカーソルを参照可能にする
 )
 
 app.include_router(users.router)
@@ -51,6 +61,11 @@ app.include_router(add_watchlist.router)
 app.include_router(get_watchlist.router)
 app.include_router(delete_watchlist.router)
 app.include_router(get_recommendation.router)
+app.include_router(recommendation_jobs.router)
+app.include_router(import_contents.router)
+app.include_router(export_contents.router)
+app.include_router(search_contents.router)
+app.include_router(diagnostics.router)
 
 
 @app.get("/")
@@ -64,4 +79,12 @@ def health_check():
 
 
 # Mangum handlerを使用してLambdaに対応
-handler = Mangum(app)
+asgi_handler = Mangum(app)
+
+
+def handler(event, context):
+    # 非同期呼び出しされたレコメンドジョブはワーカーとして実行する
+    if isinstance(event, dict) and JOB_EVENT_KEY in event:
+        run_recommendation_job(event[JOB_EVENT_KEY])
+        return {"jobId": event[JOB_EVENT_KEY]}
+    return asgi_handler(event, context)
@@ -0,0 +1,234 @@
+"""
+外部API（TMDB / Google Books）の作品メタデータのキャッシュ
+
+同じ作品は多くのユーザーに繰り返し推薦されるため、正規化したタイトル・種別・言語を
+キーとして検索結果を保存し、外部APIの呼び出しを減らす。
+見つからなかった結果（ネガティブキャッシュ）は短いTTLで保存し、
+通信エラー等の失敗は保存しない。
+
+保存先は設定（METADATA_CACHE_BACKEND）で切り替える。
+    memory   : プロセス内（開発用）
+    sqlite   : ローカルのSQLiteファイル
+    dynamodb : DynamoDBテーブル（複数プロセス・Lambda間で共有）
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from app.cache import HitCounter, TTLCache
+from app.config import settings
+
+
+def normalize_title(title: str) -> str:
+    """全角・半角や大文字・小文字、空白の違いを吸収したタイトルを返す"""
+    return " ".join(unicodedata.normalize("NFKC", title).casefold().split())
+
+
+def metadata_cache_key(title: str, content_type: str, language: str) -> str:
+    return f"{content_type}#{language}#{normalize_title(title)}"
+
+
+class MemoryMetadataStore:
+    """プロセス内の保存先（件数上限を超えた場合はLRUで削除）"""
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=0)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    def set(self, key: str, entry: dict, ttl: float) -> None:
+        self._cache.set(key, entry, ttl)
+
+
+class SQLiteMetadataStore:
+    """
+    SQLiteファイルの保存先（プロセスの再起動後も保持される）
+
+    件数上限を超えた場合は最後に参照された日時が古いものから削除する。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.timer = timer
+        self._lock = threading.Lock()
+        # 外部APIの検索はスレッドプールから呼ばれるため、接続をスレッド間で共有する
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata_cache ("
+            "key TEXT PRIMARY KEY, entry TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = self.timer()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry, expires_at FROM metadata_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute(
+                    "DELETE FROM metadata_cache WHERE key = ?", (key,)
+                )
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE metadata_cache SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, entry: dict, ttl: float) -> None:
+        now = self.timer()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata_cache "
+                "(key, entry, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry, ensure_ascii=False), now + ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM metadata_cache WHERE expires_at <= ?", (now,)
+        )
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM metadata_cache"
+        ).fetchone()
+        if count > self.maxsize:
+            self._conn.execute(
+                "DELETE FROM metadata_cache WHERE key IN ("
+                "SELECT key FROM metadata_cache "
+                "ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.maxsize,),
+            )
+
+
+class DynamoDBMetadataStore:
+    """
+    DynamoDBテーブルの保存先（キー: cacheKey）
+
+    期限切れのアイテムはテーブルのTTL（属性: expiresAt）で削除されるため、
+    件数の上限は設けない。TTLによる削除は遅れる場合があるため、取得時にも期限を確認する。
+    """
+
+    def __init__(self, table: Any, timer: Callable[[], float] = time.time):
+        self.table = table
+        self.timer = timer
+
+    def get(self, key: str) -> Optional[dict]:
+        item = self.table.get_item(Key={"cacheKey": key}).get("Item")
+        if item is None or item["expiresAt"] <= self.timer():
+            return None
+        return json.loads(item["entry"])
+
+    def set(self, key: str, entry: dict, ttl: float) -> None:
+        self.table.put_item(
+            Item={
+                "cacheKey": key,
+                # Decimalへの変換を避けるため、JSON文字列で保存する
+                "entry": json.dumps(entry, ensure_ascii=False),
+                "expiresAt": int(self.timer() + ttl),
+            }
+        )
+
+
+class MetadataCache:
+    """
+    作品メタデータのキャッシュ
+
+    Args:
+        store: 保存先（get / set を持つオブジェクト）
+        positive_ttl (float): 見つかった結果の有効期限（秒）
+        negative_ttl (float): 見つからなかった結果の有効期限（秒）
+    """
+
+    def __init__(self, store: Any, positive_ttl: float, negative_ttl: float):
+        self.store = store
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.counter = HitCounter()
+
+    def get_or_fetch(
+        self,
+        title: str,
+        content_type: str,
+        language: str,
+        fetch: Callable[[], Optional[dict]],
+    ) -> Optional[dict]:
+        """
+        キャッシュされたメタデータを返す。ない場合は fetch で取得して保存する。
+
+        :param title: 作品タイトル
+        :param content_type: 作品種別（movie / book）
+        :param language: 検索時の言語
+        :param fetch: 外部APIの検索処理。見つからない場合はNoneを返し、
+                      失敗した場合は例外を送出する（失敗は保存しない）
+        :return: メタデータ。見つからない場合はNone
+        """
+        key = metadata_cache_key(title, content_type, language)
+        try:
+            entry = self.store.get(key)
+        except Exception as e:
+            # キャッシュの障害時も外部APIの検索は継続する
+            print(f"Metadata cache error: {e}")
+            entry = None
+
+        self.counter.record(hit=entry is not None)
+        if entry is not None:
+            return entry["data"]
+
+        data = fetch()
+        ttl = self.positive_ttl if data is not None else self.negative_ttl
+        try:
+            self.store.set(key, {"data": data}, ttl)
+        except Exception as e:
+            print(f"Metadata cache error: {e}")
+        return data
+
+    def stats(self) -> dict:
+        """ヒット数・ミス数・ヒット率を返す"""
+        return self.counter.stats()
+
+
+def build_metadata_store(backend: str) -> Any:
+    if backend == "memory":
+        return MemoryMetadataStore(settings.metadata_cache_maxsize)
+    if backend == "sqlite":
+        return SQLiteMetadataStore(
+            settings.metadata_cache_sqlite_path,
+            settings.metadata_cache_maxsize,
+        )
+    if backend == "dynamodb":
+        from app.db.dynamodb import dynamodb
+
+        return DynamoDBMetadataStore(
+            dynamodb.Table(settings.metadata_cache_table_name)
+        )
+    raise ValueError(f"Unknown metadata cache backend: {backend}")
+
+
+@lru_cache(maxsize=None)
+def get_metadata_cache() -> MetadataCache:
+    """設定に応じた保存先のキャッシュを作成し、プロセス内で共有する"""
+    return MetadataCache(
+        build_metadata_store(settings.metadata_cache_backend),
+        positive_ttl=settings.metadata_cache_positive_ttl,
+        negative_ttl=settings.metadata_cache_negative_ttl,
+    )
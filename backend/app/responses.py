@@ -0,0 +1,50 @@
+"""
+一覧APIのレスポンス
+
+DynamoDBのアイテムをpydanticモデルの生成・jsonable_encoderを経由せずに
+レスポンスモデルの項目のみに絞り込み、JSONのバイト列へ直接変換する。
+（Decimalは整数・小数に変換する）
+ユーザーのデータのバージョンによるETag（条件付きGET）のヘッダーも扱う。
+"""
+
+from typing import Any, Iterable, Optional
+
+from fastapi.responses import JSONResponse, Response
+
+from app.schemas.content import ContentData, watchlistData
+from app.utils import dumps_json_bytes, project_items
+
+# レスポンスの項目（モデルで返却していた場合と同じ項目・順序）
+CONTENT_FIELDS = tuple(ContentData.__fields__)
+WATCHLIST_FIELDS = tuple(watchlistData.__fields__)
+
+
+# 条件付きGETに対応する一覧APIのキャッシュ制御
+# （ブラウザ等にユーザー単位で保存させ、毎回ETagで再検証させる）
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+class ItemsJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_json_bytes(content)
+
+
+def items_response(
+    items: Iterable[dict],
+    fields: tuple[str, ...],
+    headers: Optional[dict] = None,
+) -> ItemsJSONResponse:
+    """アイテムを指定した項目のみのJSON配列として返却する"""
+    return ItemsJSONResponse(project_items(items, fields), headers=headers)
+
+
+def etag_headers(etag: Optional[str]) -> dict:
+    """ETagを返却するレスポンスヘッダー（ETagがない場合はCache-Controlのみ）"""
+    if etag is None:
+        return {"Cache-Control": ETAG_CACHE_CONTROL}
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def not_modified_response(etag: str) -> Response:
+    """変更がない場合の304レスポンス（本文なし）"""
+    return Response(status_code=304, headers=etag_headers(etag))
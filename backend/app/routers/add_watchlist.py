@@ -4,7 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.schemas.content import DependsData, watchlistData
 from app.services.content_service import add_watchlist_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.utils import InvalidContentIdError
 
 router = APIRouter(prefix="/content")
 
@@ -12,11 +15,15 @@ router = APIRouter(prefix="/content")
 @router.post("/addWatchlist", tags=["content"])
 async def add_watchlist(
     content: watchlistData,
-    depends: DependsData = Depends(get_content_table_and_user_id),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ):
     try:
         await add_watchlist_service(content, depends.user_id, depends.table)
         return {"message": "WatchList added successfully"}
+    except InvalidContentIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,7 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.schemas.content import DependsData, watchlistData
 from app.services.content_service import delete_watchlist_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
 
 router = APIRouter(prefix="/content")
 
@@ -12,7 +14,9 @@ router = APIRouter(prefix="/content")
 @router.post("/deleteWatchlist", tags=["content"])
 async def delete_watchlist(
     content: watchlistData,
-    depends: DependsData = Depends(get_content_table_and_user_id),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ):
     try:
         await delete_watchlist_service(depends.user_id, depends.table, content)
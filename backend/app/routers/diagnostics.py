@@ -0,0 +1,49 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.circuit_breaker import breaker_states
+from app.config import settings
+from app.http_client import get_http_client
+from app.metadata_cache import get_metadata_cache
+from app.services.content_service import content_read_cache
+
+router = APIRouter(prefix="/diagnostics")
+
+
+async def verify_diagnostics_token(
+    x_diagnostics_token: Optional[str] = Header(None),
+) -> None:
+    # トークン未設定の環境では存在しないルートとして扱う
+    if not settings.diagnostics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_diagnostics_token or not secrets.compare_digest(
+        x_diagnostics_token, settings.diagnostics_token
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.get(
+    "",
+    tags=["diagnostics"],
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def get_diagnostics() -> dict:
+    return {
+        "metadataCache": get_metadata_cache().stats(),
+        "contentReadCache": content_read_cache.stats(),
+        "httpClient": get_http_client().stats(),
+        "circuitBreakers": breaker_states(),
+    }
+
+
+@router.put(
+    "/content-read-cache",
+    tags=["diagnostics"],
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def set_content_read_cache(enabled: bool = Query(...)) -> dict:
+    # 実行中に読み取りキャッシュを有効・無効にする（このプロセスのみ）
+    content_read_cache.set_enabled(enabled)
+    return content_read_cache.stats()
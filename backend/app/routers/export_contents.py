@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.schemas.content import ContentFileFormat, DependsData
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.services.export_service import (
+    EXPORT_MEDIA_TYPES,
+    export_contents_service,
+)
+
+router = APIRouter(prefix="/content")
+
+
+@router.get("/export", tags=["content"])
+async def export_contents(
+    format: ContentFileFormat = Query(ContentFileFormat.jsonl),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
+):
+    # 全件を取得してから返すのではなく、取得したページから順に返却する
+    return StreamingResponse(
+        export_contents_service(depends.user_id, depends.table, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="contents.{format.value}"'
+            )
+        },
+    )
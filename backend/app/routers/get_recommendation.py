@@ -1,19 +1,34 @@
+import json
 import traceback
-from typing import Optional
+from typing import Iterator, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.schemas.content import ContentType, DependsData
+from app.schemas.content import (
+    ContentType,
+    DependsData,
+    RecommendationResponse,
+)
 from app.services.content_service import (
+    cache_recommendations,
     generate_recommendations_bedrock,
+    get_cached_recommendations,
     get_recent_contents_service,
+    stream_recommendations,
 )
 from app.services.depends_service import get_content_table_and_user_id
 
 router = APIRouter(prefix="/content")
 
 
-@router.get("/recommend", tags=["content"])
+@router.get(
+    "/recommend",
+    tags=["content"],
+    response_model=RecommendationResponse,
+    response_model_exclude_none=True,
+)
 async def get_recommendations(
     content_type: Optional[ContentType] = Query(
         None
@@ -30,7 +45,7 @@ async def get_recommendations(
             }
 
         # DynamoDBからユーザーの履歴を取得
-        items = get_recent_contents_service(
+        items = await get_recent_contents_service(
             depends.user_id, depends.table, content_type
         )
         # 履歴が無い / 取得できない場合
@@ -48,11 +63,126 @@ async def get_recommendations(
             else (content_type or ContentType.movie)
         )
 
-        # Bedrockを使ってレコメンドを生成
-        recommendations = generate_recommendations_bedrock(
-            content_type_value, history
+        # 同じ履歴から生成済みであれば再利用し、なければBedrockで生成
+        # （Bedrock・外部APIの呼び出しはブロッキングのためスレッドプールで実行）
+        recommendations = get_cached_recommendations(
+            depends.user_id, content_type_value, history
         )
+        if recommendations is None:
+            recommendations, complete = await run_in_threadpool(
+                generate_recommendations_bedrock, content_type_value, history
+            )
+            cache_recommendations(
+                depends.user_id,
+                content_type_value,
+                history,
+                recommendations,
+                complete,
+            )
         return {"recommendations": recommendations, "isPremium": True}
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data: dict) -> str:
+    # Server-Sent Events 形式の1イベント
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _event_stream(
+    user_id: str, content_type: str, history: List[str]
+) -> Iterator[str]:
+    # 同じ履歴から生成済みであればキャッシュからまとめて返す
+    cached = get_cached_recommendations(user_id, content_type, history)
+    if cached is not None:
+        for index, rec in enumerate(cached):
+            yield _sse("recommendation", {"index": index, **rec})
+        yield _sse(
+            "done",
+            {
+                "total": len(cached),
+                "candidates": len(cached),
+                "isPremium": True,
+            },
+        )
+        return
+
+    verified = []
+    complete = False
+    try:
+        for event, data in stream_recommendations(content_type, history):
+            if event == "recommendation":
+                verified.append(data)
+            else:
+                complete = data.get("complete", False)
+                data = {**data, "isPremium": True}
+            yield _sse(event, data)
+    except Exception as e:
+        traceback.print_exc()
+        yield _sse("error", {"detail": str(e)})
+        return
+
+    # 推薦順に並べ替えて、通常のレコメンドと同じ形式でキャッシュする
+    ordered = [
+        {key: value for key, value in rec.items() if key != "index"}
+        for rec in sorted(verified, key=lambda rec: rec["index"])
+    ]
+    cache_recommendations(user_id, content_type, history, ordered, complete)
+
+
+def _done_only(message: str, is_premium: bool) -> Iterator[str]:
+    yield _sse(
+        "done", {"total": 0, "message": message, "isPremium": is_premium}
+    )
+
+
+def _streaming_response(events: Iterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/recommend/stream", tags=["content"])
+async def stream_recommendations_sse(
+    content_type: Optional[ContentType] = Query(None),
+    depends: DependsData = Depends(get_content_table_and_user_id),
+):
+    """
+    レコメンドをServer-Sent Eventsで返す
+
+    実在確認・リンク取得が完了した作品から recommendation イベントで返し、
+    最後に件数を done イベントで返す（エラー時は error イベント）。
+    """
+    try:
+        # 有料会員でない / 履歴がない場合は done イベントのみ返す
+        if not depends.is_premium:
+            return _streaming_response(
+                _done_only("この機能は有料会員限定です", is_premium=False)
+            )
+
+        items = await get_recent_contents_service(
+            depends.user_id, depends.table, content_type
+        )
+        if not items:
+            return _streaming_response(
+                _done_only(
+                    "履歴が不足しているためレコメンドを生成できません",
+                    is_premium=True,
+                )
+            )
+
+        history = [item.get("title") for item in items if item.get("title")]
+        content_type_value = (
+            items[0].get("type")
+            if items[0].get("type")
+            else (content_type or ContentType.movie)
+        )
+        return _streaming_response(
+            _event_stream(depends.user_id, content_type_value, history)
+        )
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,25 +1,43 @@
 import traceback
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 
-from app.schemas.content import DependsData, watchlistData
-from app.services.content_service import get_watchlist_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.responses import (
+    WATCHLIST_FIELDS,
+    etag_headers,
+    items_response,
+    not_modified_response,
+)
+from app.schemas.content import DependsData
+from app.services.content_service import (
+    get_content_etag_service,
+    get_watchlist_service,
+)
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.utils import etag_matches
 
 router = APIRouter(prefix="/content")
 
 
 @router.get("/watchlist", tags=["content"])
 async def get_watchlist(
-    depends: DependsData = Depends(get_content_table_and_user_id),
+    if_none_match: Optional[str] = Header(None),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ) -> List[dict]:
     try:
-        content_items = [
-            watchlistData(**item)
-            for item in get_watchlist_service(depends.user_id, depends.table)
-        ]
-        return content_items
+        # データに変更がなければクエリせずに304を返却
+        etag = await get_content_etag_service(depends.user_id, depends.table)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+
+        items = await get_watchlist_service(depends.user_id, depends.table)
+        # watchlistDataを生成せずにレスポンスの項目のみを直接JSONに変換
+        return items_response(items, WATCHLIST_FIELDS, etag_headers(etag))
 
     except Exception as e:
         traceback.print_exc()
@@ -1,28 +1,66 @@
 import traceback
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
-from app.schemas.content import ContentData, DependsData
-from app.services.content_service import get_year_contents_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.responses import (
+    CONTENT_FIELDS,
+    etag_headers,
+    items_response,
+    not_modified_response,
+)
+from app.schemas.content import DependsData
+from app.services.content_service import (
+    get_content_etag_service,
+    get_year_contents_page_service,
+    get_year_contents_service,
+)
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.utils import InvalidCursorError, etag_matches
 
 router = APIRouter(prefix="/content")
 
+# 次ページのカーソルを返却するレスポンスヘッダー
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/year={year}", tags=["content"])
 async def get_year_contents(
-    year: int, depends: DependsData = Depends(get_content_table_and_user_id)
+    year: int,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ) -> List[dict]:
     try:
-        content_items = [
-            ContentData(**item)
-            for item in get_year_contents_service(
+        # データに変更がなければクエリせずに304を返却
+        # （ETagはURLごとに保存されるため、年度・ページによらず同じ値を使う）
+        etag = await get_content_etag_service(depends.user_id, depends.table)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+
+        # limit, cursorのいずれも未指定の場合は従来通り全件を返却
+        headers = etag_headers(etag)
+        if limit is None and cursor is None:
+            items = await get_year_contents_service(
                 depends.user_id, depends.table, year
             )
-        ]
-        return content_items
+        else:
+            items, next_cursor = await get_year_contents_page_service(
+                depends.user_id, depends.table, year, limit, cursor
+            )
+            if next_cursor:
+                headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        # ContentDataを生成せずにレスポンスの項目のみを直接JSONに変換
+        return items_response(items, CONTENT_FIELDS, headers)
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
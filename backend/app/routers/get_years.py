@@ -1,20 +1,37 @@
 import traceback
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 
+from app.responses import etag_headers, not_modified_response
 from app.schemas.content import DependsData
-from app.services.content_service import get_years_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.services.content_service import (
+    get_content_etag_service,
+    get_years_service,
+)
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.utils import etag_matches
 
 router = APIRouter(prefix="/content")
 
 
 @router.get("/years", tags=["content"])
 async def get_years(
-    depends: DependsData = Depends(get_content_table_and_user_id),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ) -> List[str]:
     try:
+        # データに変更がなければクエリせずに304を返却
+        etag = await get_content_etag_service(depends.user_id, depends.table)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+        response.headers.update(etag_headers(etag))
+
         years = await get_years_service(depends.user_id, depends.table)
         return sorted(years, reverse=True)
     except Exception as e:
@@ -1,16 +1,13 @@
-import os
-
-import requests
-from dotenv import load_dotenv
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import RedirectResponse
 
-router = APIRouter(prefix="/account")
+from app.config import settings
+from app.http_client import get_http_client
 
-load_dotenv()
+router = APIRouter(prefix="/account")
 
-COGNITO_APP_CLIENT_ID = os.getenv("COGNITO_APP_CLIENT_ID")
-COGNITO_DOMAIN = os.getenv("COGNITO_DOMAIN")
+COGNITO_APP_CLIENT_ID = settings.cognito_app_client_id
+COGNITO_DOMAIN = settings.cognito_domain
 # COGNITO_APP_CLIENT_SECRET = os.getenv('COGNITO_APP_CLIENT_SECRET')
 STATE = "random_generated_state_value"
 
@@ -26,7 +23,7 @@ async def google_callback(code: str, state: str = None):
 
     # authorization_header = f"Basic {base64.b64encode(f'{COGNITO_APP_CLIENT_ID}:{COGNITO_APP_CLIENT_SECRET}'.encode()).decode()}"  # noqa: E501
 
-    cognito_response = requests.post(
+    cognito_response = get_http_client().post(
         f"{COGNITO_DOMAIN}/oauth2/token",
         data={
             "grant_type": "authorization_code",
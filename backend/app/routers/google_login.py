@@ -1,19 +1,17 @@
-import os
 import secrets
 import urllib.parse
 
-from dotenv import load_dotenv
 from fastapi import APIRouter
 from fastapi.responses import RedirectResponse
 
-router = APIRouter(prefix="/account")
+from app.config import settings
 
-load_dotenv()
+router = APIRouter(prefix="/account")
 
-CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-COGNITO_DOMAIN = os.getenv("COGNITO_DOMAIN")
-COGNITO_APP_CLIENT_ID = os.getenv("COGNITO_APP_CLIENT_ID")
-REDIRECT_URI = os.getenv("REDIRECT_URI")
+CLIENT_ID = settings.google_client_id
+COGNITO_DOMAIN = settings.cognito_domain
+COGNITO_APP_CLIENT_ID = settings.cognito_app_client_id
+REDIRECT_URI = settings.redirect_uri
 SCOPE = "openid email profile"
 STATE = "random_generated_state_value"
 
@@ -0,0 +1,29 @@
+import traceback
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.schemas.content import ContentFileFormat, DependsData
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+from app.services.import_service import import_contents_service
+
+router = APIRouter(prefix="/content")
+
+
+@router.post("/import", tags=["content"])
+async def import_contents(
+    request: Request,
+    format: ContentFileFormat = Query(ContentFileFormat.csv),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
+):
+    # リクエストボディ（CSV / JSONL）は読み込みながら取り込む
+    try:
+        return await import_contents_service(
+            depends.user_id, depends.table, request.stream(), format
+        )
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
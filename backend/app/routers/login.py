@@ -1,25 +1,26 @@
-import os
+from functools import lru_cache
 
 import boto3
-from dotenv import load_dotenv
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from app.config import settings
 from app.services.user_service import get_sub_from_id_token
 
 router = APIRouter(prefix="/account")
 
-load_dotenv()
+# 設定
+COGNITO_APP_CLIENT_ID = settings.cognito_app_client_id
+AWS_REGION = settings.aws_region
+ENVIRONMENT = settings.environment
+DOMAIN = settings.domain
 
-# 環境変数
-COGNITO_APP_CLIENT_ID = os.getenv("COGNITO_APP_CLIENT_ID")
-AWS_REGION = os.getenv("AWS_REGION")
-ENVIRONMENT = os.getenv("ENVIRONMENT", "local")
-DOMAIN = os.getenv("DOMAIN")
 
-# Boto3クライアント作成
-client = boto3.client("cognito-idp", region_name=AWS_REGION)
+@lru_cache(maxsize=None)
+def get_cognito_client():
+    # ログイン時のみ利用するため、初回呼び出し時にBoto3クライアントを作成する
+    return boto3.client("cognito-idp", region_name=AWS_REGION)
 
 
 # リクエスト用のデータモデル
@@ -30,6 +31,7 @@ class AuthRequest(BaseModel):
 
 @router.post("/login/", tags=["account"])
 async def login(auth_request: AuthRequest, response: JSONResponse):
+    client = get_cognito_client()
     try:
         # Cognitoに対して認証リクエストを実行
         response = client.initiate_auth(
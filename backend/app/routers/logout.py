@@ -1,16 +1,13 @@
-import os
-
-from dotenv import load_dotenv
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
 
-router = APIRouter(prefix="/account")
+from app.config import settings
 
-load_dotenv()
+router = APIRouter(prefix="/account")
 
-# 環境変数を取得
-ENVIRONMENT = os.getenv("ENVIRONMENT", "local")
-DOMAIN = os.getenv("DOMAIN")
+# 設定を取得
+ENVIRONMENT = settings.environment
+DOMAIN = settings.domain
 
 
 @router.post("/logout")
@@ -0,0 +1,83 @@
+import traceback
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+
+from app.schemas.content import (
+    ContentType,
+    DependsData,
+    RecommendationJobResponse,
+)
+from app.services.content_service import get_recent_contents_service
+from app.services.depends_service import (
+    get_content_table_and_user_id,
+    get_content_table_and_user_id_without_premium,
+)
+from app.services.recommendation_job_service import (
+    get_recommendation_job,
+    job_response,
+    submit_recommendation_job,
+)
+
+router = APIRouter(prefix="/content")
+
+
+@router.post("/recommend/jobs", tags=["content"])
+async def create_recommendation_job(
+    content_type: Optional[ContentType] = Query(None),
+    depends: DependsData = Depends(get_content_table_and_user_id),
+):
+    try:
+        # 有料会員でなければ処理を行わずフラグを返却
+        if not depends.is_premium:
+            return {
+                "recommendations": [],
+                "message": "この機能は有料会員限定です",
+                "isPremium": False,
+            }
+
+        items = await get_recent_contents_service(
+            depends.user_id, depends.table, content_type
+        )
+        if not items:
+            return {
+                "recommendations": [],
+                "message": "履歴が不足しているためレコメンドを生成できません",
+                "isPremium": True,
+            }
+
+        history = [item.get("title") for item in items if item.get("title")]
+        content_type_value = (
+            items[0].get("type")
+            if items[0].get("type")
+            else (content_type or ContentType.movie)
+        )
+        job = await submit_recommendation_job(
+            depends.user_id, ContentType(content_type_value).value, history
+        )
+        return JSONResponse(
+            content={**job_response(job), "isPremium": True},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/recommend/jobs/{job_id}",
+    tags=["content"],
+    response_model=RecommendationJobResponse,
+    response_model_exclude_none=True,
+)
+async def get_recommendation_job_status(
+    job_id: str,
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
+):
+    job = await get_recommendation_job(depends.user_id, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
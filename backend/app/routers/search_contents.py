@@ -0,0 +1,34 @@
+import traceback
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.schemas.content import ContentData, ContentType, DependsData
+from app.services.content_service import search_contents_service
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
+
+router = APIRouter(prefix="/content")
+
+
+@router.get("/search", tags=["content"])
+async def search_contents(
+    q: Optional[str] = Query(None, max_length=100),
+    prefix: Optional[str] = Query(None, max_length=100),
+    type: Optional[ContentType] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
+) -> List[ContentData]:
+    if not (q and q.strip()) and not (prefix and prefix.strip()):
+        raise HTTPException(status_code=400, detail="q or prefix is required")
+    try:
+        items = await search_contents_service(
+            depends.user_id, depends.table, q, prefix, type, limit
+        )
+        return [ContentData(**item) for item in items]
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -5,7 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.schemas.content import ContentData, DependsData
 from app.services.content_service import update_best_service
-from app.services.depends_service import get_content_table_and_user_id
+from app.services.depends_service import (
+    get_content_table_and_user_id_without_premium,
+)
 
 router = APIRouter(prefix="/content")
 
@@ -13,7 +15,9 @@ router = APIRouter(prefix="/content")
 @router.post("/update-best", tags=["content"])
 async def update_best(
     contents: List[ContentData],
-    depends: DependsData = Depends(get_content_table_and_user_id),
+    depends: DependsData = Depends(
+        get_content_table_and_user_id_without_premium
+    ),
 ):
     try:
         await update_best_service(contents, depends.user_id, depends.table)
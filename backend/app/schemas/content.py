@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,11 @@ class ContentType(str, Enum):
     blog = "blog"
 
 
+class ContentFileFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
 class watchlistData(BaseModel):
     contentId: str = Field(..., min_length=1)
     type: ContentType
@@ -46,3 +51,30 @@ class ContentItem(BaseModel):
     contentId: str
     title: str
     year: int
+
+
+class RecommendationLink(BaseModel):
+    site_name: str
+    url: str
+
+
+class Recommendation(BaseModel):
+    title: str
+    desc: Optional[str] = None
+    links: List[RecommendationLink] = []
+    unverified: Optional[bool] = (
+        None  # 提供元の障害中で実在確認を行っていない場合True
+    )
+
+
+class RecommendationResponse(BaseModel):
+    recommendations: List[Recommendation] = []
+    message: Optional[str] = None
+    isPremium: bool
+
+
+class RecommendationJobResponse(BaseModel):
+    jobId: str
+    status: str
+    recommendations: Optional[List[Recommendation]] = None
+    error: Optional[str] = None
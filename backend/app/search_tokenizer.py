@@ -0,0 +1,61 @@
+"""
+全文検索用のトークン分割
+
+タイトル・メモを正規化（全角・半角、大文字・小文字、空白の違いを吸収）し、
+記号・空白で区切った語ごとに1文字・2文字のn-gramに分割する。
+日本語は分かち書きをせずに、語の一部（2文字以上は2-gramの組み合わせ）で検索できる。
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """全角・半角や大文字・小文字、空白の違いを吸収した文字列を返す"""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def search_words(text: Optional[str]) -> list[str]:
+    """正規化した文字列を記号・空白で区切った語のリスト"""
+    return _WORD.findall(normalize_search_text(text))
+
+
+def _bigrams(word: str) -> set[str]:
+    return {a + b for a, b in zip(word, word[1:])}
+
+
+def index_tokens(*texts: Optional[str]) -> set[str]:
+    """索引に登録するトークン（語ごとの1-gram・2-gram）"""
+    tokens = set()
+    for text in texts:
+        for word in search_words(text):
+            tokens.update(word)
+            tokens.update(_bigrams(word))
+    return tokens
+
+
+def query_tokens(text: Optional[str]) -> set[str]:
+    """
+    検索語のトークン（語ごとの2-gram。1文字の語は1-gram）
+
+    全てのトークンを含むコンテンツが候補となる。
+    2-gramは語の並びを考慮しないため、候補は matches_query で再確認すること。
+    """
+    tokens = set()
+    for word in search_words(text):
+        tokens.update(_bigrams(word) if len(word) > 1 else {word})
+    return tokens
+
+
+def matches_query(query: Optional[str], *texts: Optional[str]) -> bool:
+    """検索語の全ての語がいずれかの文字列に含まれるか"""
+    normalized = [normalize_search_text(text) for text in texts]
+    return all(
+        any(word in text for text in normalized)
+        for word in search_words(query)
+    )
@@ -0,0 +1,90 @@
+"""
+一覧APIのレスポンス変換のベンチマーク
+
+年度別一覧（/content/year={year}）と同じ形式のアイテムについて、
+pydanticモデル + jsonable_encoder を経由する従来の変換と、
+アイテムを直接JSONに変換する変換（app.responses）の処理時間を比較する。
+
+実行例:
+    python -m app.serialization_benchmark
+    python -m app.serialization_benchmark --items 5000 --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.responses import CONTENT_FIELDS, items_response
+from app.schemas.content import ContentData
+
+
+def sample_items(count: int) -> list[dict]:
+    """DynamoDBから取得した場合と同じ型（数値はDecimal）のアイテム"""
+    return [
+        {
+            "contentId": str(1700000000000 + i),
+            "userId": "benchmark-user",
+            "type": "movie" if i % 2 else "book",
+            "title": f"タイトル {i}",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "type_date": f"movie#2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "year": Decimal(2024),
+            "notes": "メモ" * 20,
+            "link": "https://example.com",
+            "rank": Decimal(i % 10 + 1) if i % 10 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def render_with_models(items: list[dict]) -> bytes:
+    # 変更前の変換（モデル生成 -> jsonable_encoder -> JSONResponse）
+    content = jsonable_encoder([ContentData(**item) for item in items])
+    return JSONResponse(content).body
+
+
+def render_direct(items: list[dict]) -> bytes:
+    return items_response(items, CONTENT_FIELDS).body
+
+
+def measure(func: Callable[[list[dict]], bytes], items, repeat: int) -> float:
+    """1回あたりの処理時間（ミリ秒）の最小値を返す"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(items)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    items = sample_items(args.items)
+    # 両方の変換で同じJSONになることを確認してから計測する
+    if json.loads(render_with_models(items)) != json.loads(
+        render_direct(items)
+    ):
+        print("responses differ")
+        return 1
+
+    models_ms = measure(render_with_models, items, args.repeat)
+    direct_ms = measure(render_direct, items, args.repeat)
+    print(f"items: {args.items}, repeat: {args.repeat}")
+    print(f"models + jsonable_encoder: {models_ms:8.2f} ms")
+    print(f"direct:                    {direct_ms:8.2f} ms")
+    print(f"speedup:                   {models_ms / direct_ms:8.1f} x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,30 +1,226 @@
+import hashlib
 import json
-from typing import Any, List
-import os
-import requests
+import re
+import threading
+import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterator, List, Optional
 
 import boto3
 
-from app.crud.content_crud import (
+from app.cache import HitCounter, TTLCache
+from app.circuit_breaker import CircuitOpenError, get_breaker
+from app.config import settings
+from app.http_client import get_http_client
+from app.metadata_cache import get_metadata_cache
+
+from app.crud.async_content_crud import (
     add_content,
     add_watchlist,
-    delete_best,
     delete_watchlist_contents,
+    get_contents_by_ids,
+    get_data_version,
     get_recent_contents,
+    get_search_postings,
     get_watchlist_contents,
     get_year_best,
     get_year_contents,
     get_years,
+    iter_user_content_pages,
+    query_year_contents_by_date_page,
     update_best,
     update_content,
 )
-from app.schemas.content import ContentData, RegisterContentData, watchlistData
-from app.utils import extract_year_from_date
+from app.crud.content_crud import is_year_date_page_key
+from app.schemas.content import (
+    ContentData,
+    ContentType,
+    RegisterContentData,
+    watchlistData,
+)
+from app.search_tokenizer import (
+    matches_query,
+    normalize_search_text,
+    query_tokens,
+)
+from app.utils import (
+    InvalidCursorError,
+    data_etag,
+    decode_cursor,
+    encode_cursor,
+    extract_year_from_date,
+    validate_content_id,
+)
+
+
+class ContentReadCache:
+    """
+    コンテンツの読み取り結果のプロセス内キャッシュ（ユーザー・クエリ単位）
+
+    ユーザーごとのバケット（クエリ -> 結果）をTTLCacheで保持し、
+    保持するユーザー数（LRU）と有効期限（バケットの作成から）を制限する。
+    書き込み時はユーザーのバケットごと破棄する（読み取り中の結果は破棄済みの
+    バケットに保存されるため、書き込み前の結果が再びキャッシュされることはない）。
+    他プロセスでの書き込みは、データのバージョンの変化（ETagの作成時）か
+    有効期限の経過で反映される。
+    GSIは結果整合性のため、書き込み直後に読み取った結果は変更前の場合がある。
+    破棄（バージョンの変化の検知を含む）から settle 秒以内に読み取った結果は保存しない。
+
+    Args:
+        maxsize (int): 保持する最大ユーザー数
+        ttl (float): 有効期限（秒）
+        enabled (bool): キャッシュを使うか（無効の場合は常にDynamoDBから取得）
+        settle (float): 破棄から読み取り結果を保存し始めるまでの秒数
+        timer (Callable[[], float]): 現在時刻を返す関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        enabled: bool = True,
+        settle: float = 0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self.counter = HitCounter()
+        self.invalidations = 0
+        self._settle = settle
+        self._timer = timer
+        self._buckets = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_bucket(
+        version: Optional[int] = None, settled_at: float = 0
+    ) -> dict:
+        # バケットは {"version": データのバージョン, "values": {クエリ: 結果},
+        # "settled_at": 読み取り結果を保存し始める時刻}
+        return {"version": version, "values": {}, "settled_at": settled_at}
+
+    def _bucket(self, user_id: str) -> dict:
+        with self._lock:
+            bucket = self._buckets.get(user_id)
+            if bucket is None:
+                bucket = self._new_bucket()
+                self._buckets.set(user_id, bucket)
+            return bucket
+
+    async def get_or_fetch(
+        self,
+        user_id: str,
+        query: tuple,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        キャッシュ済みの結果を返し、ない場合は fetch で取得して保存する
+
+        :param user_id: ユーザーID
+        :param query: クエリを表すキー
+        :param fetch: DynamoDBから取得する関数
+        :return: 取得結果（リストの場合は呼び出し側で変更できるようコピーを返す）
+        """
+        if not self.enabled:
+            return await fetch()
+
+        bucket = self._bucket(user_id)
+        with self._lock:
+            found = query in bucket["values"]
+            value = bucket["values"].get(query)
+        self.counter.record(hit=found)
+        if not found:
+            # 書き込みの直後に読み取りを始めた結果は変更前の場合があるため保存しない
+            settled = self._timer() >= bucket["settled_at"]
+            value = await fetch()
+            if settled:
+                with self._lock:
+                    bucket["values"][query] = value
+        return list(value) if isinstance(value, list) else value
+
+    def invalidate(self, user_id: str) -> None:
+        """ユーザーのキャッシュを破棄する"""
+        with self._lock:
+            self._buckets.set(
+                user_id,
+                self._new_bucket(settled_at=self._timer() + self._settle),
+            )
+            self.invalidations += 1
+
+    def observe_version(self, user_id: str, version: int) -> None:
+        """
+        DynamoDBから取得したデータのバージョンを記録し、
+        異なるバージョンで作成したキャッシュは破棄する
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self._buckets.get(user_id)
+            if bucket is not None and bucket["version"] == version:
+                return
+            # 破棄の直後の場合は、読み取り結果を保存し始める時刻を引き継ぐ
+            settled_at = bucket["settled_at"] if bucket is not None else 0
+            # 他プロセスでの書き込みを検知した場合も、直後の読み取り結果は保存しない
+            # （初めて記録する場合は書き込みの直後とは限らないため待たない）
+            if bucket is not None and bucket["version"] is not None:
+                settled_at = max(settled_at, self._timer() + self._settle)
+            self._buckets.set(user_id, self._new_bucket(version, settled_at))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self.invalidations = 0
+        self.counter.reset()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        実行中にキャッシュの有効・無効を切り替える
+
+        無効の間は他プロセスでの書き込み（データのバージョン）を記録しないため、
+        切り替え時に保持しているキャッシュは破棄する
+        """
+        with self._lock:
+            self._buckets.clear()
+            self.enabled = enabled
+
+    def stats(self) -> dict:
+        """有効・無効、ヒット数・ミス数・ヒット率、破棄回数、保持ユーザー数を返す"""
+        with self._lock:
+            invalidations = self.invalidations
+            users = len(self._buckets)
+        return {
+            "enabled": self.enabled,
+            **self.counter.stats(),
+            "invalidations": invalidations,
+            "users": users,
+        }
+
+
+# 一覧・直近の履歴の読み取りキャッシュ
+# 有効・無効は設定（CONTENT_READ_CACHE_ENABLED）で切り替え、
+# 実行中は PUT /diagnostics/content-read-cache（set_enabled）で切り替えられる
+content_read_cache = ContentReadCache(
+    maxsize=settings.content_read_cache_maxsize,
+    ttl=settings.content_read_cache_ttl,
+    enabled=settings.content_read_cache_enabled,
+    settle=settings.content_read_cache_settle_seconds,
+)
+
+
+def invalidate_content_reads(user_id: str) -> None:
+    """コンテンツの書き込み後に、ユーザーの読み取りキャッシュを破棄する"""
+    content_read_cache.invalidate(user_id)
 
 
 async def create_content_service(
     content_data: RegisterContentData, user_id: str, table: Any
 ):
+    validate_content_id(content_data.contentId)
     if content_data.date:
         content_data.year = extract_year_from_date(content_data.date)
 
@@ -32,17 +228,51 @@ async def create_content_service(
 
     # TODO: 試し修正。これでうまくいけば更新処理も同様に修正
     content_data.type_date = content_data.type + "#" + content_data.date
-    add_content(content_data, table)
+    await add_content(content_data, table)
+    invalidate_content_reads(user_id)
+    invalidate_recommendations(user_id)
 
 
 async def edit_content_service(
     content_data: RegisterContentData, user_id: str, table: Any
 ):
+    validate_content_id(content_data.contentId)
     if content_data.date:
         content_data.year = extract_year_from_date(content_data.date)
 
     content_data.userId = user_id
-    return update_content(content_data, table)
+    updated = await update_content(content_data, table)
+    invalidate_content_reads(user_id)
+    invalidate_recommendations(user_id)
+    return updated
+
+
+def diff_best_ranking(
+    ex_best_contents: list[dict], contents: List[ContentData]
+) -> tuple[List[ContentData], list[dict]]:
+    """
+    既存の年間ベストと新しい年間ベストの差分を算出する。
+
+    :param ex_best_contents: 既存の年間ベスト（DynamoDBのアイテム）
+    :param contents: 新しい年間ベスト
+    :return: (順位を付与・変更するコンテンツ, 順位を削除するアイテム)
+    """
+    ex_ranks = {
+        item["contentId"]: item.get("rank") for item in ex_best_contents
+    }
+    new_ids = {
+        content.contentId for content in contents if content.rank is not None
+    }
+    ranked = [
+        content
+        for content in contents
+        if content.rank is not None
+        and ex_ranks.get(content.contentId) != content.rank
+    ]
+    unranked = [
+        item for item in ex_best_contents if item["contentId"] not in new_ids
+    ]
+    return ranked, unranked
 
 
 async def update_best_service(
@@ -50,20 +280,74 @@ async def update_best_service(
 ):
     if (contents[0].userId != user_id) or (not contents[0].year):
         raise
-    ex_best_contents = get_year_best(user_id, contents[0].year, table)
-    # rank属性削除して後に再度rank属性付与
-    delete_best(ex_best_contents, table)
-    update_best(contents, table)
+    ex_best_contents = await get_year_best(user_id, contents[0].year, table)
+    # 順位が変わるアイテムのみをまとめて更新
+    ranked, unranked = diff_best_ranking(ex_best_contents, contents)
+    if ranked or unranked:
+        await update_best(ranked, unranked, table)
+        invalidate_content_reads(user_id)
+
+
+# データのバージョンの加算から一覧APIのETagを返すまでの秒数
+CONTENT_ETAG_SETTLE_SECONDS = settings.content_etag_settle_seconds
+
+
+async def get_content_etag_service(user_id: str, table: Any) -> Optional[str]:
+    """
+    ユーザーのデータのバージョンから一覧APIのETagを作成する
+    （コンテンツのクエリより前に呼び出し、変更がなければ304を返却するために使う）
+    GSIは結果整合性のため、バージョンの加算から CONTENT_ETAG_SETTLE_SECONDS 秒以内は
+    変更前の一覧を返す場合がある。その間はETagを作成しない（304も返さない）
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :return: ETag（書き込みの直後の場合はNone）
+    """
+    version, written_at = await get_data_version(user_id, table)
+    # 他プロセスでの書き込みでバージョンが変わっていれば読み取りキャッシュを破棄
+    content_read_cache.observe_version(user_id, version)
+    if (
+        written_at is not None
+        and time.time() - written_at < CONTENT_ETAG_SETTLE_SECONDS
+    ):
+        return None
+    return data_etag(user_id, version)
 
 
 async def get_years_service(userId: str, table: Any):
-    return get_years(userId, table)
+    return await content_read_cache.get_or_fetch(
+        userId, ("years",), lambda: get_years(userId, table)
+    )
 
 
-def get_year_contents_service(
+async def get_year_contents_service(
     user_id: str, table: Any, year: int
 ) -> list[dict]:
-    return get_year_contents(user_id, table, year)
+    return await content_read_cache.get_or_fetch(
+        user_id,
+        ("year", int(year)),
+        lambda: get_year_contents(user_id, table, year),
+    )
+
+
+async def get_year_contents_page_service(
+    user_id: str,
+    table: Any,
+    year: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    # カーソルが不正な場合・他ユーザーや他年度のカーソルの場合はInvalidCursorErrorを送出
+    start_key = decode_cursor(cursor)
+    if start_key is not None and not is_year_date_page_key(
+        start_key, user_id, year
+    ):
+        raise InvalidCursorError("Invalid cursor")
+    # YearDateIndexから取得するため、ページをまたいで日付の昇順となる
+    items, last_key = await query_year_contents_by_date_page(
+        user_id, table, year, limit, start_key
+    )
+    return items, encode_cursor(last_key)
 
 
 # def get_year_best_service(user_id: str, year: int) -> list[dict]:
@@ -73,12 +357,16 @@ def get_year_contents_service(
 async def add_watchlist_service(
     content: watchlistData, user_id: str, table: Any
 ):
+    validate_content_id(content.contentId)
     content.userId = user_id
-    add_watchlist(content, table)
+    await add_watchlist(content, table)
+    invalidate_content_reads(user_id)
 
 
-def get_watchlist_service(user_id: str, table: Any) -> list[dict]:
-    return get_watchlist_contents(user_id, table)
+async def get_watchlist_service(user_id: str, table: Any) -> list[dict]:
+    return await content_read_cache.get_or_fetch(
+        user_id, ("watchlist",), lambda: get_watchlist_contents(user_id, table)
+    )
 
 
 async def delete_watchlist_service(
@@ -87,103 +375,368 @@ async def delete_watchlist_service(
     if (content.userId != user_id) or (not content.contentId):
         raise
 
-    return delete_watchlist_contents(user_id, table, content.contentId)
+    deleted = await delete_watchlist_contents(
+        user_id, table, content.contentId
+    )
+    invalidate_content_reads(user_id)
+    invalidate_recommendations(user_id)
+    return deleted
 
 
-def get_recent_contents_service(
+async def get_recent_contents_service(
     user_id: str, table: Any, content_type: str
 ) -> list[dict]:
-    return get_recent_contents(user_id, table, content_type)
-
+    return await content_read_cache.get_or_fetch(
+        user_id,
+        ("recent", ContentType(content_type).value),
+        lambda: get_recent_contents(user_id, table, content_type),
+    )
+
+
+async def search_contents_service(
+    user_id: str,
+    table: Any,
+    query: Optional[str] = None,
+    prefix: Optional[str] = None,
+    content_type: Optional[ContentType] = None,
+    limit: int = 50,
+) -> list[dict]:
+    """
+    転置インデックスを使ってタイトル・メモからコンテンツを検索する
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param query: 検索語（空白区切りの全ての語をタイトル・メモに含むもの）
+    :param prefix: タイトルの前方一致
+    :param content_type: 作品種別
+    :param limit: 最大件数
+    :return: 該当するコンテンツ（鑑賞日の新しい順）
+    """
+    tokens = query_tokens(query) | query_tokens(prefix)
+    if not tokens:
+        return []
 
-def search_movie_links_tmdb(title: str) -> List[dict]:
-    """TMDB APIで映画情報とリンクを取得"""
-    try:
-        # TMDB APIキーが環境変数にあると仮定
-        api_key = os.getenv("TMDB_API_KEY")
-        if not api_key:
+    # 全てのトークンを含むコンテンツを候補とする
+    postings = await get_search_postings(user_id, table, sorted(tokens))
+    if postings is None:
+        # 転置インデックスの更新に失敗している場合は全件を候補とする
+        items = {
+            item["contentId"]: item
+            async for page in iter_user_content_pages(user_id, table)
+            for item in page
+        }
+    else:
+        candidates = set.intersection(
+            *(postings.get(token, set()) for token in tokens)
+        )
+        if not candidates:
             return []
+        items = await get_contents_by_ids(user_id, table, sorted(candidates))
+
+    # n-gramの組み合わせによる誤検出・更新前のトークンを取得したアイテムで除外する
+    normalized_prefix = normalize_search_text(prefix)
+    results = [
+        item
+        for item in items.values()
+        if item.get("year") is not None
+        and (content_type is None or item.get("type") == content_type.value)
+        and matches_query(query, item.get("title"), item.get("notes"))
+        and normalize_search_text(item.get("title")).startswith(
+            normalized_prefix
+        )
+    ]
+    results.sort(key=lambda x: x.get("date", ""), reverse=True)
+    return results[:limit]
 
-        # 映画検索
-        search_url = "https://api.themoviedb.org/3/search/movie"
-        params = {"api_key": api_key, "query": title, "language": "ja-JP"}
 
-        response = requests.get(search_url, params=params)
-        if response.status_code != 200:
-            return []
+class ExternalAPIError(Exception):
+    """外部APIが正常なレスポンスを返さなかった場合の例外"""
 
-        data = response.json()
-        if not data.get("results"):
-            return []
 
-        movie = data["results"][0]  # 最初の結果を使用
-        movie_id = movie.get("id")
+TMDB_SEARCH_URL = "https://api.themoviedb.org/3/search/movie"
+TMDB_LANGUAGE = "ja-JP"
+TMDB_PROVIDER = "tmdb"
 
-        links = []
 
-        # TMDB詳細ページ
-        links.append(
-            {
-                "site_name": "The Movie Database",
-                "url": (
-                    f"https://www.themoviedb.org/movie/{movie_id}?language=ja"
-                ),
-            }
-        )
+def movie_search_links(title: str) -> List[dict]:
+    """APIを使わずに作成できる映画の検索リンク"""
+    return [
+        {
+            "site_name": "Amazon Prime Video",
+            "url": f"https://www.amazon.co.jp/s?k={title}+映画&i=instant-video",
+        }
+    ]
 
-        # IMDb リンク (外部IDから取得)
-        # external_url = (
-        #     f"https://api.themoviedb.org/3/movie/{movie_id}/external_ids"
-        # )
-        # external_params = {"api_key": api_key}
-        # external_response = requests.get(
-        #     external_url, params=external_params
-        # )
-
-        # if external_response.status_code == 200:
-        #     external_data = external_response.json()
-        #     imdb_id = external_data.get("imdb_id")
-        #     if imdb_id:
-        #         links.append({
-        #             "site_name": "IMDb",
-        #             "url": f"https://www.imdb.com/title/{imdb_id}/",
-        #             "description": "国際映画データベース"
-        #         })
-
-        # Amazon Prime Video (検索URL)
-        links.append(
-            {
-                "site_name": "Amazon Prime Video",
-                "url": (
-                    f"https://www.amazon.co.jp/s?k={title}+映画&i=instant-video"
-                ),
-            }
-        )
 
-        return links
+def fetch_tmdb_movie(title: str, api_key: str) -> Optional[dict]:
+    """
+    TMDB APIで映画を検索し、最初の結果を返す
 
-    except Exception as e:
-        print(f"TMDB API error: {e}")
+    :return: 映画のメタデータ。見つからない場合はNone
+    :raises ExternalAPIError: APIが200以外を返した場合
+    """
+    params = {"api_key": api_key, "query": title, "language": TMDB_LANGUAGE}
+    response = get_http_client().hedged_get(TMDB_SEARCH_URL, params=params)
+    if response.status_code != 200:
+        raise ExternalAPIError(f"TMDB status {response.status_code}")
+
+    data = response.json()
+    if not data.get("results"):
+        return None
+
+    # キャッシュにはリンク作成に使う項目のみ保存する
+    movie = data["results"][0]  # 最初の結果を使用
+    return {"id": movie.get("id")}
+
+
+# 生成済みレコメンドのプロセス内キャッシュ
+# (ユーザーID, 種別) -> (履歴のフィンガープリント, レコメンド)
+recommendation_cache = TTLCache(
+    maxsize=settings.recommendation_cache_maxsize,
+    ttl=settings.recommendation_cache_ttl,
+)
+
+
+def _recommendation_key(user_id: str, content_type: str) -> tuple:
+    # クエリ（Enum）・DynamoDB（文字列）どちらの種別でも同じキーにする
+    return (user_id, ContentType(content_type).value)
+
+
+def history_fingerprint(history: List[str]) -> str:
+    """レコメンドの元になる履歴タイトルのハッシュ値を返す"""
+    return hashlib.sha256(
+        json.dumps(history, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def get_cached_recommendations(
+    user_id: str, content_type: str, history: List[str]
+) -> Optional[List[dict]]:
+    """
+    同じ履歴から生成済みのレコメンドを返す
+
+    :param user_id: ユーザーID
+    :param content_type: 作品種別
+    :param history: 履歴のタイトル
+    :return: レコメンド。未生成・履歴が変わった場合はNone
+    """
+    cached = recommendation_cache.get(
+        _recommendation_key(user_id, content_type)
+    )
+    if cached is None or cached[0] != history_fingerprint(history):
+        return None
+    return cached[1]
+
+
+def cache_recommendations(
+    user_id: str,
+    content_type: str,
+    history: List[str],
+    recommendations: List[dict],
+    complete: bool = True,
+) -> None:
+    """
+    生成したレコメンドを保持する
+
+    外部APIの障害・制限時間により実在確認を完了できなかった作品がある、
+    未確認の作品を含む、空のレコメンドは、提供元の復旧後に生成し直すよう
+    短い有効期限（RECOMMENDATION_DEGRADED_CACHE_TTL）で保持する。
+
+    :param user_id: ユーザーID
+    :param content_type: 作品種別
+    :param history: 履歴のタイトル
+    :param recommendations: レコメンド
+    :param complete: 全作品の実在確認が完了したか
+    :return: なし
+    """
+    degraded = (
+        not complete
+        or not recommendations
+        or any(rec.get("unverified") for rec in recommendations)
+    )
+    recommendation_cache.set(
+        _recommendation_key(user_id, content_type),
+        (history_fingerprint(history), recommendations),
+        ttl=settings.recommendation_degraded_cache_ttl if degraded else None,
+    )
+
+
+def invalidate_recommendations(user_id: str) -> None:
+    """コンテンツの登録・編集・削除で履歴が変わるため、ユーザーのレコメンドを破棄する"""
+    for content_type in ContentType:
+        recommendation_cache.pop(_recommendation_key(user_id, content_type))
+
+
+def search_movie_links_tmdb(title: str) -> List[dict]:
+    """
+    TMDB APIで映画情報とリンクを取得
+
+    見つからない場合のみ空のリストを返す。APIの障害・通信エラーは
+    架空作品と区別できるよう例外のまま送出する（呼び出し側で未完了として扱う）
+
+    :raises CircuitOpenError: TMDBのサーキットブレーカーが開いている場合
+    :raises ExternalAPIError: APIが200以外を返した場合
+    """
+    # TMDB APIキーは設定（環境変数 TMDB_API_KEY）から取得
+    api_key = settings.tmdb_api_key
+    if not api_key:
         return []
 
+    # 映画検索（メタデータキャッシュを優先し、ない場合のみAPIを呼び出す）
+    movie = get_metadata_cache().get_or_fetch(
+        title,
+        "movie",
+        TMDB_LANGUAGE,
+        lambda: get_breaker(TMDB_PROVIDER).call(
+            fetch_tmdb_movie, title, api_key
+        ),
+    )
+    if movie is None:
+        return []
 
-def search_book_links_google(title: str) -> List[dict]:
-    """Google Books APIで書籍情報とリンクを取得"""
-    try:
-        # Google Books API (APIキー不要)
-        search_url = "https://www.googleapis.com/books/v1/volumes"
-        params = {"q": title, "langRestrict": "ja", "maxResults": 1}
+    movie_id = movie.get("id")
 
-        response = requests.get(search_url, params=params)
+    links = []
+
+    # TMDB詳細ページ
+    links.append(
+        {
+            "site_name": "The Movie Database",
+            "url": (
+                f"https://www.themoviedb.org/movie/{movie_id}?language=ja"
+            ),
+        }
+    )
+
+    # IMDb リンク (外部IDから取得)
+    # external_url = (
+    #     f"https://api.themoviedb.org/3/movie/{movie_id}/external_ids"
+    # )
+    # external_params = {"api_key": api_key}
+    # external_response = requests.get(
+    #     external_url, params=external_params
+    # )
+
+    # if external_response.status_code == 200:
+    #     external_data = external_response.json()
+    #     imdb_id = external_data.get("imdb_id")
+    #     if imdb_id:
+    #         links.append({
+    #             "site_name": "IMDb",
+    #             "url": f"https://www.imdb.com/title/{imdb_id}/",
+    #             "description": "国際映画データベース"
+    #         })
+
+    # Amazon Prime Video (検索URL)
+    links.extend(movie_search_links(title))
+
+    return links
+
+
+GOOGLE_BOOKS_SEARCH_URL = "https://www.googleapis.com/books/v1/volumes"
+GOOGLE_BOOKS_LANGUAGE = "ja"
+GOOGLE_BOOKS_PROVIDER = "google_books"
+
+
+def book_search_links(title: str) -> List[dict]:
+    """APIを使わずに作成できる書籍の検索リンク"""
+    return [
+        # Amazon検索
+        {
+            "site_name": "Amazon",
+            "url": f"https://www.amazon.co.jp/s?k={title}+本",
+        },
+        # 楽天ブックス検索
+        {
+            "site_name": "楽天ブックス",
+            "url": f"https://books.rakuten.co.jp/search?sitem={title}",
+        },
+    ]
+
+
+class GoogleBooksLookup:
+    """
+    1タイトル分のGoogle Books API検索結果
+
+    検索は初回参照時に1回だけ行い、実在確認とリンク作成で結果を共有する。
+    Google Booksのサーキットブレーカーが開いている場合、
+    exists / links は CircuitOpenError を送出する。
+    APIの障害・通信エラーの場合は ExternalAPIError 等をそのまま送出する。
+
+    Args:
+        title (str): 書籍タイトル
+    """
+
+    def __init__(self, title: str):
+        self.title = title
+        self._fetched = False
+        self._book: Optional[dict] = None
+
+    def book(self) -> Optional[dict]:
+        """検索結果の最初の書籍を返す（結果がない場合はNone）"""
+        if not self._fetched:
+            self._book = self._fetch()
+            self._fetched = True
+        return self._book
+
+    def _fetch(self) -> Optional[dict]:
+        # メタデータキャッシュを優先し、ない場合のみAPIを呼び出す
+        # （APIの障害・通信エラーは「見つからない」と区別するため例外のまま送出）
+        return get_metadata_cache().get_or_fetch(
+            self.title,
+            "book",
+            GOOGLE_BOOKS_LANGUAGE,
+            lambda: get_breaker(GOOGLE_BOOKS_PROVIDER).call(self._request),
+        )
+
+    def _request(self) -> Optional[dict]:
+        # Google Books API (APIキー不要)
+        params = {
+            "q": self.title,
+            "langRestrict": GOOGLE_BOOKS_LANGUAGE,
+            "maxResults": 1,
+        }
+        response = get_http_client().hedged_get(
+            GOOGLE_BOOKS_SEARCH_URL, params=params
+        )
         if response.status_code != 200:
-            return []
+            raise ExternalAPIError(
+                f"Google Books status {response.status_code}"
+            )
 
         data = response.json()
         if not data.get("items"):
-            return []
+            return None
 
+        # キャッシュには実在確認・リンク作成に使う項目のみ保存する
         book = data["items"][0]
+        volume_info = book.get("volumeInfo", {})
+        return {
+            "id": book.get("id"),
+            "volumeInfo": {"title": volume_info.get("title", "")},
+        }
+
+    def exists(self) -> bool:
+        """書籍の実在を確認"""
+        book = self.book()
+        if book is None:
+            return False
+
+        # 検索結果の最初の書籍のタイトルが入力タイトルと近似しているかチェック
+        volume_info = book.get("volumeInfo", {})
+        found_title = volume_info.get("title", "").lower()
+        input_title = self.title.lower()
 
+        # タイトルが含まれているかの簡単なチェック
+        return input_title in found_title or found_title in input_title
+
+    def links(self) -> List[dict]:
+        """書籍のリンクを作成"""
+        book = self.book()
+        if book is None:
+            return []
+
+        title = self.title
         links = []
 
         # Google Books詳細ページ
@@ -195,135 +748,256 @@ def search_book_links_google(title: str) -> List[dict]:
                 }
             )
 
-        # Amazon検索
-        links.append(
-            {
-                "site_name": "Amazon",
-                "url": f"https://www.amazon.co.jp/s?k={title}+本",
-            }
-        )
-
-        # 楽天ブックス検索
-        links.append(
-            {
-                "site_name": "楽天ブックス",
-                "url": f"https://books.rakuten.co.jp/search?sitem={title}",
-            }
-        )
+        links.extend(book_search_links(title))
 
         return links
 
-    except Exception as e:
-        print(f"Google Books API error: {e}")
-        return []
+
+def search_book_links_google(
+    title: str, lookup: Optional[GoogleBooksLookup] = None
+) -> List[dict]:
+    """Google Books APIで書籍情報とリンクを取得"""
+    return (lookup or GoogleBooksLookup(title)).links()
 
 
-def verify_book_exists(title: str) -> bool:
+def verify_book_exists(
+    title: str, lookup: Optional[GoogleBooksLookup] = None
+) -> bool:
     """Google Books APIで書籍の実在を確認"""
-    try:
-        search_url = "https://www.googleapis.com/books/v1/volumes"
-        params = {"q": title, "langRestrict": "ja", "maxResults": 1}
+    return (lookup or GoogleBooksLookup(title)).exists()
 
-        response = requests.get(search_url, params=params)
-        if response.status_code != 200:
-            return False
 
-        data = response.json()
-        if not data.get("items"):
-            return False
+def search_external_api_links(
+    title: str,
+    content_type: str,
+    book_lookup: Optional[GoogleBooksLookup] = None,
+) -> List[dict]:
+    """外部APIを使って作品の信頼できるリンクを取得"""
+    if content_type == "movie":
+        return search_movie_links_tmdb(title)
+    elif content_type == "book":
+        return search_book_links_google(title, book_lookup)
+    else:
+        return []
 
-        # 検索結果の最初の書籍のタイトルが入力タイトルと近似しているかチェック
-        book = data["items"][0]
-        volume_info = book.get("volumeInfo", {})
-        found_title = volume_info.get("title", "").lower()
-        input_title = title.lower()
 
-        # タイトルが含まれているかの簡単なチェック
-        return input_title in found_title or found_title in input_title
+def find_recommendation_links(
+    title: str, content_type: str
+) -> Optional[List[dict]]:
+    """
+    推薦作品の実在確認とリンク取得を行う
 
-    except Exception as e:
-        print(f"Book verification error: {e}")
-        return False
+    :param title: 作品タイトル
+    :param content_type: 作品種別（movie / book）
+    :return: リンクのリスト。架空作品として除外する場合はNone
+    :raises Exception: 提供元のAPIの障害・通信エラー（検索結果がないこととは区別する）
+    """
+    # 書籍は実在確認とリンク取得で同じ検索結果を使い、APIの呼び出しを1回にする
+    book_lookup = GoogleBooksLookup(title) if content_type == "book" else None
 
+    # 書籍の場合は実在確認
+    if book_lookup and not verify_book_exists(title, book_lookup):
+        print(f"書籍 '{title}' は実在しないため除外します")
+        return None
 
-def search_external_api_links(title: str, content_type: str) -> List[dict]:
-    """外部APIを使って作品の信頼できるリンクを取得"""
+    links = search_external_api_links(title, content_type, book_lookup)
+
+    # リンクが取得できない場合は架空作品として除外
+    if not links:
+        print(f"作品 '{title}' のリンクが取得できないため除外します")
+        return None
+    return links
+
+
+def fallback_links(title: str, content_type: str) -> List[dict]:
+    """提供元のAPIを使えない場合のリンク（検索ページのみ）"""
     if content_type == "movie":
-        return search_movie_links_tmdb(title)
+        return movie_search_links(title)
     elif content_type == "book":
-        return search_book_links_google(title)
+        return book_search_links(title)
     else:
         return []
 
 
-def generate_recommendations_bedrock(type: str, history: List[str]) -> str:
-    """Amazon Bedrockを使ってレコメンドを生成"""
+def _verified_recommendation(
+    future: Future, rec: dict, content_type: str
+) -> Optional[dict]:
+    # 完了した検索の結果からリンクを付与する。除外する場合はNone
+    if future.cancelled():
+        return None
+    if isinstance(future.exception(), CircuitOpenError):
+        # 提供元の障害中は実在確認を行わず、未確認として返す
+        print(
+            f"作品 '{rec['title']}' は提供元の障害中のため未確認として返します"
+        )
+        rec["links"] = fallback_links(rec["title"], content_type)
+        rec["unverified"] = True
+        return rec
+    if future.exception() is not None:
+        print(f"作品 '{rec['title']}' の検索でエラー: {future.exception()}")
+        return None
+    links = future.result()
+    if links is None:
+        return None
+    rec["links"] = links
+    return rec
+
+
+def _lookup_incomplete(future: Future) -> bool:
+    # 制限時間切れ・エラーで実在確認を完了できなかったか
+    # （提供元の障害中で未確認として返す作品は _verified_recommendation で判定する）
+    if not future.done() or future.cancelled():
+        return True
+    error = future.exception()
+    return error is not None and not isinstance(error, CircuitOpenError)
+
+
+def attach_recommendation_links(
+    recommendations: List[dict],
+    content_type: str,
+    budget: Optional[float] = None,
+) -> tuple[List[dict], bool]:
+    """
+    推薦作品ごとの実在確認・リンク取得を並行して実行し、リンクを付与する
+
+    全作品の検索を合計で budget 秒（既定は設定値）までで打ち切り、
+    期限内に完了しなかった作品は除外する。返却順は推薦順のまま。
+
+    :param recommendations: Bedrockが返した推薦作品のリスト
+    :param content_type: 作品種別（movie / book）
+    :param budget: 検索全体の制限時間（秒）
+    :return: (リンクを付与した推薦作品のリスト,
+             全作品の検索が制限時間内にエラーなく完了したか)
+    """
+    targets = [rec for rec in recommendations if "title" in rec]
+    if not targets:
+        return [], True
+    if budget is None:
+        budget = settings.recommendation_lookup_budget
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(targets), settings.recommendation_lookup_workers)
+    )
     try:
-
-        client = boto3.client("bedrock-runtime", region_name="ap-northeast-1")
-
-        tool_name = "Recommended_works_to_check_out_next"
-        description = "次にチェックするべきおすすめ作品"
-        tool_definition = {
-            "toolSpec": {
-                "name": tool_name,
-                "description": description,
-                "inputSchema": {
-                    "json": {
-                        "type": "object",
-                        "properties": {
-                            "recommendations": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "title": {"type": "string"},
-                                        "desc": {"type": "string"},
-                                        # "link": {"type": "string"}
-                                    },
-                                    "required": ["title", "desc"],
+        futures = [
+            executor.submit(
+                find_recommendation_links, rec["title"], content_type
+            )
+            for rec in targets
+        ]
+        wait(futures, timeout=budget)
+    finally:
+        # 制限時間を過ぎた検索の完了は待たない
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    verified_recommendations = []
+    complete = True
+    for rec, future in zip(targets, futures):
+        if not future.done():
+            print(
+                f"作品 '{rec['title']}' の検索が制限時間内に完了しないため除外します"
+            )
+            complete = False
+            continue
+        complete = complete and not _lookup_incomplete(future)
+        verified = _verified_recommendation(future, rec, content_type)
+        if verified is not None:
+            verified_recommendations.append(verified)
+    return verified_recommendations, complete
+
+
+@lru_cache(maxsize=None)
+def get_bedrock_client():
+    # レコメンド時のみ利用するため、初回呼び出し時にクライアントを作成し使い回す
+    return boto3.client("bedrock-runtime", region_name=settings.bedrock_region)
+
+
+RECOMMENDATION_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+RECOMMENDATION_TOOL_NAME = "Recommended_works_to_check_out_next"
+
+
+def build_recommendation_request(type: str, history: List[str]) -> dict:
+    """Bedrockのconverse / converse_stream に渡すリクエストを作成"""
+    tool_name = RECOMMENDATION_TOOL_NAME
+    description = "次にチェックするべきおすすめ作品"
+    tool_definition = {
+        "toolSpec": {
+            "name": tool_name,
+            "description": description,
+            "inputSchema": {
+                "json": {
+                    "type": "object",
+                    "properties": {
+                        "recommendations": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string"},
+                                    "desc": {"type": "string"},
+                                    # "link": {"type": "string"}
                                 },
-                            }
-                        },
-                        "required": ["recommendations"],
-                    }
-                },
-            }
+                                "required": ["title", "desc"],
+                            },
+                        }
+                    },
+                    "required": ["recommendations"],
+                }
+            },
+        }
+    }
+
+    prompt = f"""
+    <text>
+    私は以下の{"映画を鑑賞" if type == "movie" else "本を読書"}しました。
+    {history}
+
+    {"次に観るべき映画" if type == "movie" else "次に読むべき本"}を3つ推薦してください。
+    各作品について、タイトル、簡潔な説明を提供してください。
+    タイトル、説明は日本語で返却してください。
+    {tool_name} ツールのみを利用すること。
+    </text>
+    """
+
+    print("prompt")
+    print(prompt)
+
+    messages = [
+        {
+            "role": "user",
+            "content": [{"text": prompt}],
         }
+    ]
+
+    return {
+        "modelId": RECOMMENDATION_MODEL_ID,
+        "messages": messages,
+        "toolConfig": {
+            "tools": [tool_definition],
+            "toolChoice": {
+                "tool": {
+                    "name": tool_name,
+                },
+            },
+        },
+    }
 
-        prompt = f"""
-        <text>
-        私は以下の{"映画を鑑賞" if type == "movie" else "本を読書"}しました。
-        {history}
 
-        {"次に観るべき映画" if type == "movie" else "次に読むべき本"}を3つ推薦してください。
-        各作品について、タイトル、簡潔な説明を提供してください。
-        タイトル、説明は日本語で返却してください。
-        {tool_name} ツールのみを利用すること。
-        </text>
-        """
+def generate_recommendations_bedrock(
+    type: str, history: List[str]
+) -> tuple[List[dict], bool]:
+    """
+    Amazon Bedrockを使ってレコメンドを生成
 
-        print("prompt")
-        print(prompt)
+    :return: (実在確認・リンク付与済みの推薦作品のリスト,
+             全作品の実在確認が完了したか)
+    """
+    try:
 
-        messages = [
-            {
-                "role": "user",
-                "content": [{"text": prompt}],
-            }
-        ]
+        client = get_bedrock_client()
 
         response = client.converse(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            messages=messages,
-            toolConfig={
-                "tools": [tool_definition],
-                "toolChoice": {
-                    "tool": {
-                        "name": tool_name,
-                    },
-                },
-            },
+            **build_recommendation_request(type, history)
         )
         print("response")
         print(response)
@@ -335,46 +1009,160 @@ def generate_recommendations_bedrock(type: str, history: List[str]) -> str:
 
         if tool_use_args and "recommendations" in tool_use_args:
             recommendations_list = tool_use_args["recommendations"]
-            verified_recommendations = []
-
-            # 各推薦作品の検証とリンク検索
-            for rec in recommendations_list:
-                if "title" in rec:
-                    # 書籍の場合は実在確認
-                    if type == "book":
-                        if not verify_book_exists(rec["title"]):
-                            print(
-                                f"書籍 '{rec['title']}' は実在しないため除外します"
-                            )
-                            continue
-
-                    # リンク取得
-                    links = search_external_api_links(rec["title"], type)
-
-                    # リンクが取得できない場合は架空作品として除外
-                    if not links or len(links) == 0:
-                        print(
-                            f"作品 '{rec['title']}' のリンクが取得できないため除外します"
-                        )
-                        continue
-
-                    rec["links"] = links
-                    verified_recommendations.append(rec)
+            verified_recommendations, complete = attach_recommendation_links(
+                recommendations_list, type
+            )
 
             # 検証済み推薦リストを返す
-            final_result = {"recommendations": verified_recommendations}
-            recommendations = json.dumps(
-                final_result, indent=2, ensure_ascii=False
-            )
-            print(recommendations)
-            return recommendations
+            print(verified_recommendations)
+            return verified_recommendations, complete
         else:
-            return json.dumps({"recommendations": []}, ensure_ascii=False)
+            return [], True
     except Exception as e:
         print(f"""Error: {e}""")
         raise
 
 
+class RecommendationStreamParser:
+    """
+    ストリーミングで届くtoolUseの入力（JSONの断片）から、
+    recommendations 配列の要素を完成したものから順に取り出す
+    """
+
+    _ARRAY_START = re.compile(r'"recommendations"\s*:\s*\[')
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # 配列内で次に読み取る位置
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, fragment: str) -> List[dict]:
+        self._buffer += fragment
+        if self._pos is None:
+            match = self._ARRAY_START.search(self._buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        items = []
+        while True:
+            pos = self._pos
+            while pos < len(self._buffer) and self._buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+            if pos >= len(self._buffer) or self._buffer[pos] == "]":
+                break
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                # 要素の途中までしか届いていない
+                break
+            self._pos = end
+            if isinstance(item, dict):
+                items.append(item)
+        return items
+
+
+def stream_recommendation_candidates(
+    type: str, history: List[str]
+) -> Iterator[dict]:
+    """
+    Bedrockで推薦作品を生成し、作品ごとに生成され次第返す
+
+    converse_stream が利用できない場合は converse の結果をまとめて返す。
+    """
+    client = get_bedrock_client()
+    request = build_recommendation_request(type, history)
+
+    if not hasattr(client, "converse_stream"):
+        response = client.converse(**request)
+        tool_use_args = extract_tool_use_args(
+            response["output"]["message"]["content"]
+        )
+        yield from (tool_use_args or {}).get("recommendations", [])
+        return
+
+    response = client.converse_stream(**request)
+    parser = RecommendationStreamParser()
+    for event in response["stream"]:
+        delta = event.get("contentBlockDelta", {}).get("delta", {})
+        fragment = delta.get("toolUse", {}).get("input")
+        if fragment:
+            yield from parser.feed(fragment)
+
+
+def stream_recommendations(
+    type: str, history: List[str], budget: Optional[float] = None
+) -> Iterator[tuple[str, dict]]:
+    """
+    レコメンドを生成し、実在確認・リンク取得が完了した作品から順に返す
+
+    各作品の検索は生成され次第開始する。生成完了から budget 秒
+    （既定は設定値）以内に検索が完了しなかった作品は除外する。
+
+    :param type: 作品種別（movie / book）
+    :param history: 履歴のタイトル
+    :param budget: 生成完了後の検索の制限時間（秒）
+    :return: ("recommendation", 推薦順の index を付与した作品) を完了順に返し、
+             最後に ("done", {"total": 返却数, "candidates": 生成数,
+             "complete": 全作品の実在確認が完了したか}) を返す
+    """
+    if budget is None:
+        budget = settings.recommendation_lookup_budget
+
+    executor = ThreadPoolExecutor(
+        max_workers=settings.recommendation_lookup_workers
+    )
+    pending: dict[Future, dict] = {}
+    candidates = 0
+    total = 0
+    complete = True
+    try:
+        for rec in stream_recommendation_candidates(type, history):
+            if "title" not in rec:
+                continue
+            future = executor.submit(
+                find_recommendation_links, rec["title"], type
+            )
+            pending[future] = {"index": candidates, **rec}
+            candidates += 1
+
+            # 生成中に検索が完了した作品は先に返す
+            for done in [f for f in pending if f.done()]:
+                complete = complete and not _lookup_incomplete(done)
+                verified = _verified_recommendation(
+                    done, pending.pop(done), type
+                )
+                if verified is not None:
+                    total += 1
+                    yield "recommendation", verified
+
+        try:
+            for done in as_completed(list(pending), timeout=budget):
+                complete = complete and not _lookup_incomplete(done)
+                verified = _verified_recommendation(
+                    done, pending.pop(done), type
+                )
+                if verified is not None:
+                    total += 1
+                    yield "recommendation", verified
+        except TimeoutError:
+            complete = False
+            for rec in pending.values():
+                print(
+                    f"作品 '{rec['title']}' の検索が制限時間内に完了しないため除外します"
+                )
+    finally:
+        # 制限時間を過ぎた検索・切断後の検索の完了は待たない
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield "done", {
+        "total": total,
+        "candidates": candidates,
+        "complete": complete,
+    }
+
+
 def extract_tool_use_args(content):
     """Claude3の返却値からtoolUseのinputを抽出"""
     for item in content:
@@ -1,8 +1,10 @@
 from typing import Any
 
 from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
 
-from app.db.dynamodb import get_content_table, user_table
+from app.crud.user_curd import load_user_profile, user_profile_cache
+from app.db.dynamodb import get_content_table
 from app.schemas.content import DependsData
 from app.services.user_service import get_user_id
 
@@ -12,10 +14,20 @@ async def get_content_table_and_user_id(
     user_id: str = Depends(get_user_id),
 ) -> DependsData:
     # ユーザー課金状態をユーザーテーブルから取得（存在しない場合は無料）
+    # キャッシュ済みの場合はDBアクセスを行わない
     try:
-        user_resp = user_table.get_item(Key={"userId": user_id})
-        item = user_resp.get("Item") or {}
-        is_premium = bool(item.get("is_premium"))
+        profile = user_profile_cache.get(user_id)
+        if profile is None:
+            profile = await run_in_threadpool(load_user_profile, user_id)
+        is_premium = bool(profile.get("is_premium"))
     except Exception:
         is_premium = False
     return DependsData(table=table, user_id=user_id, is_premium=is_premium)
+
+
+async def get_content_table_and_user_id_without_premium(
+    table: Any = Depends(get_content_table),
+    user_id: str = Depends(get_user_id),
+) -> DependsData:
+    # 有料会員フラグを利用しないルート用（ユーザーテーブルを参照しない）
+    return DependsData(table=table, user_id=user_id)
@@ -0,0 +1,74 @@
+"""
+コンテンツのエクスポート（CSV / JSONL）
+
+ユーザーの全コンテンツをページ単位で取得しながら1行ずつ出力する。
+取得したページは出力後に破棄するため、件数によらずメモリ使用量は一定。
+"""
+
+import csv
+import io
+from typing import Any, AsyncIterator, Optional
+
+from app.crud.async_content_crud import iter_user_content_pages
+from app.schemas.content import ContentFileFormat
+from app.utils import dumps_json
+
+# 出力する項目（先頭の6項目は一括登録でそのまま取り込める）
+EXPORT_FIELDS = (
+    "contentId",
+    "type",
+    "title",
+    "date",
+    "notes",
+    "link",
+    "year",
+    "rank",
+    "status",
+    "watchlist_at",
+)
+# 1回のクエリで取得する件数
+EXPORT_PAGE_SIZE = 100
+
+EXPORT_MEDIA_TYPES = {
+    ContentFileFormat.csv: "text/csv; charset=utf-8",
+    ContentFileFormat.jsonl: "application/x-ndjson",
+}
+
+
+def export_row(item: dict) -> dict:
+    """アイテムから出力する項目のみを取り出す"""
+    return {name: item.get(name) for name in EXPORT_FIELDS}
+
+
+def _csv_line(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(
+        ["" if value is None else value for value in values]
+    )
+    return buffer.getvalue()
+
+
+async def export_contents_service(
+    user_id: str,
+    table: Any,
+    format: ContentFileFormat,
+    page_size: Optional[int] = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[str]:
+    """
+    ユーザーの全コンテンツ（ウォッチリスト・順位を含む）を1行ずつ出力する
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param format: ファイル形式（CSVの場合は先頭にヘッダー行を出力）
+    :param page_size: 1回のクエリで取得する件数
+    :return: 1行分の文字列（改行を含む）のイテレータ
+    """
+    if format == ContentFileFormat.csv:
+        yield _csv_line(list(EXPORT_FIELDS))
+    async for page in iter_user_content_pages(user_id, table, page_size):
+        for item in page:
+            row = export_row(item)
+            if format == ContentFileFormat.csv:
+                yield _csv_line(list(row.values()))
+            else:
+                yield dumps_json(row) + "\n"
@@ -0,0 +1,302 @@
+"""
+コンテンツの一括登録（CSV / JSONL の取り込み）
+
+リクエストボディを読みながら1行ずつ解析し、
+RegisterContentData で検証した行を一定件数ごとにまとめて書き込む。
+ファイル全体をメモリに載せないため、大きなファイルでもメモリ使用量は一定。
+検証・書き込みに失敗した行は行番号とエラー内容をレポートで返す。
+"""
+
+import codecs
+import csv
+import json
+import uuid
+from typing import Any, AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.crud.async_content_crud import (
+    batch_add_contents,
+    get_existing_contents,
+)
+from app.crud.content_crud import BatchWriteError
+from app.schemas.content import ContentFileFormat, RegisterContentData
+from app.services.content_service import (
+    invalidate_content_reads,
+    invalidate_recommendations,
+)
+from app.utils import (
+    InvalidContentIdError,
+    extract_year_from_date,
+    validate_content_id,
+)
+
+# 取り込み対象の列（それ以外の列は無視する）
+IMPORT_FIELDS = ("contentId", "type", "title", "date", "notes", "link")
+# レポートに含めるエラー行の上限
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportRowError(ValueError):
+    """取り込み対象の行が不正な場合の例外"""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    受信したバイト列をUTF-8として復号し、1行ずつ返す（改行文字を含む）
+
+    チャンクの境界で分割されたマルチバイト文字・行は次のチャンクと結合する。
+    先頭のBOMは取り除く。
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        # 末尾の改行のない行は続きを待つ
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def iter_csv_rows(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    CSVを1レコードずつ解析する（1行目はヘッダー）
+
+    クォート内の改行を含むレコードは複数行を結合して解析する。
+
+    :return: (開始行の行番号, 列名ごとの値, エラー内容) のイテレータ
+    """
+    header = None
+    record = ""
+    start = 0
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not record:
+            start = line_no
+        record += line
+        # クォートの数が奇数の場合はクォート内の改行のため次の行と結合する
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, None, (
+                f"expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        yield start, dict(zip(header, values)), None
+    if record:
+        yield start, None, "unterminated quoted field"
+
+
+async def iter_jsonl_rows(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    JSONLを1行ずつ解析する
+
+    :return: (行番号, 項目ごとの値, エラー内容) のイテレータ
+    """
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "each line must be a JSON object"
+            continue
+        yield line_no, row, None
+
+
+def build_import_content(row: dict, user_id: str) -> RegisterContentData:
+    """
+    1行分の値から登録するコンテンツを作成する
+
+    空の列は未指定として扱い、contentIdが未指定の場合は採番する。
+    年度・type_date はここで付与する。
+
+    :raises ImportRowError: 値が不正な場合
+    """
+    data = {
+        name: value
+        for name, value in row.items()
+        if name in IMPORT_FIELDS and value not in ("", None)
+    }
+    data.setdefault("contentId", uuid.uuid4().hex)
+    try:
+        content = RegisterContentData(**data)
+    except ValidationError as e:
+        raise ImportRowError(
+            *[
+                f"{'.'.join(str(loc) for loc in error['loc'])}: "
+                f"{error['msg']}"
+                for error in e.errors()
+            ]
+        )
+
+    # 集計アイテム等のシステムのアイテムを上書きさせない
+    try:
+        validate_content_id(content.contentId)
+    except InvalidContentIdError as e:
+        raise ImportRowError(str(e))
+
+    content.year = extract_year_from_date(content.date)
+    if content.year is None:
+        raise ImportRowError("date: must be in YYYY-MM-DD format")
+    content.userId = user_id
+    content.type_date = f"{content.type.value}#{content.date}"
+    return content
+
+
+class ImportReport:
+    """取り込み結果（登録件数・失敗件数・失敗した行）"""
+
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(
+        self, row: int, content_id: Optional[str], messages: List[str]
+    ) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(
+                {"row": row, "contentId": content_id, "errors": messages}
+            )
+
+    def to_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+async def _write_chunk(
+    user_id: str,
+    table: Any,
+    chunk: List[tuple[int, RegisterContentData]],
+    report: ImportReport,
+) -> None:
+    # 登録済みのコンテンツ（yearあり）は件数が重複するため上書きしない
+    # （ウォッチリストのコンテンツは登録済みとして上書きする）
+    existing = await get_existing_contents(
+        user_id, table, [content.contentId for _, content in chunk]
+    )
+    contents = []
+    for row, content in chunk:
+        item = existing.get(content.contentId)
+        if item is not None and item.get("year") is not None:
+            report.add_error(
+                row, content.contentId, ["contentId: already exists"]
+            )
+        else:
+            contents.append((row, content))
+    if not contents:
+        return
+
+    try:
+        await batch_add_contents(
+            user_id, [content for _, content in contents], table
+        )
+    except BatchWriteError as e:
+        # 書き込み済みの行は登録済みとし、書き込めなかった行のみ失敗とする
+        unwritten = set(e.unwritten)
+        for row, content in contents:
+            if content.contentId in unwritten:
+                report.add_error(
+                    row, content.contentId, [f"write failed: {e}"]
+                )
+            else:
+                report.imported += 1
+        return
+    except Exception as e:
+        for row, content in contents:
+            report.add_error(row, content.contentId, [f"write failed: {e}"])
+        return
+    report.imported += len(contents)
+
+
+async def import_contents_service(
+    user_id: str,
+    table: Any,
+    chunks: AsyncIterator[bytes],
+    format: ContentFileFormat,
+) -> dict:
+    """
+    CSV / JSONL のコンテンツを一括登録する
+
+    :param user_id: ユーザーID
+    :param table: DynamoDBのテーブルオブジェクト
+    :param chunks: リクエストボディ（バイト列のチャンク）
+    :param format: ファイル形式
+    :return: 取り込み結果（imported・failed・errors）
+    """
+    lines = iter_lines(chunks)
+    if format == ContentFileFormat.csv:
+        rows = iter_csv_rows(lines)
+    else:
+        rows = iter_jsonl_rows(lines)
+
+    report = ImportReport()
+    seen: set[str] = set()
+    pending: List[tuple[int, RegisterContentData]] = []
+    count = 0
+    async for row_no, row, error in rows:
+        count += 1
+        if count > settings.bulk_import_max_rows:
+            report.add_error(
+                row_no,
+                None,
+                [
+                    "too many rows: at most "
+                    f"{settings.bulk_import_max_rows} rows can be imported"
+                ],
+            )
+            break
+        if error is not None:
+            report.add_error(row_no, None, [error])
+            continue
+
+        content_id = row.get("contentId") or None
+        try:
+            content = build_import_content(row, user_id)
+        except ImportRowError as e:
+            report.add_error(row_no, content_id, list(e.args))
+            continue
+        if content.contentId in seen:
+            report.add_error(
+                row_no, content.contentId, ["contentId: duplicated in file"]
+            )
+            continue
+        seen.add(content.contentId)
+
+        pending.append((row_no, content))
+        if len(pending) >= settings.bulk_import_chunk_size:
+            await _write_chunk(user_id, table, pending, report)
+            pending = []
+
+    if pending:
+        await _write_chunk(user_id, table, pending, report)
+    if report.imported:
+        invalidate_content_reads(user_id)
+        invalidate_recommendations(user_id)
+    return report.to_dict()
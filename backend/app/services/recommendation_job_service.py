@@ -0,0 +1,180 @@
+"""
+レコメンドの非同期ジョブ
+
+POSTでジョブを登録してすぐに応答し、Bedrockによる生成はワーカーで実行する。
+ワーカーは設定（RECOMMENDATION_JOB_FUNCTION_NAME）に応じて以下のどちらかで実行する。
+    未設定 : プロセス内のスレッドプール（同時実行数は RECOMMENDATION_JOB_WORKERS）
+    設定   : 指定したLambda関数の非同期呼び出し（同時実行数は関数の予約同時実行数で制御）
+"""
+
+import hashlib
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.crud.recommendation_job_crud import (
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_SUCCEEDED,
+    get_job_store,
+)
+from app.services.content_service import (
+    cache_recommendations,
+    generate_recommendations_bedrock,
+    get_cached_recommendations,
+    history_fingerprint,
+)
+
+# Lambdaの非同期呼び出しで、ジョブの実行であることを示すイベントのキー
+JOB_EVENT_KEY = "recommendationJobId"
+
+
+def recommendation_job_id(
+    user_id: str, content_type: str, history: List[str]
+) -> str:
+    """ユーザー・種別・履歴が同じ投稿が同じジョブになるようIDを決める"""
+    source = f"{user_id}#{content_type}#{history_fingerprint(history)}"
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def job_response(job: dict) -> dict:
+    """APIで返却するジョブの項目"""
+    response = {"jobId": job["jobId"], "status": job["status"]}
+    if job["status"] == JOB_STATUS_SUCCEEDED:
+        response["recommendations"] = job["result"]
+    elif job["status"] == JOB_STATUS_FAILED:
+        response["error"] = job.get("error")
+    return response
+
+
+def _submit(user_id: str, content_type: str, history: List[str]) -> dict:
+    store = get_job_store()
+    now = int(time.time())
+    job = {
+        "jobId": recommendation_job_id(user_id, content_type, history),
+        "userId": user_id,
+        "contentType": content_type,
+        "history": history,
+        "status": JOB_STATUS_PENDING,
+        "createdAt": now,
+        "updatedAt": now,
+        "expiresAt": now + int(settings.recommendation_job_ttl),
+    }
+
+    # 生成済みのレコメンドがあればワーカーを使わずに完了とする
+    cached = get_cached_recommendations(user_id, content_type, history)
+    if cached is not None:
+        job.update(status=JOB_STATUS_SUCCEEDED, result=cached)
+
+    if not store.create(job):
+        # 同じジョブが待機中・実行中・完了済み
+        existing = store.get(job["jobId"])
+        if existing is not None:
+            return existing
+        store.create(job)
+
+    if job["status"] == JOB_STATUS_PENDING:
+        try:
+            dispatch_recommendation_job(job["jobId"])
+        except Exception as e:
+            # ワーカーに渡せなかったジョブは失敗とし、再投稿で登録し直せるようにする
+            store.finish(
+                job["jobId"], {"status": JOB_STATUS_FAILED, "error": str(e)}
+            )
+            raise
+    return job
+
+
+async def submit_recommendation_job(
+    user_id: str, content_type: str, history: List[str]
+) -> dict:
+    """
+    レコメンドジョブを登録する
+
+    :param user_id: ユーザーID
+    :param content_type: 作品種別
+    :param history: 履歴のタイトル
+    :return: ジョブ（同じジョブが登録済みの場合はそのジョブ）
+    """
+    return await run_in_threadpool(_submit, user_id, content_type, history)
+
+
+async def get_recommendation_job(user_id: str, job_id: str) -> Optional[dict]:
+    """
+    ジョブを取得する
+
+    :param user_id: ユーザーID
+    :param job_id: ジョブID
+    :return: ジョブ。存在しない・他のユーザーのジョブの場合はNone
+    """
+    job = await run_in_threadpool(get_job_store().get, job_id)
+    if job is None or job["userId"] != user_id:
+        return None
+    return job
+
+
+def run_recommendation_job(job_id: str) -> None:
+    """
+    ジョブを実行する（ワーカー）
+
+    待機中のジョブのみ実行し、他のワーカーが実行中・実行済みの場合は何もしない。
+    """
+    store = get_job_store()
+    if not store.claim(job_id):
+        return
+    job = store.get(job_id)
+    if job is None:
+        return
+
+    user_id = job["userId"]
+    content_type = job["contentType"]
+    history = list(job["history"])
+    try:
+        result = get_cached_recommendations(user_id, content_type, history)
+        if result is None:
+            result, complete = generate_recommendations_bedrock(
+                content_type, history
+            )
+            cache_recommendations(
+                user_id, content_type, history, result, complete
+            )
+        store.finish(
+            job_id, {"status": JOB_STATUS_SUCCEEDED, "result": result}
+        )
+    except Exception as e:
+        traceback.print_exc()
+        store.finish(job_id, {"status": JOB_STATUS_FAILED, "error": str(e)})
+
+
+@lru_cache(maxsize=None)
+def _job_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.recommendation_job_workers,
+        thread_name_prefix="recommendation-job",
+    )
+
+
+@lru_cache(maxsize=None)
+def _lambda_client():
+    import boto3
+
+    return boto3.client("lambda", region_name=settings.aws_region)
+
+
+def dispatch_recommendation_job(job_id: str) -> None:
+    """ジョブをワーカーに渡す"""
+    function_name = settings.recommendation_job_function_name
+    if function_name:
+        _lambda_client().invoke(
+            FunctionName=function_name,
+            InvocationType="Event",
+            Payload=json.dumps({JOB_EVENT_KEY: job_id}).encode(),
+        )
+    else:
+        _job_executor().submit(run_recommendation_job, job_id)
@@ -1,24 +1,59 @@
-import os
+import hashlib
+import time
 
 import jwt
-from dotenv import load_dotenv
 from fastapi import HTTPException, Request
 from jwt import PyJWKClient
 
+from app.cache import TTLCache
+from app.config import settings
 from app.crud.user_curd import save_user
 from app.schemas.user import User
 
-load_dotenv()
+COGNITO_USER_POOL_ID = settings.cognito_user_pool_id
+COGNITO_REGION = settings.aws_region
+COGNITO_APP_CLIENT_ID = settings.cognito_app_client_id
 
-COGNITO_USER_POOL_ID = os.getenv("COGNITO_USER_POOL_ID")
-COGNITO_REGION = os.getenv("AWS_REGION")
-COGNITO_APP_CLIENT_ID = os.getenv("COGNITO_APP_CLIENT_ID")
+# JWKSのキャッシュ期間（秒）。未知のkidの場合は期間内でも再取得される
+JWKS_CACHE_LIFESPAN = settings.jwks_cache_lifespan
+JWKS_FETCH_TIMEOUT = settings.jwks_fetch_timeout
+ID_TOKEN_CACHE_MAXSIZE = settings.id_token_cache_maxsize
+
+# 検証済みIDトークンのクレーム（トークンのハッシュ値 -> (sub, email, username)）
+# 各エントリはトークンの有効期限(exp)で失効する
+id_token_cache = TTLCache(maxsize=ID_TOKEN_CACHE_MAXSIZE, ttl=0)
+_jwk_client = None
+
+
+def get_jwk_client() -> PyJWKClient:
+    # プロセス内で1つのクライアントを共有し、取得したJWKSを使い回す
+    global _jwk_client
+    if _jwk_client is None:
+        jwks_url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"  # noqa: E501
+        _jwk_client = PyJWKClient(
+            jwks_url,
+            cache_jwk_set=True,
+            lifespan=JWKS_CACHE_LIFESPAN,
+            timeout=JWKS_FETCH_TIMEOUT,
+        )
+    return _jwk_client
+
+
+def clear_token_caches():
+    """JWKSクライアントと検証済みトークンのキャッシュを破棄する"""
+    global _jwk_client
+    _jwk_client = None
+    id_token_cache.clear()
 
 
 def get_sub_from_id_token(id_token) -> tuple | None:
+    token_digest = hashlib.sha256(id_token.encode()).hexdigest()
+    cached = id_token_cache.get(token_digest)
+    if cached is not None:
+        return cached
+
     try:
-        jwks_url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"  # noqa: E501
-        jwk_client = PyJWKClient(jwks_url)
+        jwk_client = get_jwk_client()
 
         # トークンのヘッダーから`kid`を取得し、該当する公開鍵を取得
         signing_key = jwk_client.get_signing_key_from_jwt(id_token)
@@ -38,6 +73,13 @@ def get_sub_from_id_token(id_token) -> tuple | None:
         email = payload.get("email")
         name = payload.get("cognito:username")
 
+        # トークンの有効期限までキャッシュ
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            id_token_cache.set(
+                token_digest, (user_id, email, name), ttl=expires_in
+            )
+
         return user_id, email, name
     except Exception as e:
         print("Error decoding id_token:", e)
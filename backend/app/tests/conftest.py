@@ -3,8 +3,18 @@ from unittest.mock import MagicMock
 import pytest
 
 from app.main import app
+from app.circuit_breaker import reset_breakers
+from app.crud.recommendation_job_crud import get_job_store
+from app.metadata_cache import get_metadata_cache
+from app.services.content_service import (
+    content_read_cache,
+    recommendation_cache,
+)
 from app.schemas.content import DependsData
-from app.services.depends_service import get_content_table_and_user_id
+from app.services.depends_service import (
+    get_content_table_and_user_id,
+    get_content_table_and_user_id_without_premium,
+)
 
 # モック用データ
 mock_user_id = "test_user"
@@ -22,8 +32,44 @@ def mock_dependencies():
     app.dependency_overrides[get_content_table_and_user_id] = (
         mock_get_content_table_and_user_id
     )
+    app.dependency_overrides[get_content_table_and_user_id_without_premium] = (
+        mock_get_content_table_and_user_id
+    )
 
     yield mock_table  # モックしたテーブルを返却
 
     # 後始末 (必要なら依存関係をリセット)
     app.dependency_overrides = {}
+
+
+class FakeTimer:
+    """現在時刻を返す関数の代わり（now を進めて期限切れを再現する）"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# キャッシュ・サーキットブレーカー等の timer に渡す時刻
+@pytest.fixture
+def fake_timer():
+    return FakeTimer()
+
+
+# プロセス内のキャッシュがテスト間で共有されないよう毎回破棄する
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    # メタデータキャッシュ・ジョブの保存先は一括削除せず、設定に応じて作り直す
+    get_metadata_cache.cache_clear()
+    recommendation_cache.clear()
+    content_read_cache.clear()
+    get_job_store.cache_clear()
+    reset_breakers()
+    yield
+    get_metadata_cache.cache_clear()
+    recommendation_cache.clear()
+    content_read_cache.clear()
+    get_job_store.cache_clear()
+    reset_breakers()
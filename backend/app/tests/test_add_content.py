@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from botocore.exceptions import ClientError
@@ -22,7 +22,10 @@ client = TestClient(app)
 
 
 @pytest.mark.asyncio
-async def test_add_content(mock_dependencies):  # noqa: F811
+@patch("app.crud.content_crud.update_search_index")
+async def test_add_content(
+    mock_update_search_index, mock_dependencies  # noqa: F811
+):
     """正常系: 想定通りにDB登録され、返却値が想定通りなことを確認"""
     # mock_table.put_item = MagicMock()
     mock_table = mock_dependencies
@@ -51,9 +54,65 @@ async def test_add_content(mock_dependencies):  # noqa: F811
         "userId": mock_user_id,
         "link": "https://example.com",
         "status": None,
+        "year_date": "2024#2024-11-10",  # 日付順の一覧用に自動生成される
     }
 
-    mock_table.put_item.assert_called_once_with(Item=expected_content)
+    # コンテンツ登録と集計アイテムの更新が同一トランザクションで行われること
+    mock_table.meta.client.transact_write_items.assert_called_once_with(
+        TransactItems=[
+            {
+                "Put": {
+                    "TableName": mock_table.name,
+                    "Item": expected_content,
+                    "ConditionExpression": "attribute_not_exists(#y)",
+                    "ExpressionAttributeNames": {"#y": "year"},
+                }
+            },
+            {
+                "Update": {
+                    "TableName": mock_table.name,
+                    "Key": {"contentId": "#summary", "userId": mock_user_id},
+                    "UpdateExpression": (
+                        "ADD #v :v, #c0 :c0, #c1 :c1 SET #wt = :wt"
+                    ),
+                    "ExpressionAttributeNames": {
+                        "#v": "version",
+                        "#c0": "count#2024",
+                        "#c1": "count#2024#movie",
+                        "#wt": "written_at",
+                    },
+                    "ExpressionAttributeValues": {
+                        ":v": 1,
+                        ":c0": 1,
+                        ":c1": 1,
+                        ":wt": ANY,
+                    },
+                }
+            },
+        ]
+    )
+    mock_table.put_item.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_content_add_reserved_content_id(
+    mock_dependencies,  # noqa: F811
+):
+    """異常系: システムのアイテムと衝突するcontentIdは400エラー"""
+    mock_table = mock_dependencies
+
+    response = client.post(
+        "/content/add",
+        json={
+            "contentId": "#search#07#03",
+            "type": "movie",
+            "title": "Movie",
+            "date": "2024-01-01",
+        },
+    )
+    assert response.status_code == 400
+    mock_table.meta.client.transact_write_items.assert_not_called()
+    mock_table.update_item.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -81,7 +140,7 @@ async def test_content_add_dynamodb_error(mock_dependencies):  # noqa: F811
     #     },
     #     operation_name="PutItem"
     # ))
-    mock_table.put_item = MagicMock(
+    mock_table.meta.client.transact_write_items = MagicMock(
         side_effect=ClientError(
             error_response={
                 "Error": {
@@ -89,7 +148,7 @@ async def test_content_add_dynamodb_error(mock_dependencies):  # noqa: F811
                     "Message": "Rate exceeded",
                 }
             },
-            operation_name="PutItem",
+            operation_name="TransactWriteItems",
         )
     )
 
@@ -97,5 +156,5 @@ async def test_content_add_dynamodb_error(mock_dependencies):  # noqa: F811
     assert response.status_code == 500  # サーバーエラー
     assert (
         response.json()["detail"]
-        == "An error occurred (ProvisionedThroughputExceededException) when calling the PutItem operation: Rate exceeded"  # noqa: E501
+        == "An error occurred (ProvisionedThroughputExceededException) when calling the TransactWriteItems operation: Rate exceeded"  # noqa: E501
     )
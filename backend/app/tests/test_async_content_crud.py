@@ -0,0 +1,55 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.crud import async_content_crud
+
+
+class TestAsyncContentCrud:
+    @patch("app.crud.async_content_crud.content_crud.get_year_contents")
+    async def test_runs_in_worker_thread(self, mock_get_year_contents):
+        # 同期版の呼び出しがイベントループのスレッド外で実行されることを確認
+        called_threads = []
+
+        def fake_get_year_contents(user_id, table, year):
+            called_threads.append(threading.current_thread())
+            return [{"title": "Test Movie"}]
+
+        mock_get_year_contents.side_effect = fake_get_year_contents
+        table = MagicMock()
+
+        # テスト実行
+        result = await async_content_crud.get_year_contents(
+            "test_user", table, 2024
+        )
+
+        # アサーション（同期版と同じ引数・返却値）
+        assert result == [{"title": "Test Movie"}]
+        mock_get_year_contents.assert_called_once_with(
+            "test_user", table, 2024
+        )
+        assert called_threads[0] is not threading.current_thread()
+
+    async def test_iter_year_contents_follows_pages(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {
+                "Items": [{"contentId": "1"}],
+                "LastEvaluatedKey": {"contentId": "1", "userId": "test_user"},
+            },
+            {"Items": [{"contentId": "2"}]},
+        ]
+
+        # テスト実行
+        result = [
+            item
+            async for item in async_content_crud.iter_year_contents(
+                "test_user", table, 2024, page_size=1
+            )
+        ]
+
+        # アサーション
+        assert result == [{"contentId": "1"}, {"contentId": "2"}]
+        assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {
+            "contentId": "1",
+            "userId": "test_user",
+        }
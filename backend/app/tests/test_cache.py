@@ -0,0 +1,61 @@
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        # テスト実行
+        cache.set("a", 1)
+
+        # アサーション
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "size": 1,
+        }
+
+    def test_expired_entry_is_removed(self, fake_timer):
+        cache = TTLCache(maxsize=2, ttl=10, timer=fake_timer)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=30)  # 個別の有効期限
+
+        # 既定のTTL経過後
+        fake_timer.now += 10
+
+        # アサーション
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # aを参照してbを最も古い状態にする
+
+        # テスト実行
+        cache.set("c", 3)
+
+        # アサーション
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # テスト実行
+        cache.pop("a")
+        cache.pop("missing")  # 存在しないキーでもエラーにならない
+
+        # アサーション
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
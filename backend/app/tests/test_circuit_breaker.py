@@ -0,0 +1,122 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    breaker_states,
+    get_breaker,
+)
+from app.config import settings
+from app.services.content_service import (
+    ExternalAPIError,
+    attach_recommendation_links,
+    search_movie_links_tmdb,
+)
+
+
+def failing():
+    raise Exception("provider error")
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("p", failure_threshold=2, reset_timeout=10)
+
+        # テスト実行
+        for _ in range(2):
+            with pytest.raises(Exception, match="provider error"):
+                breaker.call(failing)
+        func = Mock()
+
+        # アサーション（openの間は呼び出さない）
+        with pytest.raises(CircuitOpenError):
+            breaker.call(func)
+        func.assert_not_called()
+        assert breaker.state == "open"
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker("p", failure_threshold=2, reset_timeout=10)
+
+        # テスト実行
+        with pytest.raises(Exception):
+            breaker.call(failing)
+        breaker.call(lambda: None)
+        with pytest.raises(Exception):
+            breaker.call(failing)
+
+        # アサーション
+        assert breaker.state == "closed"
+
+    def test_half_open_probe(self, fake_timer):
+        breaker = CircuitBreaker(
+            "p", failure_threshold=1, reset_timeout=10, timer=fake_timer
+        )
+        with pytest.raises(Exception):
+            breaker.call(failing)
+
+        # テスト実行・アサーション
+        assert breaker.allow_request() is False
+        fake_timer.now += 10
+        # 期限後は1件のみ試行を許可
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.record_failure()
+        assert breaker.state == "open"
+        fake_timer.now += 10
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_shared_breaker(self):
+        assert get_breaker("tmdb") is get_breaker("tmdb")
+        assert "tmdb" in breaker_states()
+
+
+class TestProviderOutage:
+    @patch.object(settings, "tmdb_api_key", "test_api_key")
+    @patch("requests.Session.request")
+    def test_tmdb_outage_fails_fast(self, mock_request):
+        mock_request.return_value = Mock(status_code=503)
+
+        # テスト実行（しきい値まで失敗した後は呼び出さない）
+        for i in range(settings.circuit_breaker_failure_threshold):
+            with pytest.raises(ExternalAPIError):
+                search_movie_links_tmdb(f"Movie {i}")
+        with pytest.raises(CircuitOpenError):
+            search_movie_links_tmdb("Another Movie")
+
+        # アサーション
+        assert (
+            mock_request.call_count
+            == settings.circuit_breaker_failure_threshold
+        )
+
+    @patch("app.services.content_service.find_recommendation_links")
+    def test_open_breaker_returns_unverified(self, mock_find):
+        mock_find.side_effect = CircuitOpenError("google_books")
+
+        # テスト実行
+        result, complete = attach_recommendation_links(
+            [{"title": "本"}], "book"
+        )
+
+        # アサーション
+        assert result == [
+            {
+                "title": "本",
+                "links": [
+                    {
+                        "site_name": "Amazon",
+                        "url": "https://www.amazon.co.jp/s?k=本+本",
+                    },
+                    {
+                        "site_name": "楽天ブックス",
+                        "url": "https://books.rakuten.co.jp/search?sitem=本",
+                    },
+                ],
+                "unverified": True,
+            }
+        ]
+        # 未確認の作品は除外していないため検索は完了扱い（キャッシュ側で短時間のみ保持）
+        assert complete
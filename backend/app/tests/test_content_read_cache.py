@@ -0,0 +1,265 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.content import watchlistData
+from app.services.content_service import (
+    ContentReadCache,
+    add_watchlist_service,
+    content_read_cache,
+    get_content_etag_service,
+    get_recent_contents_service,
+    get_watchlist_service,
+)
+
+
+def _cache(**kwargs) -> ContentReadCache:
+    params = {"maxsize": 10, "ttl": 30}
+    params.update(kwargs)
+    return ContentReadCache(**params)
+
+
+class TestContentReadCache:
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        cache = _cache()
+        fetch = AsyncMock(return_value=[{"contentId": "c1"}])
+
+        first = await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        second = await cache.get_or_fetch("u1", ("watchlist",), fetch)
+
+        assert first == second == [{"contentId": "c1"}]
+        fetch.assert_awaited_once()
+        assert cache.stats() == {
+            "enabled": True,
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "invalidations": 0,
+            "users": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_keys_by_user_and_query(self):
+        cache = _cache()
+        fetch = AsyncMock(side_effect=[["a"], ["b"], ["c"]])
+
+        assert await cache.get_or_fetch("u1", ("year", 2024), fetch) == ["a"]
+        assert await cache.get_or_fetch("u1", ("year", 2023), fetch) == ["b"]
+        assert await cache.get_or_fetch("u2", ("year", 2024), fetch) == ["c"]
+        assert fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_returns_copy(self):
+        """返却したリストを変更してもキャッシュには影響しない"""
+        cache = _cache()
+        fetch = AsyncMock(return_value=["2024", "2023"])
+
+        years = await cache.get_or_fetch("u1", ("years",), fetch)
+        years.append("2022")
+
+        assert await cache.get_or_fetch("u1", ("years",), fetch) == [
+            "2024",
+            "2023",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = _cache()
+        fetch = AsyncMock(side_effect=[["old"], ["new"]])
+
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        cache.invalidate("u1")
+
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["new"]
+        assert cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_during_write_is_not_cached(self):
+        """書き込み前に開始した読み取りの結果は、破棄後のキャッシュに残らない"""
+        cache = _cache()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            started.set()
+            await release.wait()
+            return ["old"]
+
+        reading = asyncio.create_task(
+            cache.get_or_fetch("u1", ("watchlist",), slow_fetch)
+        )
+        await started.wait()
+        # 読み取り中に書き込みが完了し、キャッシュを破棄
+        cache.invalidate("u1")
+        release.set()
+        assert await reading == ["old"]
+
+        fetch = AsyncMock(return_value=["new"])
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_observe_version(self):
+        """データのバージョンが変わった場合のみキャッシュを破棄する"""
+        cache = _cache()
+        fetch = AsyncMock(side_effect=[["v1"], ["v2"]])
+
+        cache.observe_version("u1", 1)
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        cache.observe_version("u1", 1)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["v1"]
+
+        # 他プロセスでの書き込みでバージョンが変わった
+        cache.observe_version("u1", 2)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["v2"]
+
+    @pytest.mark.asyncio
+    async def test_reads_right_after_invalidate_are_not_cached(
+        self, fake_timer
+    ):
+        """破棄の直後（GSIの反映待ち）に読み取った結果は保存しない"""
+        cache = _cache(settle=5, timer=fake_timer)
+        fetch = AsyncMock(side_effect=[["stale"], ["new"], ["new"], ["x"]])
+
+        cache.invalidate("u1")
+        # 書き込み前の結果が返っても保存しないため、次の読み取りで再取得する
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == [
+            "stale"
+        ]
+        # 書き込みのバージョンの記録では待ち時間は延長も解除もしない
+        cache.observe_version("u1", 2)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["new"]
+
+        fake_timer.now += 5
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["new"]
+        assert fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_reads_right_after_version_change_are_not_cached(
+        self, fake_timer
+    ):
+        """他プロセスでの書き込みを検知した直後に読み取った結果も保存しない"""
+        cache = _cache(settle=5, timer=fake_timer)
+        fetch = AsyncMock(side_effect=[["v1"], ["stale"], ["v2"], ["x"]])
+
+        # 初めてバージョンを記録した場合は待たずに保存する
+        cache.observe_version("u1", 1)
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["v1"]
+
+        cache.observe_version("u1", 2)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == [
+            "stale"
+        ]
+        fake_timer.now += 5
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["v2"]
+        assert fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, fake_timer):
+        cache = _cache(ttl=30, timer=fake_timer)
+        fetch = AsyncMock(side_effect=[["old"], ["new"]])
+
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        fake_timer.now += 31
+
+        assert await cache.get_or_fetch("u1", ("watchlist",), fetch) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_lru_by_user(self):
+        cache = _cache(maxsize=2)
+        fetch = AsyncMock(return_value=[])
+
+        for user_id in ("u1", "u2", "u3"):
+            await cache.get_or_fetch(user_id, ("watchlist",), fetch)
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+
+        # 最も古いユーザー（u1）が削除されているため再取得
+        assert fetch.await_count == 4
+        assert cache.stats()["users"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        cache = _cache(enabled=False)
+        fetch = AsyncMock(return_value=[])
+
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+        await cache.get_or_fetch("u1", ("watchlist",), fetch)
+
+        assert fetch.await_count == 2
+        assert cache.stats()["hits"] == 0
+
+
+class TestContentReadCacheServices:
+    @pytest.mark.asyncio
+    @patch(
+        "app.services.content_service.get_watchlist_contents",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.content_service.add_watchlist", new_callable=AsyncMock
+    )
+    async def test_watchlist_invalidated_by_write(
+        self, mock_add_watchlist, mock_get_watchlist
+    ):
+        """ウォッチリストの追加後は最新の一覧を取得する（read-your-writes）"""
+        mock_get_watchlist.side_effect = [[], [{"contentId": "c1"}]]
+
+        assert await get_watchlist_service("u1", "table") == []
+        assert await get_watchlist_service("u1", "table") == []
+        mock_get_watchlist.assert_awaited_once()
+
+        await add_watchlist_service(
+            watchlistData(
+                contentId="c1", title="A", type="movie", status="to_watch"
+            ),
+            "u1",
+            "table",
+        )
+
+        assert await get_watchlist_service("u1", "table") == [
+            {"contentId": "c1"}
+        ]
+        assert mock_get_watchlist.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch(
+        "app.services.content_service.get_recent_contents",
+        new_callable=AsyncMock,
+    )
+    async def test_recent_contents_keyed_by_type(self, mock_get_recent):
+        mock_get_recent.return_value = [{"contentId": "c1"}]
+
+        await get_recent_contents_service("u1", "table", "movie")
+        await get_recent_contents_service("u1", "table", "movie")
+        await get_recent_contents_service("u1", "table", "book")
+
+        assert mock_get_recent.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch(
+        "app.services.content_service.get_watchlist_contents",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.content_service.get_data_version",
+        new_callable=AsyncMock,
+    )
+    async def test_etag_version_change_drops_cache(
+        self, mock_get_data_version, mock_get_watchlist
+    ):
+        """ETagの作成時にバージョンが変わっていればキャッシュを使わない"""
+        mock_get_data_version.side_effect = [(1, None), (2, None)]
+        mock_get_watchlist.side_effect = [[], [{"contentId": "c1"}]]
+
+        await get_content_etag_service("u1", "table")
+        assert await get_watchlist_service("u1", "table") == []
+        await get_content_etag_service("u1", "table")
+
+        assert await get_watchlist_service("u1", "table") == [
+            {"contentId": "c1"}
+        ]
+        assert content_read_cache.stats()["misses"] == 2
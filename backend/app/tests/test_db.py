@@ -1,21 +1,48 @@
-from unittest.mock import Mock, patch
-
-from app.db.dynamodb import get_content_table
+from app.db.dynamodb import (
+    DYNAMODB_CONNECT_TIMEOUT,
+    DYNAMODB_MAX_ATTEMPTS,
+    DYNAMODB_MAX_POOL_CONNECTIONS,
+    DYNAMODB_READ_TIMEOUT,
+    DYNAMODB_TCP_KEEPALIVE,
+    build_boto_config,
+    get_content_table,
+)
 
 
 class TestDynamoDB:
-    @patch("app.db.dynamodb.dynamodb")
-    async def test_get_content_table_success(self, mock_dynamodb):
-        # モック設定
-        mock_table = Mock()
-        mock_dynamodb.Table.return_value = mock_table
+    async def test_get_content_table_success(self):
+        from app.db.dynamodb import content_table
 
         # テスト実行
         result = await get_content_table()
 
+        # アサーション（リクエストごとに作成せず、共有のインスタンスを返す）
+        assert result is content_table
+        assert await get_content_table() is result
+
+    def test_build_boto_config(self):
+        # テスト実行
+        config = build_boto_config()
+
         # アサーション
-        assert result == mock_table
-        mock_dynamodb.Table.assert_called_once()
+        assert config.max_pool_connections == DYNAMODB_MAX_POOL_CONNECTIONS
+        assert config.connect_timeout == DYNAMODB_CONNECT_TIMEOUT
+        assert config.read_timeout == DYNAMODB_READ_TIMEOUT
+        assert config.tcp_keepalive == DYNAMODB_TCP_KEEPALIVE
+        assert config.retries == {
+            "max_attempts": DYNAMODB_MAX_ATTEMPTS,
+            "mode": "adaptive",
+        }
+
+    def test_resource_uses_tuned_config(self):
+        from app.db.dynamodb import dynamodb
+
+        # アサーション
+        client_config = dynamodb.meta.client.meta.config
+        assert client_config.max_pool_connections == (
+            DYNAMODB_MAX_POOL_CONNECTIONS
+        )
+        assert client_config.retries["mode"] == "adaptive"
 
     def test_dynamodb_initialization(self):
         # DynamoDB関連変数の初期化テスト
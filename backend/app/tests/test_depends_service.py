@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from app.crud.user_curd import user_profile_cache
+from app.services.depends_service import (
+    get_content_table_and_user_id,
+    get_content_table_and_user_id_without_premium,
+)
+
+
+class TestGetContentTableAndUserId:
+    def setup_method(self):
+        user_profile_cache.clear()
+
+    def teardown_method(self):
+        user_profile_cache.clear()
+
+    @patch("app.crud.user_curd.user_table")
+    async def test_premium_lookup_cached(self, mock_user_table):
+        mock_user_table.get_item.return_value = {
+            "Item": {"userId": "test_user", "is_premium": True}
+        }
+
+        # テスト実行（2回目はユーザーテーブルを参照しない）
+        first = await get_content_table_and_user_id("table", "test_user")
+        second = await get_content_table_and_user_id("table", "test_user")
+
+        # アサーション
+        assert first.is_premium is True
+        assert second.is_premium is True
+        mock_user_table.get_item.assert_called_once()
+
+    @patch("app.crud.user_curd.user_table")
+    async def test_premium_lookup_error(self, mock_user_table):
+        mock_user_table.get_item.side_effect = Exception("DynamoDB error")
+
+        # テスト実行
+        result = await get_content_table_and_user_id("table", "test_user")
+
+        # アサーション（取得できない場合は無料会員扱い）
+        assert result.is_premium is False
+
+    @patch("app.crud.user_curd.user_table")
+    async def test_without_premium_skips_lookup(self, mock_user_table):
+        # テスト実行
+        result = await get_content_table_and_user_id_without_premium(
+            "table", "test_user"
+        )
+
+        # アサーション
+        assert result.user_id == "test_user"
+        assert result.is_premium is False
+        mock_user_table.get_item.assert_not_called()
@@ -0,0 +1,79 @@
+from unittest.mock import Mock, patch
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.metadata_cache import get_metadata_cache
+from app.services.content_service import content_read_cache
+
+client = TestClient(app)
+
+
+class TestDiagnostics:
+    def test_disabled_without_token_setting(self):
+        # テスト実行
+        response = client.get(
+            "/diagnostics", headers={"X-Diagnostics-Token": "secret"}
+        )
+
+        # アサーション（トークン未設定の環境では公開しない）
+        assert response.status_code == 404
+
+    @patch.object(settings, "diagnostics_token", "secret")
+    def test_wrong_token(self):
+        # テスト実行
+        missing = client.get("/diagnostics")
+        wrong = client.get(
+            "/diagnostics", headers={"X-Diagnostics-Token": "other"}
+        )
+
+        # アサーション
+        assert missing.status_code == 403
+        assert wrong.status_code == 403
+
+    @patch.object(settings, "diagnostics_token", "secret")
+    def test_stats(self):
+        fetch = Mock(return_value={"id": 1})
+        get_metadata_cache().get_or_fetch("Movie", "movie", "ja-JP", fetch)
+        get_metadata_cache().get_or_fetch("Movie", "movie", "ja-JP", fetch)
+
+        # テスト実行
+        response = client.get(
+            "/diagnostics", headers={"X-Diagnostics-Token": "secret"}
+        )
+
+        # アサーション
+        assert response.status_code == 200
+        assert response.json()["metadataCache"] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+        }
+        assert response.json()["contentReadCache"]["enabled"] is True
+        assert set(response.json()) == {
+            "metadataCache",
+            "contentReadCache",
+            "httpClient",
+            "circuitBreakers",
+        }
+
+    @patch.object(settings, "diagnostics_token", "secret")
+    def test_switch_content_read_cache(self, monkeypatch):
+        # テスト後に有効・無効を元に戻す
+        monkeypatch.setattr(content_read_cache, "enabled", True)
+        content_read_cache.observe_version("user", 1)
+
+        # テスト実行
+        response = client.put(
+            "/diagnostics/content-read-cache?enabled=false",
+            headers={"X-Diagnostics-Token": "secret"},
+        )
+        forbidden = client.put("/diagnostics/content-read-cache?enabled=true")
+
+        # アサーション（切り替え時に保持していたキャッシュは破棄する）
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
+        assert response.json()["users"] == 0
+        assert content_read_cache.enabled is False
+        assert forbidden.status_code == 403
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, call, patch
 
 import pytest
 from botocore.exceptions import ClientError
@@ -22,10 +22,23 @@ client = TestClient(app)
 
 
 @pytest.mark.asyncio
-async def test_edit_content(mock_dependencies):  # noqa: F811
+@patch("app.crud.content_crud.update_search_index")
+async def test_edit_content(
+    mock_update_search_index, mock_dependencies  # noqa: F811
+):
     """正常系: 想定通りにDB更新され、返却値が想定通りなことを確認"""
-    # Mock の update_item メソッドを設定
+    # Mock の get_item, update_item メソッドを設定（年度・種別は変更なし）
     mock_table = mock_dependencies
+    mock_table.get_item = MagicMock(
+        return_value={
+            "Item": {
+                "contentId": mock_content.contentId,
+                "userId": mock_user_id,
+                "type": "movie",
+                "year": 2024,
+            }
+        }
+    )
     mock_table.update_item = MagicMock(
         return_value={
             "Attributes": {
@@ -59,15 +72,16 @@ async def test_edit_content(mock_dependencies):  # noqa: F811
     }
 
     # DynamoDB テーブルに正しいデータが渡されたか確認
-    mock_table.update_item.assert_called_once_with(
+    # （コンテンツの更新後にデータのバージョンを加算）
+    assert mock_table.update_item.call_args_list[0] == call(
         Key={
             "contentId": mock_content.contentId,
             "userId": mock_user_id,
         },
-        UpdateExpression="SET #ty = :ty, #ti = :ti, #d = :d, #y = :y, #n = :n,\
-            #l = :l REMOVE #s",
+        UpdateExpression="SET #ty = :ty, #ti = :ti, #d = :d, #y = :y, "
+        "#n = :n, #l = :l, #yd = :yd REMOVE #s, #wa",
         ConditionExpression="attribute_exists(userId) AND\
-            attribute_exists(contentId)",
+            attribute_exists(contentId) AND #ty = :oty AND #y = :oy",
         ExpressionAttributeNames={
             "#ty": "type",
             "#ti": "title",
@@ -76,6 +90,8 @@ async def test_edit_content(mock_dependencies):  # noqa: F811
             "#n": "notes",
             "#l": "link",
             "#s": "status",
+            "#wa": "watchlist_at",
+            "#yd": "year_date",
         },
         ExpressionAttributeValues={
             ":ty": mock_content.type,
@@ -84,9 +100,29 @@ async def test_edit_content(mock_dependencies):  # noqa: F811
             ":y": 2024,  # バックエンドで計算された year を使用
             ":n": mock_content.notes,
             ":l": mock_content.link,
+            ":yd": "2024#2024-12-01",
+            ":oty": "movie",
+            ":oy": 2024,
         },
         ReturnValues="ALL_NEW",
     )
+    assert mock_table.update_item.call_args_list[1] == call(
+        Key={"contentId": "#summary", "userId": mock_user_id},
+        UpdateExpression="ADD #v :v SET #wt = :wt",
+        ExpressionAttributeNames={"#v": "version", "#wt": "written_at"},
+        ExpressionAttributeValues={":v": 1, ":wt": ANY},
+    )
+    # 変更前後のアイテムで検索用の索引が更新されること
+    mock_update_search_index.assert_called_once_with(
+        mock_user_id,
+        mock_table,
+        [
+            (
+                mock_table.get_item.return_value["Item"],
+                mock_table.update_item.return_value["Attributes"],
+            )
+        ],
+    )
 
 
 @pytest.mark.asyncio
@@ -95,6 +131,7 @@ async def test_content_edit_invalid_content_id(
 ):
     """異常系: 更新対象のcontentIdが存在しない場合の返却値が想定通りであることを確認"""
     mock_table = mock_dependencies
+    mock_table.get_item = MagicMock(return_value={})
     mock_table.update_item = MagicMock(
         side_effect=ClientError(
             error_response={
@@ -115,6 +152,20 @@ async def test_content_edit_invalid_content_id(
     )
 
 
+@pytest.mark.asyncio
+async def test_content_edit_reserved_content_id(
+    mock_dependencies,  # noqa: F811
+):
+    """異常系: 集計アイテムのcontentIdは更新できない"""
+    mock_table = mock_dependencies
+
+    response = client.post(
+        "/content/edit", json={**mock_content.dict(), "contentId": "#summary"}
+    )
+    assert response.status_code == 400
+    mock_table.update_item.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_content_edit_missing_fields(mock_dependencies):  # noqa: F811
     """異常系: 必須フィールドが不足している場合の返却値が想定通りであることを確認"""
@@ -129,6 +180,7 @@ async def test_content_edit_missing_fields(mock_dependencies):  # noqa: F811
 async def test_content_edit_dynamodb_error(mock_dependencies):  # noqa: F811
     """異常系: DynamoDBがエラーをスローした場合の返却値が想定通りであることを確認"""
     mock_table = mock_dependencies
+    mock_table.get_item = MagicMock(return_value={})
     mock_table.update_item = MagicMock(
         side_effect=ClientError(
             error_response={
@@ -147,3 +199,96 @@ async def test_content_edit_dynamodb_error(mock_dependencies):  # noqa: F811
         response.json()["detail"]
         == "An error occurred (ProvisionedThroughputExceededException) when calling the UpdateItem operation: Rate exceeded"  # noqa: E501
     )
+
+
+@pytest.mark.asyncio
+@patch("app.crud.content_crud.update_search_index")
+async def test_edit_content_year_changed(
+    mock_update_search_index, mock_dependencies  # noqa: F811
+):
+    """正常系: 年度が変わる場合は集計アイテムと同一トランザクションで更新されること"""
+    mock_table = mock_dependencies
+    mock_table.get_item = MagicMock(
+        return_value={
+            "Item": {
+                "contentId": mock_content.contentId,
+                "userId": mock_user_id,
+                "type": "movie",
+                "title": "Old Title",
+                "date": "2023-12-01",
+                "year": 2023,
+                "status": "to_watch",
+            }
+        }
+    )
+
+    response = client.post("/content/edit", json=mock_content.dict())
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "contentId": mock_content.contentId,
+        "userId": mock_user_id,
+        "type": "movie",
+        "title": mock_content.title,
+        "date": mock_content.date,
+        "year": 2024,
+        "notes": mock_content.notes,
+        "link": mock_content.link,
+        "year_date": "2024#2024-12-01",
+    }
+    mock_table.update_item.assert_not_called()
+    transact_items = mock_table.meta.client.transact_write_items.call_args[1][
+        "TransactItems"
+    ]
+    assert len(transact_items) == 2
+    summary_update = transact_items[1]["Update"]
+    assert summary_update["ExpressionAttributeNames"] == {
+        "#v": "version",
+        "#c0": "count#2023",
+        "#c1": "count#2023#movie",
+        "#c2": "count#2024",
+        "#c3": "count#2024#movie",
+        "#wt": "written_at",
+    }
+    assert summary_update["ExpressionAttributeValues"] == {
+        ":v": 1,
+        ":c0": -1,
+        ":c1": -1,
+        ":c2": 1,
+        ":c3": 1,
+        ":wt": ANY,
+    }
+
+
+@pytest.mark.asyncio
+@patch("app.crud.content_crud.update_search_index")
+async def test_edit_ranked_content_year_changed(
+    mock_update_search_index, mock_dependencies  # noqa: F811
+):
+    """正常系: 順位付きのコンテンツの年度が変わる場合は年間ベストの索引も移動すること"""
+    mock_table = mock_dependencies
+    mock_table.get_item = MagicMock(
+        return_value={
+            "Item": {
+                "contentId": mock_content.contentId,
+                "userId": mock_user_id,
+                "type": "movie",
+                "year": 2023,
+                "rank": 2,
+                "year_rank": "2023#0002",
+            }
+        }
+    )
+
+    response = client.post("/content/edit", json=mock_content.dict())
+
+    assert response.status_code == 200
+    assert response.json()["year_rank"] == "2024#0002"
+    content_update = mock_table.meta.client.transact_write_items.call_args[1][
+        "TransactItems"
+    ][0]["Update"]
+    assert content_update["UpdateExpression"] == (
+        "SET #ty = :ty, #ti = :ti, #d = :d, #y = :y, #n = :n, #l = :l, "
+        "#yd = :yd, #yrk = :yrk REMOVE #s, #wa"
+    )
+    assert content_update["ExpressionAttributeValues"][":yrk"] == "2024#0002"
@@ -0,0 +1,257 @@
+import time
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.crud import content_crud
+from app.crud.content_crud import (
+    add_content,
+    add_watchlist,
+    delete_watchlist_contents,
+    get_data_version,
+    get_user_summary,
+)
+from app.main import app
+from app.schemas.content import RegisterContentData, watchlistData
+from app.tests.conftest import mock_dependencies, mock_user_id  # noqa: F401
+from app.utils import data_etag, etag_matches
+
+client = TestClient(app)
+
+# データのバージョンを加算する更新（集計アイテム）
+VERSION_BUMP = {
+    "Key": {"contentId": "#summary", "userId": "test_user"},
+    "UpdateExpression": "ADD #v :v SET #wt = :wt",
+    "ExpressionAttributeNames": {"#v": "version", "#wt": "written_at"},
+    "ExpressionAttributeValues": {":v": 1, ":wt": ANY},
+}
+
+
+class TestDataEtag:
+    def test_etag_depends_on_user_and_version(self):
+        etag = data_etag("u1", 3)
+        assert etag.startswith('W/"') and etag.endswith('-3"')
+        assert etag == data_etag("u1", 3)
+        assert etag != data_etag("u1", 4)
+        # 別のユーザーのETagとは一致しない
+        assert etag != data_etag("u2", 3)
+
+    @pytest.mark.parametrize(
+        "if_none_match, expected",
+        [
+            (None, False),
+            ("", False),
+            ('W/"abc-1-3"', True),
+            ('"abc-1-3"', True),  # 弱い比較
+            ('W/"abc-1-2", W/"abc-1-3"', True),
+            ("*", True),
+            ('W/"abc-1-2"', False),
+        ],
+    )
+    def test_etag_matches(self, if_none_match, expected):
+        assert etag_matches(if_none_match, 'W/"abc-1-3"') is expected
+
+
+class TestDataVersionCrud:
+    def test_get_data_version(self):
+        table = MagicMock()
+        table.get_item.return_value = {
+            "Item": {"version": 7, "written_at": 1700000000500}
+        }
+
+        assert get_data_version("test_user", table) == (7, 1700000000.5)
+        table.get_item.assert_called_once_with(
+            Key={"contentId": "#summary", "userId": "test_user"},
+            ProjectionExpression="#v, #wt",
+            ExpressionAttributeNames={"#v": "version", "#wt": "written_at"},
+            ConsistentRead=True,
+        )
+
+    def test_get_data_version_without_summary(self):
+        table = MagicMock()
+        table.get_item.return_value = {}
+
+        assert get_data_version("test_user", table) == (0, None)
+
+    def test_bump_records_written_at(self):
+        """データのバージョンの加算時刻をエポックミリ秒で記録する"""
+        table = MagicMock()
+
+        with patch.object(content_crud.time, "time", return_value=1700.25):
+            content_crud.bump_data_version("test_user", table)
+
+        values = table.update_item.call_args.kwargs[
+            "ExpressionAttributeValues"
+        ]
+        assert values[":wt"] == 1700250
+
+    def test_get_user_summary_is_consistent_read(self):
+        table = MagicMock()
+        table.get_item.return_value = {}
+
+        get_user_summary("test_user", table)
+
+        assert table.get_item.call_args.kwargs["ConsistentRead"] is True
+
+    def test_add_content_without_year_bumps_version(self):
+        table = MagicMock()
+        content = RegisterContentData(
+            contentId="c1",
+            title="A",
+            type="movie",
+            date="",
+            userId="test_user",
+        )
+
+        add_content(content, table)
+
+        table.put_item.assert_called_once()
+        table.update_item.assert_called_once_with(**VERSION_BUMP)
+
+    def test_add_watchlist_bumps_version(self):
+        table = MagicMock()
+        content = watchlistData(
+            contentId="c1",
+            title="A",
+            type="movie",
+            userId="test_user",
+            status="to_watch",
+        )
+
+        add_watchlist(content, table)
+
+        table.put_item.assert_called_once()
+        table.update_item.assert_called_once_with(**VERSION_BUMP)
+
+    def test_delete_watchlist_without_year_bumps_version(self):
+        table = MagicMock()
+        table.get_item.return_value = {
+            "Item": {"contentId": "c1", "userId": "test_user"}
+        }
+
+        delete_watchlist_contents("test_user", table, "c1")
+
+        table.delete_item.assert_called_once()
+        table.update_item.assert_called_once_with(**VERSION_BUMP)
+
+    def test_summary_with_only_version_is_not_created(self):
+        """バージョンのみの集計アイテムは件数が未作成として扱う"""
+        table = MagicMock()
+        table.get_item.return_value = {
+            "Item": {"contentId": "#summary", "userId": "u1", "version": 2}
+        }
+
+        assert get_user_summary("u1", table) is None
+
+    def test_summary_created_after_backfill_is_complete(self, monkeypatch):
+        """データ移行の完了後に作成される集計アイテムは集計済みとする"""
+        monkeypatch.setattr(content_crud, "SUMMARY_BACKFILLED", True)
+        table = MagicMock()
+
+        content_crud.bump_data_version("test_user", table)
+
+        table.update_item.assert_called_once_with(
+            Key={"contentId": "#summary", "userId": "test_user"},
+            UpdateExpression="ADD #v :v SET #wt = :wt, #cm = :cm",
+            ExpressionAttributeNames={
+                "#v": "version",
+                "#wt": "written_at",
+                "#cm": "complete",
+            },
+            ExpressionAttributeValues={":v": 1, ":wt": ANY, ":cm": True},
+        )
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize(
+        "path",
+        ["/content/years", "/content/year=2024", "/content/watchlist"],
+    )
+    def test_returns_etag(self, path, mock_dependencies):  # noqa: F811
+        mock_dependencies.get_item.return_value = {"Item": {"version": 3}}
+        mock_dependencies.query.return_value = {"Items": []}
+
+        response = client.get(path)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == data_etag(mock_user_id, 3)
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/content/years", "/content/year=2024", "/content/watchlist"],
+    )
+    def test_not_modified(self, path, mock_dependencies):  # noqa: F811
+        """ETagが一致する場合はクエリせずに304を返却する"""
+        mock_dependencies.get_item.return_value = {"Item": {"version": 3}}
+        etag = data_etag(mock_user_id, 3)
+
+        response = client.get(path, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        mock_dependencies.get_item.assert_called_once()
+        mock_dependencies.query.assert_not_called()
+
+    def test_modified_after_write(self, mock_dependencies):  # noqa: F811
+        """書き込みでバージョンが変わった場合は一覧を返却する"""
+        mock_dependencies.get_item.return_value = {"Item": {"version": 4}}
+        mock_dependencies.query.return_value = {
+            "Items": [
+                {
+                    "contentId": "c1",
+                    "userId": mock_user_id,
+                    "title": "A",
+                    "type": "movie",
+                    "status": "to_watch",
+                }
+            ]
+        }
+
+        response = client.get(
+            "/content/watchlist",
+            headers={"If-None-Match": data_etag(mock_user_id, 3)},
+        )
+
+        assert response.status_code == 200
+        assert [item["contentId"] for item in response.json()] == ["c1"]
+        assert response.headers["etag"] == data_etag(mock_user_id, 4)
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/content/years", "/content/year=2024", "/content/watchlist"],
+    )
+    def test_no_etag_right_after_write(
+        self, path, mock_dependencies  # noqa: F811
+    ):
+        """書き込みの直後（GSIの反映待ち）はETagを返さず、304も返さない"""
+        written_at = int(time.time() * 1000)
+        mock_dependencies.get_item.return_value = {
+            "Item": {"version": 3, "written_at": written_at}
+        }
+        mock_dependencies.query.return_value = {"Items": []}
+
+        response = client.get(
+            path, headers={"If-None-Match": data_etag(mock_user_id, 3)}
+        )
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_etag_after_settle(self, mock_dependencies):  # noqa: F811
+        """加算から一定時間が経過した後はETagを返し、304を返す"""
+        written_at = int((time.time() - 60) * 1000)
+        mock_dependencies.get_item.return_value = {
+            "Item": {"version": 3, "written_at": written_at}
+        }
+        etag = data_etag(mock_user_id, 3)
+
+        response = client.get(
+            "/content/watchlist", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
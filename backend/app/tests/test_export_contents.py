@@ -0,0 +1,111 @@
+import json
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.tests.conftest import mock_dependencies, mock_user_id  # noqa: F401
+
+client = TestClient(app)
+
+ranked_item = {
+    "contentId": "c1",
+    "userId": mock_user_id,
+    "type": "movie",
+    "title": "映画, A",
+    "date": "2024-01-02",
+    "type_date": "movie#2024-01-02",
+    "year": Decimal("2024"),
+    "rank": Decimal("1"),
+    "year_rank": "2024#0001",
+    "notes": "line1\nline2",
+    "link": None,
+}
+plain_item = {
+    "contentId": "c2",
+    "userId": mock_user_id,
+    "type": "book",
+    "title": "Book B",
+    "date": "2023-05-06",
+    "year": Decimal("2023"),
+}
+watchlist_item = {
+    "contentId": "w1",
+    "userId": mock_user_id,
+    "type": "movie",
+    "title": "Watch",
+    "status": "to_watch",
+    "watchlist_at": "2024-02-01T00:00:00+00:00",
+}
+
+
+def _query_pages(mock_table):
+    # YearIndexは2ページ、WatchlistIndexは1ページ
+    mock_table.query.side_effect = [
+        {"Items": [ranked_item], "LastEvaluatedKey": {"contentId": "c1"}},
+        {"Items": [plain_item]},
+        {"Items": [watchlist_item]},
+    ]
+
+
+class TestExportContents:
+    def test_export_jsonl(self, mock_dependencies):  # noqa: F811
+        """正常系: 全ページのコンテンツとウォッチリストをJSONLで返す"""
+        _query_pages(mock_dependencies)
+
+        response = client.get("/content/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "contents.jsonl" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["contentId"] for row in rows] == ["c1", "c2", "w1"]
+        assert rows[0] == {
+            "contentId": "c1",
+            "type": "movie",
+            "title": "映画, A",
+            "date": "2024-01-02",
+            "notes": "line1\nline2",
+            "link": None,
+            "year": 2024,
+            "rank": 1,
+            "status": None,
+            "watchlist_at": None,
+        }
+        assert rows[2]["status"] == "to_watch"
+
+        calls = mock_dependencies.query.call_args_list
+        assert [c.kwargs["IndexName"] for c in calls] == [
+            "YearIndex",
+            "YearIndex",
+            "WatchlistIndex",
+        ]
+        assert calls[1].kwargs["ExclusiveStartKey"] == {"contentId": "c1"}
+
+    def test_export_csv(self, mock_dependencies):  # noqa: F811
+        """CSVはヘッダー行を先頭に出力し、一括登録で取り込める形式で返す"""
+        _query_pages(mock_dependencies)
+
+        response = client.get("/content/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines()[:2] == [
+            "contentId,type,title,date,notes,link,year,rank,status,"
+            "watchlist_at",
+            'c1,movie,"映画, A",2024-01-02,"line1',
+        ]
+        assert "c2,book,Book B,2023-05-06,,,2023,,,\r\n" in response.text
+
+    def test_skips_watchlist_items_with_year(
+        self, mock_dependencies  # noqa: F811
+    ):
+        """YearIndexで取得済みのアイテムは重複して出力しない"""
+        mock_dependencies.query.side_effect = [
+            {"Items": [ranked_item]},
+            {"Items": [{**ranked_item, "status": "to_watch"}]},
+        ]
+
+        response = client.get("/content/export")
+
+        assert len(response.text.splitlines()) == 1
@@ -11,8 +11,9 @@ client = TestClient(app)
 # 正常系のテスト
 def test_get_years_success(mock_dependencies):  # noqa: F811
     """正常系: DBに存在する年度を取得を重複を除いて取得できることを確認"""
-    # モックの戻り値を設定
+    # モックの戻り値を設定（集計アイテム未作成の場合はYearIndexから算出）
     mock_table = mock_dependencies
+    mock_table.get_item.return_value = {}
     mock_table.query.return_value = {
         "Items": [
             {"year": "2023"},
@@ -45,12 +46,71 @@ def test_get_years_success(mock_dependencies):  # noqa: F811
     )
 
 
+def test_get_years_from_summary(mock_dependencies):  # noqa: F811
+    """正常系: 集計アイテムから件数が1件以上の年度のみ取得できることを確認"""
+    mock_table = mock_dependencies
+    mock_table.get_item.return_value = {
+        "Item": {
+            "contentId": "#summary",
+            "userId": "test_user",
+            "complete": True,
+            "count#2021": 2,
+            "count#2021#book": 2,
+            "count#2022": 0,
+            "count#2022#movie": 0,
+            "count#2023": 1,
+            "count#2023#movie": 1,
+        }
+    }
+
+    response = client.get("/content/years")
+
+    # アサーション
+    assert response.status_code == 200
+    assert response.json() == ["2023", "2021"]
+    # ETag用のデータのバージョンの取得後に集計アイテムを取得
+    mock_table.get_item.assert_called_with(
+        Key={"contentId": "#summary", "userId": "test_user"},
+        ConsistentRead=True,
+    )
+    assert mock_table.get_item.call_count == 2
+    mock_table.query.assert_not_called()
+
+
+def test_get_years_from_incomplete_summary(mock_dependencies):  # noqa: F811
+    """正常系: データ移行前に作成された集計アイテムは使わずYearIndexから算出することを確認"""
+    mock_table = mock_dependencies
+    mock_table.get_item.return_value = {
+        "Item": {
+            "contentId": "#summary",
+            "userId": "test_user",
+            "version": 1,
+            "count#2024": 1,
+            "count#2024#movie": 1,
+        }
+    }
+    mock_table.query.side_effect = [
+        {
+            "Items": [{"year": 2020}, {"year": 2021}],
+            "LastEvaluatedKey": {"contentId": "2", "userId": "test_user"},
+        },
+        {"Items": [{"year": 2024}]},
+    ]
+
+    response = client.get("/content/years")
+
+    # アサーション（全ページ分の年度を返す）
+    assert response.status_code == 200
+    assert sorted(response.json()) == ["2020", "2021", "2024"]
+    assert mock_table.query.call_count == 2
+
+
 # 異常系のテスト
 def test_get_years_failure(mock_dependencies):  # noqa: F811
     """異常系: DynamoDBがエラーをスローした場合の返却値が想定通りなことを確認"""
     # モックの戻り値として例外を発生させる
     mock_table = mock_dependencies
-    mock_table.query.side_effect = Exception("Mocked exception")
+    mock_table.get_item.side_effect = Exception("Mocked exception")
 
     # エンドポイントを呼び出し
     response = client.get("/content/years")
@@ -6,6 +6,7 @@ from botocore.exceptions import ClientError
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.utils import encode_cursor
 from app.tests.conftest import mock_dependencies, mock_user_id  # noqa: F401
 
 # モックデータと設定
@@ -146,3 +147,122 @@ async def test_get_year_contents_invalid_year(mock_dependencies):  # noqa: F811
 
     # 検証
     assert response.status_code == 422  # バリデーションエラー
+
+
+@pytest.mark.asyncio
+async def test_get_year_contents_paginated(mock_dependencies):  # noqa: F811
+    """正常系: limit指定時は日付順のGSIから1ページ分のみ取得し、次ページのカーソルをヘッダーで返す"""
+    mock_table = mock_dependencies
+    last_key = {
+        "contentId": "1",
+        "userId": mock_user_id,
+        "year_date": "2024#2024-11-10",
+    }
+    # YearDateIndexは日付の昇順で返す
+    mock_table.query = MagicMock(
+        return_value={
+            "Items": [mock_content_items[1], mock_content_items[0]],
+            "LastEvaluatedKey": last_key,
+        }
+    )
+
+    response = client.get("/content/year=2024?limit=2")
+
+    assert response.status_code == 200
+    assert response.json() == expected_response
+    next_cursor = response.headers["X-Next-Cursor"]
+
+    expected_key_condition = Key("userId").eq("test_user") & Key(
+        "year_date"
+    ).begins_with("2024#")
+    mock_table.query.assert_called_once_with(
+        IndexName="YearDateIndex",
+        KeyConditionExpression=expected_key_condition,
+        Limit=2,
+    )
+
+    # 返却されたカーソルで次ページを取得
+    mock_table.query = MagicMock(return_value={"Items": []})
+    response = client.get(f"/content/year=2024?limit=2&cursor={next_cursor}")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+    mock_table.query.assert_called_once_with(
+        IndexName="YearDateIndex",
+        KeyConditionExpression=expected_key_condition,
+        Limit=2,
+        ExclusiveStartKey=last_key,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "key",
+    [
+        # 他ユーザーのカーソル
+        {"contentId": "1", "userId": "other", "year_date": "2024#2024-11-10"},
+        # 他年度のカーソル
+        {
+            "contentId": "1",
+            "userId": mock_user_id,
+            "year_date": "2023#2023-11-10",
+        },
+        # 余分なキー・不足したキー
+        {
+            "contentId": "1",
+            "userId": mock_user_id,
+            "year_date": "2024#2024-11-10",
+            "year": 2024,
+        },
+        {"contentId": "1", "userId": mock_user_id, "year": 2024},
+    ],
+)
+async def test_get_year_contents_rejects_foreign_cursor(
+    key, mock_dependencies  # noqa: F811
+):
+    """異常系: 他ユーザー・他年度・形式の異なるカーソルは400エラー"""
+    mock_table = mock_dependencies
+    mock_table.query = MagicMock()
+
+    response = client.get(
+        f"/content/year=2024?limit=2&cursor={encode_cursor(key)}"
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+    mock_table.query.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_year_contents_follows_last_evaluated_key(
+    mock_dependencies,  # noqa: F811
+):
+    """正常系: ページング未指定時は全ページを辿って日付順で返す"""
+    mock_table = mock_dependencies
+    mock_table.query = MagicMock(
+        side_effect=[
+            {
+                "Items": [mock_content_items[0]],
+                "LastEvaluatedKey": {"contentId": "1", "userId": mock_user_id},
+            },
+            {"Items": [mock_content_items[1]]},
+        ]
+    )
+
+    response = client.get(f"/content/year={mock_year}")
+
+    assert response.status_code == 200
+    assert response.json() == expected_response
+    assert mock_table.query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_year_contents_invalid_cursor(
+    mock_dependencies,  # noqa: F811
+):
+    """異常系: カーソルが不正な場合は400エラー"""
+    response = client.get(f"/content/year={mock_year}?cursor=invalid!!")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,134 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from app.http_client import HTTPClient, get_http_client
+
+
+def build_client():
+    return HTTPClient(
+        connect_timeout=1,
+        read_timeout=3,
+        max_retries=2,
+        backoff_factor=0.1,
+        backoff_jitter=0.5,
+        pool_maxsize=4,
+    )
+
+
+class TestHTTPClient:
+    @patch("requests.Session.request")
+    def test_default_timeout_and_metrics(self, mock_request):
+        mock_request.return_value = Mock(status_code=200)
+        client = build_client()
+
+        # テスト実行
+        client.get("https://api.example.com/a", params={"q": "x"})
+        client.get("https://api.example.com/b", timeout=10)
+        client.post("https://auth.example.com/token", data={})
+
+        # アサーション
+        first, second, third = mock_request.call_args_list
+        assert first.args == ("GET", "https://api.example.com/a")
+        assert first.kwargs == {"params": {"q": "x"}, "timeout": (1, 3)}
+        assert second.kwargs == {"timeout": 10}
+        assert third.args[0] == "POST"
+        stats = client.stats()
+        assert stats["api.example.com"]["requests"] == 2
+        assert stats["api.example.com"]["errors"] == 0
+        assert stats["auth.example.com"]["requests"] == 1
+
+    @patch("requests.Session.request")
+    def test_errors_are_counted(self, mock_request):
+        client = build_client()
+        mock_request.side_effect = requests.ConnectionError("down")
+
+        # テスト実行
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://api.example.com/a")
+        mock_request.side_effect = None
+        mock_request.return_value = Mock(status_code=503)
+        client.get("https://api.example.com/a")
+
+        # アサーション
+        assert client.stats()["api.example.com"]["errors"] == 2
+        assert client.host_metrics("api.example.com").percentile(0.95) >= 0
+
+    def test_session_is_pooled_with_retries(self):
+        client = build_client()
+
+        # テスト実行
+        session = client.session
+        adapter = session.get_adapter("https://api.example.com")
+
+        # アサーション
+        assert client.session is session
+        assert adapter._pool_maxsize == 4
+        retry = adapter.max_retries
+        assert retry.total == 2
+        assert retry.backoff_jitter == 0.5
+        assert 503 in retry.status_forcelist
+        assert "POST" not in retry.allowed_methods
+
+    def test_shared_client(self):
+        assert get_http_client() is get_http_client()
+
+
+class TestHedgedGet:
+    def build_hedged_client(self):
+        client = HTTPClient(
+            connect_timeout=1,
+            read_timeout=3,
+            max_retries=0,
+            backoff_factor=0,
+            backoff_jitter=0,
+            pool_maxsize=4,
+            hedge_enabled=True,
+            hedge_min_samples=3,
+        )
+        # 直近のp95が約10ミリ秒になるよう記録しておく
+        for _ in range(3):
+            client._record("api.example.com", 10, False)
+        return client
+
+    @patch("requests.Session.request")
+    def test_sends_second_request_when_slow(self, mock_request):
+        slow = Mock(status_code=200, name="slow")
+        fast = Mock(status_code=200, name="fast")
+
+        def request(method, url, **kwargs):
+            if mock_request.call_count == 1:
+                time.sleep(0.3)
+                return slow
+            return fast
+
+        mock_request.side_effect = request
+        client = self.build_hedged_client()
+
+        # テスト実行
+        response = client.hedged_get("https://api.example.com/a")
+
+        # アサーション
+        assert response is fast
+        assert mock_request.call_count == 2
+
+    @patch("requests.Session.request")
+    def test_no_hedge_without_samples(self, mock_request):
+        mock_request.return_value = Mock(status_code=200)
+        client = self.build_hedged_client()
+
+        # テスト実行（記録のないホスト）
+        client.hedged_get("https://other.example.com/a")
+
+        # アサーション
+        assert mock_request.call_count == 1
+
+    def test_disabled_by_default(self):
+        client = build_client()
+        for _ in range(30):
+            client._record("api.example.com", 10, False)
+
+        # アサーション
+        assert client.hedge_delay("api.example.com") is None
@@ -0,0 +1,334 @@
+import json
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.crud.content_crud import get_existing_contents
+from app.main import app
+from app.services.import_service import iter_csv_rows, iter_lines
+from app.tests.conftest import mock_dependencies, mock_user_id  # noqa: F401
+
+client = TestClient(app)
+
+
+def _prepare_table(mock_table, existing=None):
+    mock_table.name = "Content"
+    mock_table.meta.client.batch_get_item.return_value = {
+        "Responses": {"Content": existing or []}
+    }
+    mock_table.meta.client.batch_write_item.return_value = {}
+
+
+def _written_items(mock_table):
+    # batch_write_itemで書き込んだアイテム
+    return [
+        request["PutRequest"]["Item"]
+        for c in mock_table.meta.client.batch_write_item.call_args_list
+        for request in c.kwargs["RequestItems"]["Content"]
+    ]
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestIterLines:
+    @pytest.mark.asyncio
+    async def test_joins_lines_and_multibyte_across_chunks(self):
+        """チャンクの境界で分割された行・マルチバイト文字を結合する"""
+        data = "\ufeffa,b\n映画,c\nlast".encode()
+        split = data.index("映".encode()) + 1
+        lines = await _collect(iter_lines(_chunks(data[:split], data[split:])))
+        assert lines == ["a,b\n", "映画,c\n", "last"]
+
+    @pytest.mark.asyncio
+    async def test_csv_quoted_newline(self):
+        """クォート内の改行を含むレコードを1行として解析する"""
+        data = 'title,notes\n"A","line1\nline2"\nB,x\n'.encode()
+        rows = await _collect(iter_csv_rows(iter_lines(_chunks(data))))
+        assert rows == [
+            (2, {"title": "A", "notes": "line1\nline2"}, None),
+            (4, {"title": "B", "notes": "x"}, None),
+        ]
+
+
+class TestImportContents:
+    @patch("app.crud.content_crud.update_search_index")
+    def test_import_csv(
+        self, mock_update_search_index, mock_dependencies  # noqa: F811
+    ):
+        """正常系: CSVの全行が登録され、集計アイテムがまとめて加算される"""
+        _prepare_table(mock_dependencies)
+        body = (
+            "contentId,type,title,date,notes,link\n"
+            'c1,movie,Movie A,2024-01-02,"good,\nfun",\n'
+            "c2,book,Book B,2024-03-04,,https://example.com\n"
+            "c3,movie,Movie C,2023-05-06,,\n"
+        )
+
+        response = client.post("/content/import?format=csv", content=body)
+
+        assert response.status_code == 200
+        assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+        items = _written_items(mock_dependencies)
+        assert items[0] == {
+            "contentId": "c1",
+            "type": "movie",
+            "title": "Movie A",
+            "date": "2024-01-02",
+            "type_date": "movie#2024-01-02",
+            "year": 2024,
+            "notes": "good,\nfun",
+            "userId": mock_user_id,
+            "link": None,
+            "status": None,
+            "year_date": "2024#2024-01-02",
+        }
+        assert [item["contentId"] for item in items] == ["c1", "c2", "c3"]
+
+        update = mock_dependencies.update_item.call_args.kwargs
+        assert update["Key"] == {
+            "contentId": "#summary",
+            "userId": mock_user_id,
+        }
+        counts = {
+            update["ExpressionAttributeNames"][name.replace(":", "#")]: value
+            for name, value in update["ExpressionAttributeValues"].items()
+        }
+        assert counts == {
+            "version": 1,
+            "count#2023": 1,
+            "count#2023#movie": 1,
+            "count#2024": 2,
+            "count#2024#book": 1,
+            "count#2024#movie": 1,
+            "written_at": ANY,
+        }
+
+    def test_import_jsonl_with_row_errors(
+        self, mock_dependencies  # noqa: F811
+    ):
+        """不正な行はエラーとして報告し、正しい行のみ登録する"""
+        _prepare_table(mock_dependencies)
+        lines = [
+            json.dumps({"type": "movie", "title": "A", "date": "2024-01-01"}),
+            "{broken",
+            json.dumps({"type": "game", "title": "B", "date": "2024-01-01"}),
+            json.dumps({"type": "book", "title": "C", "date": "2024/01/01"}),
+            json.dumps(
+                {"contentId": "d", "type": "book", "title": "D", "date": "x"}
+            ),
+            # 集計アイテムを上書きするcontentIdは受け付けない
+            json.dumps(
+                {
+                    "contentId": "#summary",
+                    "type": "book",
+                    "title": "E",
+                    "date": "2024-01-01",
+                }
+            ),
+        ]
+
+        response = client.post(
+            "/content/import?format=jsonl", content="\n".join(lines)
+        )
+
+        result = response.json()
+        assert result["imported"] == 1
+        assert result["failed"] == 5
+        assert [error["row"] for error in result["errors"]] == [2, 3, 4, 5, 6]
+        assert result["errors"][1]["errors"][0].startswith("type:")
+        assert result["errors"][3] == {
+            "row": 5,
+            "contentId": "d",
+            "errors": ["date: must be in YYYY-MM-DD format"],
+        }
+        assert result["errors"][4] == {
+            "row": 6,
+            "contentId": "#summary",
+            "errors": ["contentId: must not start with '#'"],
+        }
+        assert len(_written_items(mock_dependencies)) == 1
+
+    def test_rejects_duplicates_and_existing(
+        self, mock_dependencies  # noqa: F811
+    ):
+        """ファイル内の重複・登録済みのコンテンツは登録しない"""
+        _prepare_table(
+            mock_dependencies,
+            existing=[
+                {"contentId": "c1", "year": 2024, "type": "movie"},
+                # ウォッチリストのコンテンツ（yearなし）は上書きする
+                {"contentId": "w1", "type": "movie"},
+            ],
+        )
+        body = (
+            "contentId,type,title,date\n"
+            "c1,movie,A,2024-01-01\n"
+            "w1,movie,B,2024-01-01\n"
+            "w1,movie,B,2024-01-01\n"
+        )
+
+        response = client.post("/content/import", content=body)
+
+        assert response.json() == {
+            "imported": 1,
+            "failed": 2,
+            "errors": [
+                {
+                    "row": 4,
+                    "contentId": "w1",
+                    "errors": ["contentId: duplicated in file"],
+                },
+                {
+                    "row": 2,
+                    "contentId": "c1",
+                    "errors": ["contentId: already exists"],
+                },
+            ],
+        }
+        assert [
+            item["contentId"] for item in _written_items(mock_dependencies)
+        ] == ["w1"]
+
+    @patch("app.crud.content_crud.update_search_index")
+    def test_writes_in_chunks(
+        self, mock_update_search_index, mock_dependencies  # noqa: F811
+    ):
+        """一定件数ごとにまとめて書き込み、上限を超えた行は取り込まない"""
+        _prepare_table(mock_dependencies)
+        body = "type,title,date\n" + "".join(
+            f"movie,T{i},2024-01-01\n" for i in range(5)
+        )
+
+        with patch.object(settings, "bulk_import_chunk_size", 2), patch.object(
+            settings, "bulk_import_max_rows", 4
+        ):
+            response = client.post("/content/import", content=body)
+
+        result = response.json()
+        assert result["imported"] == 4
+        assert result["failed"] == 1
+        assert result["errors"][0]["row"] == 6
+        assert mock_dependencies.meta.client.batch_write_item.call_count == 2
+        assert mock_dependencies.update_item.call_count == 2
+
+    def test_write_failure_reported(self, mock_dependencies):  # noqa: F811
+        """書き込みに失敗した行はエラーとして報告する"""
+        _prepare_table(mock_dependencies)
+        mock_dependencies.meta.client.batch_write_item.side_effect = Exception(
+            "throttled"
+        )
+
+        response = client.post(
+            "/content/import",
+            content="type,title,date\nmovie,A,2024-01-01\n",
+        )
+
+        assert response.json() == {
+            "imported": 0,
+            "failed": 1,
+            "errors": [
+                {
+                    "row": 2,
+                    "contentId": response.json()["errors"][0]["contentId"],
+                    "errors": ["write failed: throttled"],
+                }
+            ],
+        }
+
+        mock_dependencies.update_item.assert_not_called()
+
+    @patch("app.crud.content_crud.update_search_index")
+    def test_partial_write_failure(
+        self, mock_update_search_index, mock_dependencies  # noqa: F811
+    ):
+        """途中で失敗した場合は書き込めなかった行のみ失敗とし、
+        書き込み済みの行の件数・バージョン・転置インデックスは更新する"""
+        _prepare_table(mock_dependencies)
+        mock_dependencies.meta.client.batch_write_item.side_effect = [
+            {},
+            Exception("throttled"),
+        ]
+        body = "contentId,type,title,date\n" + "".join(
+            f"c{i},movie,T{i},2024-01-01\n" for i in range(30)
+        )
+
+        response = client.post("/content/import", content=body)
+
+        result = response.json()
+        assert result["imported"] == 25
+        assert result["failed"] == 5
+        assert [error["contentId"] for error in result["errors"]] == [
+            f"c{i}" for i in range(25, 30)
+        ]
+        update = mock_dependencies.update_item.call_args.kwargs
+        assert update["ExpressionAttributeValues"][":c0"] == 25
+        changes = mock_update_search_index.call_args.args[2]
+        assert [new["contentId"] for _, new in changes] == [
+            f"c{i}" for i in range(25)
+        ]
+
+    @patch("app.crud.content_crud.time.sleep")
+    @patch("app.crud.content_crud.update_search_index")
+    def test_retries_unprocessed_items(
+        self,
+        mock_update_search_index,
+        mock_sleep,
+        mock_dependencies,  # noqa: F811
+    ):
+        """未処理のアイテムは再送し、書き込めた時点で登録済みとする"""
+        _prepare_table(mock_dependencies)
+        mock_dependencies.meta.client.batch_write_item.side_effect = [
+            {
+                "UnprocessedItems": {
+                    "Content": [{"PutRequest": {"Item": {"contentId": "b"}}}]
+                }
+            },
+            {},
+        ]
+        body = "contentId,type,title,date\na,movie,A,2024-01-01\n" + (
+            "b,movie,B,2024-01-01\n"
+        )
+
+        response = client.post("/content/import", content=body)
+
+        assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+        assert [
+            item["contentId"] for item in _written_items(mock_dependencies)
+        ] == [
+            "a",
+            "b",
+            "b",
+        ]
+        mock_dependencies.update_item.assert_called_once()
+
+
+class TestGetExistingContents:
+    @patch("app.crud.content_crud.time.sleep")
+    def test_retries_unprocessed_keys(self, mock_sleep):
+        """未処理のキーは再取得する"""
+        mock_table = MagicMock()
+        mock_table.name = "Content"
+        unprocessed = {"Content": {"Keys": [{"contentId": "c2"}]}}
+        mock_table.meta.client.batch_get_item.side_effect = [
+            {
+                "Responses": {"Content": [{"contentId": "c1", "year": 2024}]},
+                "UnprocessedKeys": unprocessed,
+            },
+            {"Responses": {"Content": [{"contentId": "c2"}]}},
+        ]
+
+        found = get_existing_contents(mock_user_id, mock_table, ["c1", "c2"])
+
+        assert set(found) == {"c1", "c2"}
+        second = mock_table.meta.client.batch_get_item.call_args_list[1]
+        assert second.kwargs["RequestItems"] == unprocessed
+        mock_sleep.assert_called_once()
@@ -0,0 +1,43 @@
+from app.import_report import (
+    ImportTime,
+    format_report,
+    main,
+    parse_importtime,
+    total_ms,
+)
+
+SAMPLE_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       2000 |   boto3
+import time:       300 |       2420 | app.main
+"""
+
+
+class TestImportReport:
+    def test_parse_importtime(self):
+        results = parse_importtime(SAMPLE_OUTPUT)
+
+        assert results == [
+            ImportTime("_io", 120, 120),
+            ImportTime("boto3", 1500, 2000),
+            ImportTime("app.main", 300, 2420),
+        ]
+
+    def test_total_ms(self):
+        results = parse_importtime(SAMPLE_OUTPUT)
+
+        assert total_ms(results, "app.main") == 2.42
+        assert total_ms(results, "unknown") == 0.0
+
+    def test_format_report_orders_by_self_time(self):
+        report = format_report(parse_importtime(SAMPLE_OUTPUT), "app.main", 1)
+
+        assert "app.main: 2.4 ms" in report
+        assert "       1.5  boto3" in report
+        assert "       2.4  app.main" in report
+
+    def test_main_fails_when_threshold_exceeded(self, capsys):
+        # 実際にサブプロセスで標準ライブラリのモジュールを計測する
+        assert main(["--module", "json", "--max-ms", "100000"]) == 0
+        assert main(["--module", "json", "--max-ms", "0"]) == 1
+        assert "import time exceeds" in capsys.readouterr().out
@@ -0,0 +1,148 @@
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from app.config import settings
+from app.metadata_cache import (
+    DynamoDBMetadataStore,
+    MemoryMetadataStore,
+    MetadataCache,
+    SQLiteMetadataStore,
+    build_metadata_store,
+    metadata_cache_key,
+    normalize_title,
+)
+from app.services.content_service import search_movie_links_tmdb
+
+
+class TestMetadataCacheKey:
+    def test_normalize_title(self):
+        assert normalize_title("  ＡＢＣ　 Book ") == "abc book"
+
+    def test_key_includes_type_and_language(self):
+        assert metadata_cache_key("ＡＢＣ", "book", "ja") == "book#ja#abc"
+
+
+class TestMetadataCache:
+    def test_hit_after_fetch(self):
+        cache = MetadataCache(MemoryMetadataStore(10), 60, 10)
+        fetch = Mock(return_value={"id": 1})
+
+        # テスト実行
+        first = cache.get_or_fetch("Movie", "movie", "ja-JP", fetch)
+        second = cache.get_or_fetch(" movie ", "movie", "ja-JP", fetch)
+
+        # アサーション
+        assert first == second == {"id": 1}
+        fetch.assert_called_once()
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_not_found_is_cached_with_negative_ttl(self, fake_timer):
+        store = SQLiteMetadataStore(":memory:", 10, timer=fake_timer)
+        cache = MetadataCache(store, positive_ttl=60, negative_ttl=10)
+        fetch = Mock(return_value=None)
+
+        # テスト実行
+        assert cache.get_or_fetch("Unknown", "book", "ja", fetch) is None
+        assert cache.get_or_fetch("Unknown", "book", "ja", fetch) is None
+        fake_timer.now += 11
+        assert cache.get_or_fetch("Unknown", "book", "ja", fetch) is None
+
+        # アサーション（期限切れ後に再取得される）
+        assert fetch.call_count == 2
+
+    def test_failure_is_not_cached(self):
+        cache = MetadataCache(MemoryMetadataStore(10), 60, 10)
+        fetch = Mock(side_effect=[Exception("API error"), {"id": 1}])
+
+        # テスト実行
+        with pytest.raises(Exception):
+            cache.get_or_fetch("Movie", "movie", "ja-JP", fetch)
+        result = cache.get_or_fetch("Movie", "movie", "ja-JP", fetch)
+
+        # アサーション
+        assert result == {"id": 1}
+        assert fetch.call_count == 2
+
+    def test_store_error_falls_back_to_fetch(self):
+        store = Mock()
+        store.get.side_effect = Exception("store error")
+        store.set.side_effect = Exception("store error")
+        cache = MetadataCache(store, 60, 10)
+
+        # テスト実行
+        result = cache.get_or_fetch("Movie", "movie", "ja-JP", lambda: {})
+
+        # アサーション
+        assert result == {}
+
+
+class TestSQLiteMetadataStore:
+    def test_persists_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteMetadataStore(path, 10).set("key", {"data": {"id": 1}}, 60)
+
+        # テスト実行
+        result = SQLiteMetadataStore(path, 10).get("key")
+
+        # アサーション
+        assert result == {"data": {"id": 1}}
+
+    def test_evicts_least_recently_used(self, fake_timer):
+        store = SQLiteMetadataStore(":memory:", 2, timer=fake_timer)
+        store.set("a", {"data": 1}, 60)
+        fake_timer.now += 1
+        store.set("b", {"data": 2}, 60)
+        fake_timer.now += 1
+        store.get("a")
+        fake_timer.now += 1
+
+        # テスト実行
+        store.set("c", {"data": 3}, 60)
+
+        # アサーション
+        assert store.get("a") == {"data": 1}
+        assert store.get("b") is None
+        assert store.get("c") == {"data": 3}
+
+
+class TestDynamoDBMetadataStore:
+    def test_set_and_get(self, fake_timer):
+        table = MagicMock()
+        store = DynamoDBMetadataStore(table, timer=fake_timer)
+
+        # テスト実行
+        store.set("key", {"data": {"title": "本"}}, 60)
+
+        # アサーション
+        item = table.put_item.call_args.kwargs["Item"]
+        assert item["cacheKey"] == "key"
+        assert item["expiresAt"] == 1060
+        table.get_item.return_value = {"Item": item}
+        assert store.get("key") == {"data": {"title": "本"}}
+        fake_timer.now += 61
+        assert store.get("key") is None
+
+
+class TestBuildMetadataStore:
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            build_metadata_store("redis")
+
+
+class TestSearchMovieLinksCache:
+    @patch.object(settings, "tmdb_api_key", "test_api_key")
+    @patch("requests.Session.request")
+    def test_tmdb_is_called_once_per_title(self, mock_get):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"results": [{"id": 12345}]}
+        mock_get.return_value = mock_response
+
+        # テスト実行
+        first = search_movie_links_tmdb("Test Movie")
+        second = search_movie_links_tmdb("test movie")
+
+        # アサーション
+        assert first[0] == second[0]
+        assert mock_get.call_count == 1
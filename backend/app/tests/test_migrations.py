@@ -0,0 +1,312 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.crud.content_crud import SUMMARY_CONTENT_ID, search_item_id
+from app.db.migrations import (
+    backfill_search_index,
+    backfill_user_summary,
+    backfill_watchlist_index,
+    backfill_year_date_index,
+    backfill_year_rank_index,
+)
+
+
+class TestBackfillWatchlistIndex:
+    def test_backfill_watchlist_index(self):
+        # モック設定（2ページに分かれたスキャン結果）
+        table = MagicMock()
+        table.scan.side_effect = [
+            {
+                "Items": [{"contentId": "1", "userId": "u1"}],
+                "LastEvaluatedKey": {"contentId": "1", "userId": "u1"},
+            },
+            {"Items": [{"contentId": "2", "userId": "u2"}]},
+        ]
+
+        # テスト実行
+        count = backfill_watchlist_index(table)
+
+        # アサーション
+        assert count == 2
+        assert table.scan.call_count == 2
+        keys = [c.kwargs["Key"] for c in table.update_item.call_args_list]
+        assert keys == [
+            {"contentId": "1", "userId": "u1"},
+            {"contentId": "2", "userId": "u2"},
+            # 属性を付与したユーザーのデータのバージョンを加算する
+            {"contentId": SUMMARY_CONTENT_ID, "userId": "u1"},
+            {"contentId": SUMMARY_CONTENT_ID, "userId": "u2"},
+        ]
+        bump = table.update_item.call_args.kwargs
+        assert bump["UpdateExpression"].startswith("ADD #v :v")
+
+    def test_backfill_watchlist_index_skips_changed_items(self):
+        # スキャン後に更新されたアイテムは条件付き更新で弾かれる
+        table = MagicMock()
+        table.scan.return_value = {
+            "Items": [{"contentId": "1", "userId": "u1"}]
+        }
+        table.update_item.side_effect = ClientError(
+            error_response={
+                "Error": {
+                    "Code": "ConditionalCheckFailedException",
+                    "Message": "The conditional request failed",
+                }
+            },
+            operation_name="UpdateItem",
+        )
+
+        # テスト実行
+        count = backfill_watchlist_index(table)
+
+        # アサーション（更新していないユーザーのバージョンは加算しない）
+        assert count == 0
+        assert table.update_item.call_count == 1
+
+
+def _conditional_check_failed(operation_name: str) -> ClientError:
+    return ClientError(
+        error_response={
+            "Error": {
+                "Code": "ConditionalCheckFailedException",
+                "Message": "The conditional request failed",
+            }
+        },
+        operation_name=operation_name,
+    )
+
+
+# 集計アイテムのスキャン結果（u2はバージョン5の集計アイテムが作成済み）
+SUMMARY_ITEMS = {"Items": [{"userId": "u2", "version": 5}]}
+# 年度ありのアイテムのスキャン結果
+CONTENT_ITEMS = {
+    "Items": [
+        {"contentId": "1", "userId": "u1", "year": 2024, "type": "movie"},
+        {"contentId": "2", "userId": "u1", "year": 2024, "type": "book"},
+        {"contentId": "3", "userId": "u2", "year": 2023, "type": "book"},
+        {"contentId": "#summary", "userId": "u2", "year": 2023},
+    ]
+}
+
+
+class TestBackfillUserSummary:
+    def test_backfill_user_summary(self):
+        # モック設定（集計アイテム → 年度ありのアイテムの順にスキャン）
+        table = MagicMock()
+        table.scan.side_effect = [SUMMARY_ITEMS, CONTENT_ITEMS]
+
+        # テスト実行
+        count = backfill_user_summary(table)
+
+        # アサーション（既存の集計アイテムは集計対象外・バージョンは引き継いで加算）
+        assert count == 2
+        assert all(
+            c.kwargs["ConsistentRead"] for c in table.scan.call_args_list
+        )
+        calls = [c.kwargs for c in table.put_item.call_args_list]
+        assert [c["Item"] for c in calls] == [
+            {
+                "contentId": "#summary",
+                "userId": "u1",
+                "version": 1,
+                "complete": True,
+                "count#2024": 2,
+                "count#2024#movie": 1,
+                "count#2024#book": 1,
+            },
+            {
+                "contentId": "#summary",
+                "userId": "u2",
+                "version": 6,
+                "complete": True,
+                "count#2023": 1,
+                "count#2023#book": 1,
+            },
+        ]
+        # 読み込み時点から集計アイテムが更新されていない場合のみ置き換える
+        assert calls[0]["ConditionExpression"] == (
+            "attribute_not_exists(contentId)"
+        )
+        assert calls[1]["ConditionExpression"] == "#v = :v"
+        assert calls[1]["ExpressionAttributeValues"] == {":v": 5}
+
+    def test_backfill_user_summary_retries_conflicts(self):
+        # u1は集計中に登録があり、集計アイテムの置き換えが条件付き書き込みで弾かれる
+        table = MagicMock()
+        table.scan.side_effect = [
+            SUMMARY_ITEMS,
+            CONTENT_ITEMS,
+            {
+                "Items": [
+                    *SUMMARY_ITEMS["Items"],
+                    {"userId": "u1", "version": 1},
+                ]
+            },
+            {
+                "Items": [
+                    *CONTENT_ITEMS["Items"],
+                    {"contentId": "4", "userId": "u1", "year": 2025},
+                ]
+            },
+        ]
+        table.put_item.side_effect = [
+            _conditional_check_failed("PutItem"),
+            None,
+            None,
+        ]
+
+        count = backfill_user_summary(table)
+
+        # 競合したユーザーのみ再集計し、登録されたアイテムも件数に含める
+        assert count == 2
+        items = [c.kwargs["Item"] for c in table.put_item.call_args_list]
+        assert [item["userId"] for item in items] == ["u1", "u2", "u1"]
+        assert items[2]["version"] == 2
+        assert items[2]["count#2025"] == 1
+        assert items[2]["count#2024"] == 2
+
+
+class TestBackfillYearRankIndex:
+    def test_backfill_year_rank_index(self):
+        # モック設定
+        table = MagicMock()
+        table.scan.return_value = {
+            "Items": [
+                {"contentId": "1", "userId": "u1", "year": 2024, "rank": 3}
+            ]
+        }
+
+        # テスト実行
+        count = backfill_year_rank_index(table)
+
+        # アサーション
+        assert count == 1
+        assert table.update_item.call_count == 2
+        kwargs = table.update_item.call_args_list[0].kwargs
+        assert kwargs["ExpressionAttributeValues"] == {
+            ":yr": "2024#0003",
+            ":r": 3,
+            ":y": 2024,
+        }
+
+
+class TestBackfillYearDateIndex:
+    def test_backfill_year_date_index(self):
+        # モック設定
+        table = MagicMock()
+        table.scan.return_value = {
+            "Items": [
+                {
+                    "contentId": "1",
+                    "userId": "u1",
+                    "year": 2024,
+                    "date": "2024-03-04",
+                }
+            ]
+        }
+
+        # テスト実行
+        count = backfill_year_date_index(table)
+
+        # アサーション
+        assert count == 1
+        assert table.update_item.call_count == 2
+        kwargs = table.update_item.call_args_list[0].kwargs
+        assert kwargs["ConditionExpression"] == "#y = :y AND #d = :d"
+        assert kwargs["ExpressionAttributeValues"] == {
+            ":yd": "2024#2024-03-04",
+            ":y": 2024,
+            ":d": "2024-03-04",
+        }
+
+    def test_backfill_year_date_index_bumps_version_on_failure(self):
+        # 途中で失敗しても、それまでに更新したユーザーのバージョンは加算する
+        table = MagicMock()
+        table.scan.return_value = {
+            "Items": [
+                {
+                    "contentId": "1",
+                    "userId": "u1",
+                    "year": 2024,
+                    "date": "2024-03-04",
+                },
+                {
+                    "contentId": "2",
+                    "userId": "u2",
+                    "year": 2024,
+                    "date": "2024-03-05",
+                },
+            ]
+        }
+        throttled = ClientError(
+            error_response={
+                "Error": {
+                    "Code": "ProvisionedThroughputExceededException",
+                    "Message": "Throttled",
+                }
+            },
+            operation_name="UpdateItem",
+        )
+        table.update_item.side_effect = [None, throttled, None]
+
+        # テスト実行
+        with pytest.raises(ClientError):
+            backfill_year_date_index(table)
+
+        # アサーション
+        keys = [c.kwargs["Key"] for c in table.update_item.call_args_list]
+        assert keys[-1] == {"contentId": SUMMARY_CONTENT_ID, "userId": "u1"}
+
+
+class TestBackfillSearchIndex:
+    def test_backfill_search_index(self):
+        table = MagicMock()
+        table.scan.side_effect = [
+            # 更新の失敗の記録
+            {"Items": [{"contentId": "#search", "userId": "u1"}]},
+            {
+                "Items": [
+                    {
+                        "contentId": "1",
+                        "userId": "u1",
+                        "year": 2024,
+                        "title": "a",
+                    },
+                    {
+                        "contentId": "2",
+                        "userId": "u1",
+                        "year": 2023,
+                        "title": "A",
+                        "notes": "b",
+                    },
+                    {"contentId": "#summary", "userId": "u1", "year": 2023},
+                    # 作成済みのアイテム（旧形式のバケットを含む）
+                    {"contentId": search_item_id("a", "1"), "userId": "u1"},
+                    {"contentId": "#search#07", "userId": "u1"},
+                ]
+            },
+        ]
+
+        count = backfill_search_index(table)
+
+        # トークン a・b のアイテムのみ作成する
+        items = [c.kwargs["Item"] for c in table.put_item.call_args_list]
+        postings = {}
+        for item in items:
+            for token, ids in item.items():
+                if token in ("contentId", "userId"):
+                    continue
+                assert item["contentId"] == search_item_id(token, min(ids))
+                postings.setdefault(token, set()).update(ids)
+        assert postings == {"a": {"1", "2"}, "b": {"2"}}
+        assert count == len(items)
+        # 更新の失敗の記録・トークンを含まなくなったアイテムは削除する
+        deleted = [c.kwargs["Key"] for c in table.delete_item.call_args_list]
+        assert deleted[0] == {"contentId": "#search", "userId": "u1"}
+        assert {"contentId": "#search#07", "userId": "u1"} in deleted
+        assert {
+            "contentId": search_item_id("a", "1"),
+            "userId": "u1",
+        } not in deleted
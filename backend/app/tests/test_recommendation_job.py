@@ -0,0 +1,306 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.crud.recommendation_job_crud import (
+    DynamoDBJobStore,
+    MemoryJobStore,
+    get_job_store,
+)
+from app.main import app, handler
+from app.schemas.content import DependsData
+from app.services.content_service import cache_recommendations
+from app.services.depends_service import (
+    get_content_table_and_user_id,
+    get_content_table_and_user_id_without_premium,
+)
+from app.services.recommendation_job_service import (
+    dispatch_recommendation_job,
+    get_recommendation_job,
+    recommendation_job_id,
+    run_recommendation_job,
+    submit_recommendation_job,
+)
+
+client = TestClient(app)
+
+RESULT = [{"title": "A", "desc": "a", "links": []}]
+
+
+def conditional_check_failed():
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+    )
+
+
+class TestRecommendationJobService:
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    async def test_duplicate_submissions_share_job(self, mock_dispatch):
+        # テスト実行
+        first = await submit_recommendation_job("user", "movie", ["A", "B"])
+        second = await submit_recommendation_job("user", "movie", ["A", "B"])
+        other = await submit_recommendation_job("user", "movie", ["C"])
+
+        # アサーション
+        assert first["jobId"] == second["jobId"]
+        assert first["jobId"] != other["jobId"]
+        assert second["status"] == "pending"
+        assert mock_dispatch.call_count == 2
+
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    async def test_cached_recommendations_complete_immediately(
+        self, mock_dispatch
+    ):
+        cache_recommendations("user", "movie", ["A"], RESULT)
+
+        # テスト実行
+        job = await submit_recommendation_job("user", "movie", ["A"])
+
+        # アサーション
+        assert job["status"] == "succeeded"
+        assert job["result"] == RESULT
+        mock_dispatch.assert_not_called()
+
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    @patch(
+        "app.services.recommendation_job_service"
+        ".generate_recommendations_bedrock"
+    )
+    async def test_run_job(self, mock_bedrock, mock_dispatch):
+        mock_bedrock.return_value = (
+            [{"title": "A", "desc": "a", "links": []}],
+            True,
+        )
+        job = await submit_recommendation_job("user", "movie", ["A"])
+
+        # テスト実行（2回目は実行済みのため何もしない）
+        run_recommendation_job(job["jobId"])
+        run_recommendation_job(job["jobId"])
+
+        # アサーション
+        result = await get_recommendation_job("user", job["jobId"])
+        assert result["status"] == "succeeded"
+        assert result["result"] == [{"title": "A", "desc": "a", "links": []}]
+        mock_bedrock.assert_called_once_with("movie", ["A"])
+        assert await get_recommendation_job("other", job["jobId"]) is None
+
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    @patch(
+        "app.services.recommendation_job_service"
+        ".generate_recommendations_bedrock"
+    )
+    async def test_failed_job_can_be_resubmitted(
+        self, mock_bedrock, mock_dispatch
+    ):
+        mock_bedrock.side_effect = Exception("Bedrock error")
+        job = await submit_recommendation_job("user", "movie", ["A"])
+        run_recommendation_job(job["jobId"])
+
+        # テスト実行
+        failed = await get_recommendation_job("user", job["jobId"])
+        resubmitted = await submit_recommendation_job("user", "movie", ["A"])
+
+        # アサーション
+        assert failed["status"] == "failed"
+        assert failed["error"] == "Bedrock error"
+        assert resubmitted["status"] == "pending"
+        assert mock_dispatch.call_count == 2
+
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    async def test_dispatch_failure_fails_job(self, mock_dispatch):
+        """ワーカーに渡せなかったジョブは失敗とし、再投稿で再度ワーカーに渡す"""
+        mock_dispatch.side_effect = [Exception("invoke failed"), None]
+
+        # テスト実行
+        with pytest.raises(Exception, match="invoke failed"):
+            await submit_recommendation_job("user", "movie", ["A"])
+        job_id = recommendation_job_id("user", "movie", ["A"])
+        failed = await get_recommendation_job("user", job_id)
+        resubmitted = await submit_recommendation_job("user", "movie", ["A"])
+
+        # アサーション
+        assert failed["status"] == "failed"
+        assert failed["error"] == "invoke failed"
+        assert resubmitted["status"] == "pending"
+        assert mock_dispatch.call_count == 2
+
+    @patch("app.services.recommendation_job_service._lambda_client")
+    @patch.object(settings, "recommendation_job_function_name", "worker")
+    def test_dispatch_to_lambda(self, mock_lambda_client):
+        # テスト実行
+        dispatch_recommendation_job("job")
+
+        # アサーション
+        mock_lambda_client.return_value.invoke.assert_called_once_with(
+            FunctionName="worker",
+            InvocationType="Event",
+            Payload=json.dumps({"recommendationJobId": "job"}).encode(),
+        )
+
+    @patch("app.main.run_recommendation_job")
+    def test_lambda_handler_runs_job(self, mock_run):
+        # テスト実行
+        result = handler({"recommendationJobId": "job"}, None)
+
+        # アサーション
+        mock_run.assert_called_once_with("job")
+        assert result == {"jobId": "job"}
+
+
+class TestJobStores:
+    def test_memory_store_expires(self, fake_timer):
+        store = MemoryJobStore(timer=fake_timer)
+        job = {"jobId": "j", "status": "succeeded", "expiresAt": 1010}
+        store.create(job)
+
+        # アサーション
+        assert store.create(job) is False
+        fake_timer.now = 1011
+        assert store.get("j") is None
+        assert store.create(job) is True
+
+    @pytest.mark.parametrize("status", ["pending", "running"])
+    def test_memory_store_replaces_stale_jobs(self, status, fake_timer):
+        """待機中・実行中のまま更新が止まったジョブは再登録できる"""
+        store = MemoryJobStore(timer=fake_timer, stale_after=60)
+        job = {
+            "jobId": "j",
+            "status": status,
+            "updatedAt": 1000,
+            "expiresAt": 5000,
+        }
+        store.create(job)
+
+        # アサーション
+        fake_timer.now = 1059
+        assert store.create(job) is False
+        fake_timer.now = 1060
+        assert store.create({**job, "status": "pending"}) is True
+
+    def test_dynamodb_store_create_replaces_stale_jobs(self):
+        table = MagicMock()
+        store = DynamoDBJobStore(table, timer=lambda: 1000, stale_after=60)
+
+        # テスト実行
+        store.create({"jobId": "j"})
+
+        # アサーション
+        kwargs = table.put_item.call_args.kwargs
+        assert "updatedAt <= :stale" in kwargs["ConditionExpression"]
+        assert kwargs["ExpressionAttributeValues"][":stale"] == 940
+
+    def test_dynamodb_store_create_duplicate(self):
+        table = MagicMock()
+        table.put_item.side_effect = conditional_check_failed()
+        store = DynamoDBJobStore(table)
+
+        # アサーション
+        assert store.create({"jobId": "j"}) is False
+
+    def test_dynamodb_store_claim(self):
+        table = MagicMock()
+        store = DynamoDBJobStore(table, timer=lambda: 1000)
+
+        # テスト実行
+        claimed = store.claim("j")
+        table.update_item.side_effect = conditional_check_failed()
+        claimed_again = store.claim("j")
+
+        # アサーション
+        assert claimed is True
+        assert claimed_again is False
+        kwargs = table.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "#s = :pending"
+
+    def test_dynamodb_store_finish(self):
+        table = MagicMock()
+        store = DynamoDBJobStore(table, timer=lambda: 1000)
+
+        # テスト実行
+        store.finish("j", {"status": "succeeded", "result": "r"})
+
+        # アサーション
+        table.update_item.assert_called_once_with(
+            Key={"jobId": "j"},
+            UpdateExpression="SET #f0 = :f0, #f1 = :f1, #f2 = :f2",
+            ExpressionAttributeNames={
+                "#f0": "status",
+                "#f1": "result",
+                "#f2": "updatedAt",
+            },
+            ExpressionAttributeValues={
+                ":f0": "succeeded",
+                ":f1": "r",
+                ":f2": 1000,
+            },
+        )
+
+
+class TestRecommendationJobRouter:
+    def setup_method(self):
+        async def premium_user():
+            return DependsData(
+                table=MagicMock(), user_id="test_user", is_premium=True
+            )
+
+        app.dependency_overrides[get_content_table_and_user_id] = premium_user
+        app.dependency_overrides[
+            get_content_table_and_user_id_without_premium
+        ] = premium_user
+
+    def teardown_method(self):
+        app.dependency_overrides = {}
+
+    @patch(
+        "app.services.recommendation_job_service.dispatch_recommendation_job"
+    )
+    @patch("app.routers.recommendation_jobs.get_recent_contents_service")
+    def test_submit_and_poll(self, mock_recent, mock_dispatch):
+        mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+
+        # テスト実行
+        response = client.post("/content/recommend/jobs?content_type=movie")
+        job_id = response.json()["jobId"]
+        pending = client.get(f"/content/recommend/jobs/{job_id}")
+        get_job_store().finish(
+            job_id,
+            {
+                "status": "succeeded",
+                "result": [{"title": "A", "desc": "a", "links": []}],
+            },
+        )
+        succeeded = client.get(f"/content/recommend/jobs/{job_id}")
+
+        # アサーション
+        assert response.status_code == 202
+        assert job_id == recommendation_job_id(
+            "test_user", "movie", ["Movie 1"]
+        )
+        mock_dispatch.assert_called_once_with(job_id)
+        assert pending.json() == {"jobId": job_id, "status": "pending"}
+        assert succeeded.json() == {
+            "jobId": job_id,
+            "status": "succeeded",
+            "recommendations": [{"title": "A", "desc": "a", "links": []}],
+        }
+
+    def test_unknown_job(self):
+        # テスト実行
+        response = client.get("/content/recommend/jobs/unknown")
+
+        # アサーション
+        assert response.status_code == 404
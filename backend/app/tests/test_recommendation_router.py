@@ -1,13 +1,28 @@
-from unittest.mock import patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.schemas.content import DependsData
+from app.services.content_service import generate_recommendations_bedrock
+from app.services.depends_service import get_content_table_and_user_id
 
 client = TestClient(app)
 
 
 class TestGetRecommendation:
-    def test_get_recommendation_success(self, mock_dependencies):
+    def setup_method(self):
+        async def premium_user():
+            return DependsData(
+                table=MagicMock(), user_id="test_user", is_premium=True
+            )
+
+        app.dependency_overrides[get_content_table_and_user_id] = premium_user
+
+    def teardown_method(self):
+        app.dependency_overrides = {}
+
+    def test_get_recommendation_success(self):
         with patch(
             "app.routers.get_recommendation.get_recent_contents_service"
         ) as mock_recent, patch(
@@ -20,8 +35,8 @@ class TestGetRecommendation:
                 {"title": "Movie 2", "type": "movie"},
             ]
             mock_bedrock.return_value = (
-                '{"recommendations": [{"title": "Recommended Movie", '
-                '"desc": "Great movie"}]}'
+                [{"title": "Recommended Movie", "desc": "Great movie"}],
+                True,
             )
 
             # テスト実行
@@ -34,23 +49,42 @@ class TestGetRecommendation:
             mock_recent.assert_called_once()
             mock_bedrock.assert_called_once()
 
-    def test_get_recommendation_no_recent_contents(self, mock_dependencies):
+    def test_get_recommendation_no_recent_contents(self):
         with patch(
             "app.routers.get_recommendation.get_recent_contents_service"
-        ) as mock_recent:
-            # 最近のコンテンツがない場合（IndexErrorが発生する）
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.generate_recommendations_bedrock"
+        ) as mock_bedrock:
+            # 最近のコンテンツがない場合は生成せずにメッセージを返す
             mock_recent.return_value = []
 
             # テスト実行
             response = client.get("/content/recommend?content_type=movie")
 
             # アサーション
-            assert response.status_code == 500
-            data = response.json()
-            assert "detail" in data
+            assert response.status_code == 200
+            assert response.json() == {
+                "recommendations": [],
+                "message": "履歴が不足しているためレコメンドを生成できません",
+                "isPremium": True,
+            }
             mock_recent.assert_called_once()
+            mock_bedrock.assert_not_called()
 
-    def test_get_recommendation_error(self, mock_dependencies):
+    def test_get_recommendation_not_premium(self, mock_dependencies):
+        # 有料会員でない場合は履歴を取得しない（mock_dependencies は無料会員）
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent:
+            # テスト実行
+            response = client.get("/content/recommend?content_type=movie")
+
+            # アサーション
+            assert response.status_code == 200
+            assert response.json()["isPremium"] is False
+            mock_recent.assert_not_called()
+
+    def test_get_recommendation_error(self):
         with patch(
             "app.routers.get_recommendation.get_recent_contents_service"
         ) as mock_recent:
@@ -64,7 +98,7 @@ class TestGetRecommendation:
             data = response.json()
             assert "detail" in data
 
-    def test_get_recommendation_bedrock_error(self, mock_dependencies):
+    def test_get_recommendation_bedrock_error(self):
         with patch(
             "app.routers.get_recommendation.get_recent_contents_service"
         ) as mock_recent, patch(
@@ -83,7 +117,7 @@ class TestGetRecommendation:
             data = response.json()
             assert "detail" in data
 
-    def test_get_recommendation_insufficient_contents(self, mock_dependencies):
+    def test_get_recommendation_insufficient_contents(self):
         with patch(
             "app.routers.get_recommendation.get_recent_contents_service"
         ) as mock_recent, patch(
@@ -94,7 +128,7 @@ class TestGetRecommendation:
                 {"title": "Movie 1", "type": "movie"},
                 {"title": "Movie 2", "type": "movie"},
             ]
-            mock_bedrock.return_value = '{"recommendations": []}'
+            mock_bedrock.return_value = ([], True)
 
             # テスト実行
             response = client.get("/content/recommend?content_type=movie")
@@ -103,3 +137,201 @@ class TestGetRecommendation:
             assert response.status_code == 200
             data = response.json()
             assert "recommendations" in data
+
+
+class TestRecommendationCache:
+    def setup_method(self):
+        async def premium_user():
+            return DependsData(
+                table=MagicMock(), user_id="test_user", is_premium=True
+            )
+
+        app.dependency_overrides[get_content_table_and_user_id] = premium_user
+
+    def teardown_method(self):
+        app.dependency_overrides = {}
+
+    def test_same_history_reuses_recommendations(self):
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.generate_recommendations_bedrock"
+        ) as mock_bedrock:
+            mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+            mock_bedrock.return_value = (
+                [
+                    {
+                        "title": "A",
+                        "desc": "a",
+                        "links": [{"site_name": "S", "url": "https://s"}],
+                    }
+                ],
+                True,
+            )
+
+            # テスト実行（同じ履歴で2回、履歴が変わって1回）
+            first = client.get("/content/recommend?content_type=movie")
+            second = client.get("/content/recommend?content_type=movie")
+            mock_recent.return_value = [{"title": "Movie 2", "type": "movie"}]
+            third = client.get("/content/recommend?content_type=movie")
+
+            # アサーション（推薦作品はJSON文字列ではなくオブジェクトで返す）
+            assert first.json() == second.json() == third.json()
+            assert first.json() == {
+                "recommendations": [
+                    {
+                        "title": "A",
+                        "desc": "a",
+                        "links": [{"site_name": "S", "url": "https://s"}],
+                    }
+                ],
+                "isPremium": True,
+            }
+            assert mock_bedrock.call_count == 2
+
+    def test_generation_runs_in_threadpool(self):
+        """Bedrockの呼び出しでイベントループを止めない"""
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.run_in_threadpool",
+            new_callable=AsyncMock,
+        ) as mock_threadpool:
+            mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+            mock_threadpool.return_value = ([], True)
+
+            # テスト実行
+            response = client.get("/content/recommend?content_type=movie")
+
+            # アサーション
+            assert response.status_code == 200
+            mock_threadpool.assert_awaited_once_with(
+                generate_recommendations_bedrock, "movie", ["Movie 1"]
+            )
+
+    def test_unverified_recommendation(self):
+        """未確認の作品は unverified を付けて返す"""
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.generate_recommendations_bedrock"
+        ) as mock_bedrock:
+            mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+            mock_bedrock.return_value = (
+                [{"title": "A", "desc": "a", "links": [], "unverified": True}],
+                True,
+            )
+
+            # テスト実行
+            response = client.get("/content/recommend?content_type=movie")
+
+            # アサーション
+            assert response.json()["recommendations"] == [
+                {"title": "A", "desc": "a", "links": [], "unverified": True}
+            ]
+
+
+class TestStreamRecommendation:
+    def setup_method(self):
+        async def premium_user():
+            return DependsData(
+                table=MagicMock(), user_id="test_user", is_premium=True
+            )
+
+        app.dependency_overrides[get_content_table_and_user_id] = premium_user
+
+    def teardown_method(self):
+        app.dependency_overrides = {}
+
+    @staticmethod
+    def parse_events(text):
+        events = []
+        for block in text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n")
+            events.append(
+                (
+                    event_line.removeprefix("event: "),
+                    json.loads(data_line.removeprefix("data: ")),
+                )
+            )
+        return events
+
+    def test_stream_and_cache(self):
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.stream_recommendations"
+        ) as mock_stream:
+            mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+            mock_stream.return_value = iter(
+                [
+                    ("recommendation", {"index": 1, "title": "B"}),
+                    ("recommendation", {"index": 0, "title": "A"}),
+                    ("done", {"total": 2, "candidates": 3}),
+                ]
+            )
+
+            # テスト実行
+            response = client.get(
+                "/content/recommend/stream?content_type=movie"
+            )
+            cached = client.get("/content/recommend/stream?content_type=movie")
+
+            # アサーション
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith(
+                "text/event-stream"
+            )
+            assert self.parse_events(response.text) == [
+                ("recommendation", {"index": 1, "title": "B"}),
+                ("recommendation", {"index": 0, "title": "A"}),
+                (
+                    "done",
+                    {"total": 2, "candidates": 3, "isPremium": True},
+                ),
+            ]
+            # 2回目は推薦順でキャッシュから返す
+            assert self.parse_events(cached.text) == [
+                ("recommendation", {"index": 0, "title": "A"}),
+                ("recommendation", {"index": 1, "title": "B"}),
+                (
+                    "done",
+                    {"total": 2, "candidates": 2, "isPremium": True},
+                ),
+            ]
+            mock_stream.assert_called_once()
+
+    def test_stream_error_event(self):
+        with patch(
+            "app.routers.get_recommendation.get_recent_contents_service"
+        ) as mock_recent, patch(
+            "app.routers.get_recommendation.stream_recommendations"
+        ) as mock_stream:
+            mock_recent.return_value = [{"title": "Movie 1", "type": "movie"}]
+            mock_stream.side_effect = Exception("Bedrock error")
+
+            # テスト実行
+            response = client.get(
+                "/content/recommend/stream?content_type=movie"
+            )
+
+            # アサーション
+            assert self.parse_events(response.text) == [
+                ("error", {"detail": "Bedrock error"})
+            ]
+
+    def test_stream_not_premium(self, mock_dependencies):
+        # テスト実行
+        response = client.get("/content/recommend/stream?content_type=movie")
+
+        # アサーション
+        assert self.parse_events(response.text) == [
+            (
+                "done",
+                {
+                    "total": 0,
+                    "message": "この機能は有料会員限定です",
+                    "isPremium": False,
+                },
+            )
+        ]
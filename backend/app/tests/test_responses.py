@@ -0,0 +1,75 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.responses import CONTENT_FIELDS, WATCHLIST_FIELDS, items_response
+from app.serialization_benchmark import (
+    main,
+    render_direct,
+    render_with_models,
+    sample_items,
+)
+
+item = {
+    "contentId": "c1",
+    "userId": "u1",
+    "type": "movie",
+    "title": "映画",
+    "date": "2024-01-02",
+    "year": Decimal("2024"),
+    "rank": Decimal("3"),
+    "year_rank": "2024#0003",
+}
+
+
+class TestItemsResponse:
+    def test_projects_fields_and_converts_decimal(self):
+        """レスポンスモデルの項目のみを返し、Decimalを数値に変換する"""
+        response = items_response([item], CONTENT_FIELDS, {"X-Test": "1"})
+
+        assert response.headers["x-test"] == "1"
+        assert response.media_type == "application/json"
+        body = json.loads(response.body)
+        assert list(body[0]) == list(CONTENT_FIELDS)
+        assert body[0]["year"] == 2024
+        assert body[0]["rank"] == 3
+        assert body[0]["notes"] is None
+        assert "year_rank" not in body[0]
+
+    def test_watchlist_fields(self):
+        response = items_response(
+            [{**item, "status": "to_watch"}], WATCHLIST_FIELDS
+        )
+
+        assert json.loads(response.body) == [
+            {
+                "contentId": "c1",
+                "type": "movie",
+                "title": "映画",
+                "userId": "u1",
+                "link": None,
+                "status": "to_watch",
+            }
+        ]
+
+    @patch("app.utils.orjson", None)
+    def test_without_orjson(self):
+        """orjsonがない環境でも同じJSONを返す"""
+        body = items_response([item], CONTENT_FIELDS).body
+
+        assert json.loads(body)[0]["year"] == 2024
+        assert "映画".encode() in body
+
+    def test_same_as_model_response(self):
+        """モデルを経由した従来のレスポンスと同じJSONになる"""
+        items = sample_items(20)
+
+        assert json.loads(render_direct(items)) == json.loads(
+            render_with_models(items)
+        )
+
+
+class TestSerializationBenchmark:
+    def test_main(self, capsys):
+        assert main(["--items", "10", "--repeat", "1"]) == 0
+        assert "speedup" in capsys.readouterr().out
@@ -0,0 +1,288 @@
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from fastapi.testclient import TestClient
+
+from app.crud.content_crud import (
+    SEARCH_PAGES,
+    add_content,
+    search_item_id,
+    update_search_index,
+)
+from app.main import app
+from app.schemas.content import RegisterContentData
+from app.search_tokenizer import index_tokens, matches_query, query_tokens
+from app.tests.conftest import mock_dependencies, mock_user_id  # noqa: F401
+
+client = TestClient(app)
+
+movie = {
+    "contentId": "c1",
+    "userId": mock_user_id,
+    "type": "movie",
+    "title": "千と千尋の神隠し",
+    "date": "2024-01-02",
+    "year": 2024,
+    "notes": "ＢＧＭが良かった",
+}
+book = {
+    "contentId": "c2",
+    "userId": mock_user_id,
+    "type": "book",
+    "title": "神様のボート",
+    "date": "2024-03-04",
+    "year": 2024,
+}
+
+
+def _fake_batch_get(table, items, stale=False):
+    # 転置インデックスのアイテムはitemsから作成し、要求されたキーのみ返す
+    postings = {}
+    for item in items:
+        for token in index_tokens(item["title"], item.get("notes")):
+            item_id = search_item_id(token, item["contentId"])
+            page = postings.setdefault(item_id, {"contentId": item_id})
+            page.setdefault(token, set()).add(item["contentId"])
+    stored = {**postings, **{item["contentId"]: item for item in items}}
+    if stale:
+        stored["#search"] = {"contentId": "#search", "stale": True}
+
+    def batch_get_item(RequestItems):
+        keys = RequestItems["Content"]["Keys"]
+        return {
+            "Responses": {
+                "Content": [
+                    stored[key["contentId"]]
+                    for key in keys
+                    if key["contentId"] in stored
+                ]
+            }
+        }
+
+    table.name = "Content"
+    table.meta.client.batch_get_item.side_effect = batch_get_item
+
+
+class TestSearchTokenizer:
+    def test_index_tokens(self):
+        """正規化した語ごとに1-gram・2-gramに分割する"""
+        assert index_tokens("ＡＢ c", None) == {"a", "b", "ab", "c"}
+
+    def test_query_tokens(self):
+        """検索語は2-gram（1文字の語は1-gram）に分割する"""
+        assert query_tokens("千尋 の") == {"千尋", "の"}
+        assert query_tokens("!!") == set()
+
+    def test_matches_query(self):
+        assert matches_query("千尋 bgm", "千と千尋", "ＢＧＭ")
+        assert not matches_query("尋千", "千と千尋")
+
+
+class TestUpdateSearchIndex:
+    def test_adds_and_deletes_changed_tokens(self):
+        """変更前後で増えたトークンは追加、なくなったトークンは削除する"""
+        table = MagicMock()
+        table.name = "Content"
+
+        update_search_index(
+            mock_user_id,
+            table,
+            [
+                (
+                    {"contentId": "c1", "year": 2024, "title": "ab"},
+                    {"contentId": "c1", "year": 2024, "title": "bc"},
+                )
+            ],
+        )
+
+        # 1回のトランザクションでまとめて更新する
+        table.update_item.assert_not_called()
+        table.meta.client.transact_write_items.assert_called_once()
+        updates = table.meta.client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        changes = {}
+        for update in updates:
+            update = update["Update"]
+            assert update["Key"]["userId"] == mock_user_id
+            # ADD・DELETEの両方を含む更新式（例: ADD #t0 :t0 DELETE #t1 :t1）
+            action = None
+            for word in update["UpdateExpression"].replace(",", "").split():
+                if word in ("ADD", "DELETE"):
+                    action = word
+                elif word.startswith("#"):
+                    token = update["ExpressionAttributeNames"][word]
+                    values = update["ExpressionAttributeValues"]
+                    assert values[word.replace("#", ":")] == {"c1"}
+                    changes[token] = action
+                    assert update["Key"]["contentId"] == search_item_id(
+                        token, "c1"
+                    )
+        assert changes == {
+            "a": "DELETE",
+            "ab": "DELETE",
+            "c": "ADD",
+            "bc": "ADD",
+        }
+
+    def test_watchlist_items_are_not_indexed(self):
+        """年度を持たないアイテムは索引しない"""
+        table = MagicMock()
+
+        update_search_index(
+            mock_user_id, table, [(None, {"contentId": "w1", "title": "ab"})]
+        )
+
+        table.meta.client.transact_write_items.assert_not_called()
+
+    def test_one_transaction_per_content(self):
+        """1件の登録では転置インデックスのアイテムを1回のリクエストで更新する"""
+        table = MagicMock()
+        table.name = "Content"
+
+        update_search_index(mock_user_id, table, [(None, movie)])
+
+        table.meta.client.transact_write_items.assert_called_once()
+        updates = table.meta.client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        item_ids = [update["Update"]["Key"]["contentId"] for update in updates]
+        assert len(item_ids) == len(set(item_ids))
+
+    def test_same_item_is_split_across_transactions(self):
+        """同じアイテムの更新を1回のトランザクションに2回含めない"""
+        table = MagicMock()
+        table.name = "Content"
+        # 1アイテムの更新式に含めるトークン数の上限を超える
+        content = {
+            "contentId": "c1",
+            "year": 2024,
+            "title": "".join(chr(0x4E00 + i) for i in range(3000)),
+        }
+
+        update_search_index(mock_user_id, table, [(None, content)])
+
+        for c in table.meta.client.transact_write_items.call_args_list:
+            item_ids = [
+                update["Update"]["Key"]["contentId"]
+                for update in c.kwargs["TransactItems"]
+            ]
+            assert len(item_ids) == len(set(item_ids))
+            assert len(item_ids) <= 100
+        assert table.meta.client.transact_write_items.call_count > 1
+
+    @patch("app.crud.content_crud.time.sleep")
+    def test_retries_transaction_conflict(self, mock_sleep):
+        """他のトランザクションとの競合で取り消された場合は再送する"""
+        table = MagicMock()
+        table.name = "Content"
+        conflict = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "TransactionConflict"},
+                ],
+            },
+            operation_name="TransactWriteItems",
+        )
+        table.meta.client.transact_write_items.side_effect = [conflict, None]
+
+        update_search_index(mock_user_id, table, [(None, movie)])
+
+        assert table.meta.client.transact_write_items.call_count == 2
+
+    def test_postings_are_split_into_pages(self):
+        """同じトークンでもコンテンツIDごとにページのアイテムに分かれる"""
+        item_ids = {search_item_id("の", f"c{i}") for i in range(200)}
+
+        assert len(item_ids) == SEARCH_PAGES
+        assert all(item_id.startswith("#search#") for item_id in item_ids)
+
+    def test_marks_index_stale_on_failure(self):
+        """転置インデックスの更新に失敗した場合は失敗を記録する"""
+        table = MagicMock()
+        table.name = "Content"
+        # コンテンツの登録は成功し、転置インデックスの更新は失敗する
+        table.meta.client.transact_write_items.side_effect = [
+            None,
+            Exception("too large"),
+        ]
+
+        add_content(RegisterContentData(**movie), table)
+
+        assert table.meta.client.transact_write_items.call_count == 2
+        table.update_item.assert_called_once_with(
+            Key={"contentId": "#search", "userId": mock_user_id},
+            UpdateExpression="SET #s = :s",
+            ExpressionAttributeNames={"#s": "stale"},
+            ExpressionAttributeValues={":s": True},
+        )
+
+
+class TestSearchContents:
+    def test_search(self, mock_dependencies):  # noqa: F811
+        """正常系: 全ての語を含むコンテンツのみ返す"""
+        _fake_batch_get(mock_dependencies, [movie, book])
+
+        response = client.get("/content/search", params={"q": "神 bgm"})
+
+        assert response.status_code == 200
+        assert [item["contentId"] for item in response.json()] == ["c1"]
+
+    def test_search_sorted_by_date(self, mock_dependencies):  # noqa: F811
+        _fake_batch_get(mock_dependencies, [movie, book])
+
+        response = client.get("/content/search", params={"q": "神"})
+
+        assert [item["contentId"] for item in response.json()] == [
+            "c2",
+            "c1",
+        ]
+
+    def test_prefix_and_type_filters(self, mock_dependencies):  # noqa: F811
+        """タイトルの前方一致・種別で絞り込む"""
+        _fake_batch_get(mock_dependencies, [movie, book])
+
+        by_prefix = client.get("/content/search", params={"prefix": "神様"})
+        by_type = client.get(
+            "/content/search", params={"q": "神", "type": "movie"}
+        )
+
+        assert [item["contentId"] for item in by_prefix.json()] == ["c2"]
+        assert [item["contentId"] for item in by_type.json()] == ["c1"]
+
+    def test_excludes_false_positives(self, mock_dependencies):  # noqa: F811
+        """2-gramは全て含むが語として含まないコンテンツは返さない"""
+        _fake_batch_get(
+            mock_dependencies,
+            [
+                {**book, "contentId": "c3", "title": "abc"},
+                {**book, "contentId": "c4", "title": "ab bc"},
+            ],
+        )
+
+        response = client.get("/content/search", params={"q": "abc"})
+
+        assert [item["contentId"] for item in response.json()] == ["c3"]
+
+    def test_stale_index_searches_all_contents(
+        self, mock_dependencies  # noqa: F811
+    ):
+        """転置インデックスの更新に失敗している場合は全件から検索する"""
+        _fake_batch_get(mock_dependencies, [], stale=True)
+        mock_dependencies.query.side_effect = [
+            {"Items": [movie, book]},
+            {"Items": []},
+        ]
+
+        response = client.get("/content/search", params={"q": "神 bgm"})
+
+        assert response.status_code == 200
+        assert [item["contentId"] for item in response.json()] == ["c1"]
+
+    def test_requires_query(self, mock_dependencies):  # noqa: F811
+        response = client.get("/content/search", params={"q": " "})
+
+        assert response.status_code == 400
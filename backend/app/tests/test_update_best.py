@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Key
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -47,7 +47,7 @@ def test_update_best_success(mock_dependencies):  # noqa: F811
             {"contentId": "content-3", "userId": mock_user_id, "rank": 1}
         ]
     }
-    mock_table.update_item = MagicMock()
+    mock_table.meta.client.transact_write_items = MagicMock()
 
     # エンドポイントを呼び出し
     response = client.post(
@@ -59,17 +59,56 @@ def test_update_best_success(mock_dependencies):  # noqa: F811
     assert response.status_code == 200
     assert response.json() == {"message": "Best Content update successfully"}
 
-    # 実際の KeyConditionExpression, FilterExpression を作成
-    expected_key_condition = Key("userId").eq(mock_user_id)
-    expected_filter_expression = Attr("year").eq(2024)
+    # 実際の KeyConditionExpression を作成（年度で前方一致）
+    expected_key_condition = Key("userId").eq(mock_user_id) & Key(
+        "year_rank"
+    ).begins_with("2024#")
 
     # モックが呼ばれたか検証
     mock_table.query.assert_called_once_with(
-        IndexName="RankIndex",
+        IndexName="YearRankIndex",
         KeyConditionExpression=expected_key_condition,
-        FilterExpression=expected_filter_expression,
     )
-    assert mock_table.update_item.call_count == 3  # 削除用1回 + 更新用2回
+    # 削除1件 + 更新2件 + データのバージョンの加算が1回のトランザクションで実行されること
+    mock_table.update_item.assert_not_called()
+    mock_table.meta.client.transact_write_items.assert_called_once()
+    transact_items = mock_table.meta.client.transact_write_items.call_args[1][
+        "TransactItems"
+    ]
+    assert [item["Update"]["Key"]["contentId"] for item in transact_items] == [
+        "content-1",
+        "content-2",
+        "content-3",
+        "#summary",
+    ]
+    assert transact_items[0]["Update"]["ExpressionAttributeValues"] == {
+        ":r": 1,
+        ":yr": "2024#0001",
+    }
+    assert (
+        transact_items[2]["Update"]["UpdateExpression"] == "REMOVE #rnk, #yr"
+    )
+
+
+def test_update_best_chunked(mock_dependencies):  # noqa: F811
+    """正常系: トランザクション上限を超える場合は分割して実行されることを確認"""
+    mock_table = mock_dependencies
+    mock_table.query.return_value = {
+        "Items": [
+            {"contentId": f"old-{i}", "userId": mock_user_id, "rank": i}
+            for i in range(1, 101)
+        ]
+    }
+    mock_table.meta.client.transact_write_items = MagicMock()
+
+    response = client.post(
+        "/content/update-best",
+        json=[content.dict() for content in mock_contents],
+    )
+
+    assert response.status_code == 200
+    calls = mock_table.meta.client.transact_write_items.call_args_list
+    assert [len(c.kwargs["TransactItems"]) for c in calls] == [100, 3]
 
 
 def test_update_best_failure_empty_body(mock_dependencies):  # noqa: F811
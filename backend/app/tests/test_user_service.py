@@ -1,8 +1,10 @@
+import time
 from unittest.mock import Mock, patch
 import pytest
 from fastapi import HTTPException, Request
 
 from app.services.user_service import (
+    clear_token_caches,
     get_sub_from_id_token,
     create_user_service,
     get_user_id,
@@ -12,6 +14,12 @@ from app.schemas.user import User
 
 
 class TestGetSubFromIdToken:
+    def setup_method(self):
+        clear_token_caches()
+
+    def teardown_method(self):
+        clear_token_caches()
+
     @patch("app.services.user_service.PyJWKClient")
     @patch("app.services.user_service.jwt.decode")
     def test_get_sub_from_id_token_success(
@@ -56,6 +64,46 @@ class TestGetSubFromIdToken:
         # アサーション
         assert result is None
 
+    @patch("app.services.user_service.PyJWKClient")
+    @patch("app.services.user_service.jwt.decode")
+    def test_get_sub_from_id_token_cached(
+        self, mock_jwt_decode, mock_jwk_client
+    ):
+        # 同じトークンは有効期限まで再検証しない
+        mock_jwt_decode.return_value = {
+            "sub": "test_user_id",
+            "email": "test@example.com",
+            "cognito:username": "testuser",
+            "exp": time.time() + 3600,
+        }
+
+        # テスト実行
+        first = get_sub_from_id_token("test_token")
+        second = get_sub_from_id_token("test_token")
+
+        # アサーション
+        assert (
+            first == second == ("test_user_id", "test@example.com", "testuser")
+        )
+        mock_jwk_client.assert_called_once()
+        mock_jwt_decode.assert_called_once()
+
+    @patch("app.services.user_service.PyJWKClient")
+    @patch("app.services.user_service.jwt.decode")
+    def test_get_sub_from_id_token_shares_jwk_client(
+        self, mock_jwt_decode, mock_jwk_client
+    ):
+        # 異なるトークンでもJWKSクライアント（取得済みの鍵）を共有する
+        mock_jwt_decode.return_value = {"sub": "test_user_id"}
+
+        # テスト実行
+        get_sub_from_id_token("token_1")
+        get_sub_from_id_token("token_2")
+
+        # アサーション（expがないトークンはキャッシュしない）
+        mock_jwk_client.assert_called_once()
+        assert mock_jwt_decode.call_count == 2
+
 
 class TestCreateUserService:
     @patch("app.services.user_service.save_user")
@@ -1,4 +1,13 @@
-from app.utils import extract_year_from_date
+from decimal import Decimal
+
+import pytest
+
+from app.utils import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    extract_year_from_date,
+)
 
 
 class TestExtractYearFromDate:
@@ -64,3 +73,29 @@ class TestExtractYearFromDate:
         except (ValueError, IndexError, AttributeError):
             # 例外が発生した場合は正常
             pass
+
+
+class TestCursor:
+    def test_encode_decode_round_trip(self):
+        """LastEvaluatedKeyをカーソル化して復元できることをテスト"""
+        key = {"contentId": "c1", "userId": "u1", "year": Decimal("2024")}
+
+        cursor = encode_cursor(key)
+
+        # アサーション
+        assert isinstance(cursor, str)
+        assert decode_cursor(cursor) == {
+            "contentId": "c1",
+            "userId": "u1",
+            "year": 2024,
+        }
+
+    def test_encode_cursor_none(self):
+        """最終ページの場合はカーソルがNoneになることをテスト"""
+        assert encode_cursor(None) is None
+        assert decode_cursor(None) is None
+
+    def test_decode_cursor_invalid(self):
+        """不正なカーソルの場合に例外が発生することをテスト"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
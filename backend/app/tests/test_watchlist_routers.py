@@ -56,6 +56,23 @@ class TestAddWatchlist:
             data = response.json()
             assert "detail" in data
 
+    def test_add_watchlist_reserved_content_id(self, mock_dependencies):
+        # テストデータ（集計アイテムと衝突するcontentId）
+        watchlist_data = {
+            "contentId": "#summary",
+            "title": "Test Movie",
+            "type": "movie",
+            "status": "pending",
+        }
+
+        # テスト実行
+        response = client.post("/content/addWatchlist", json=watchlist_data)
+
+        # アサーション
+        assert response.status_code == 400
+        mock_dependencies.update_item.assert_not_called()
+        mock_dependencies.put_item.assert_not_called()
+
 
 class TestDeleteWatchlist:
     def test_delete_watchlist_success(self, mock_dependencies):
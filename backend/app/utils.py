@@ -1,4 +1,19 @@
+import base64
+import binascii
+import hashlib
+import json
 from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+
+try:
+    # 高速なJSONエンコーダー（未インストールの環境では標準のjsonを使う）
+    import orjson
+except ImportError:
+    orjson = None
+
+# ETagに含めるレスポンス形式のバージョン（一覧APIの形式を変更した場合は加算する）
+ETAG_FORMAT_VERSION = 1
 
 
 def extract_year_from_date(date: str) -> int:
@@ -17,3 +32,170 @@ def extract_year_from_date(date: str) -> int:
     except ValueError:
         print(f"Invalid date format for: {date}")
         return None
+
+
+class InvalidCursorError(ValueError):
+    """ページング用カーソルの形式が不正な場合に送出する例外"""
+
+
+# 集計アイテム（#summary）・全文検索のアイテム（#search...）など、
+# システムが作成するアイテムのcontentIdの接頭辞（ユーザーのコンテンツには使えない）
+RESERVED_CONTENT_ID_PREFIX = "#"
+
+
+class InvalidContentIdError(ValueError):
+    """contentIdがシステムのアイテムと衝突する場合に送出する例外"""
+
+
+def validate_content_id(content_id: str) -> None:
+    """
+    ユーザーが指定したcontentIdを検証する
+
+    Raises:
+        InvalidContentIdError: 予約済みの接頭辞で始まる場合
+    """
+    if content_id.startswith(RESERVED_CONTENT_ID_PREFIX):
+        raise InvalidContentIdError(
+            f"contentId: must not start with '{RESERVED_CONTENT_ID_PREFIX}'"
+        )
+
+
+def _decimal_default(value):
+    # DynamoDBのNumber型(Decimal)をJSONに変換できる型へ置き換える
+    if isinstance(value, Decimal):
+        return (
+            int(value) if value == value.to_integral_value() else float(value)
+        )
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not serializable"
+    )
+
+
+def dumps_json(value: Any) -> str:
+    """
+    DynamoDBのアイテム（Number型のDecimalを含む）をJSON文字列に変換する
+
+    Args:
+        value (Any): 変換する値
+
+    Returns:
+        str: 区切りの空白を省いたJSON文字列（日本語はエスケープしない）
+    """
+    return json.dumps(
+        value,
+        default=_decimal_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def dumps_json_bytes(value: Any) -> bytes:
+    """
+    DynamoDBのアイテム（Number型のDecimalを含む）をJSONのバイト列に変換する
+    （orjsonがある場合はorjsonで変換する）
+
+    Args:
+        value (Any): 変換する値
+
+    Returns:
+        bytes: UTF-8のJSON（dumps_jsonと同じ内容）
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_decimal_default)
+    return dumps_json(value).encode()
+
+
+def project_items(items: Iterable[dict], fields: Sequence[str]) -> list[dict]:
+    """
+    アイテムを指定した項目のみの辞書に変換する（存在しない項目はNone）
+
+    Args:
+        items (Iterable[dict]): DynamoDBのアイテム
+        fields (Sequence[str]): 項目名
+
+    Returns:
+        list[dict]: 項目の順に並んだ辞書のリスト
+    """
+    return [{name: item.get(name) for name in fields} for item in items]
+
+
+def encode_cursor(last_evaluated_key: dict | None) -> str | None:
+    """
+    DynamoDBのLastEvaluatedKeyをクライアントに返す不透明なカーソル文字列に変換する
+
+    Args:
+        last_evaluated_key (dict | None): クエリ結果のLastEvaluatedKey
+
+    Returns:
+        str | None: URLセーフなカーソル文字列（最終ページの場合None）
+    """
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(
+        last_evaluated_key, default=_decimal_default, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> dict | None:
+    """
+    カーソル文字列をDynamoDBのExclusiveStartKeyに復元する
+
+    Args:
+        cursor (str | None): encode_cursorで生成したカーソル文字列
+
+    Returns:
+        dict | None: ExclusiveStartKey（カーソル未指定の場合None）
+
+    Raises:
+        InvalidCursorError: カーソルの形式が不正な場合
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise InvalidCursorError("Invalid cursor")
+    if not isinstance(key, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return key
+
+
+def data_etag(user_id: str, version: int) -> str:
+    """
+    ユーザーのデータのバージョンから弱いETagを作成する
+
+    同じブラウザで別のユーザーがログインした場合に一致しないよう、
+    ユーザーIDのハッシュを含める。
+
+    Args:
+        user_id (str): ユーザーID
+        version (int): データのバージョン
+
+    Returns:
+        str: ETag（例: W/"1a2b3c4d5e6f7a8b-1-12"）
+    """
+    digest = hashlib.sha256(user_id.encode()).hexdigest()[:16]
+    return f'W/"{digest}-{ETAG_FORMAT_VERSION}-{int(version)}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    If-None-Matchヘッダーが指定したETagに一致するか（弱い比較）を返す
+
+    Args:
+        if_none_match (str | None): If-None-Matchヘッダーの値
+        etag (str | None): 現在のETag（書き込みの直後でETagがない場合はNone）
+
+    Returns:
+        bool: 一致する場合True（ETagがない場合は常にFalse）
+    """
+    if not if_none_match or etag is None:
+        return False
+    current = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == current:
+            return True
+    return False
@@ -43,20 +43,20 @@ describe("useGetRecommend", () => {
       type: "movie",
       title: "おすすめ映画1",
       desc: "素晴らしい映画です",
-      link: "https://example.com/movie1",
+      links: [{ site_name: "TMDB", url: "https://example.com/movie1" }],
     },
     {
       type: "movie",
       title: "おすすめ映画2",
       desc: "感動的な映画です",
-      link: "https://example.com/movie2",
+      links: [{ site_name: "TMDB", url: "https://example.com/movie2" }],
     },
   ];
 
+  // recommendations はJSON文字列ではなくオブジェクトの配列で返却される
   const mockApiResponse = {
-    recommendations: JSON.stringify({
-      recommendations: mockRecommendations,
-    }),
+    recommendations: mockRecommendations,
+    isPremium: true,
   };
 
   it("初期状態が正しく設定されている", () => {
@@ -103,7 +103,12 @@ describe("useGetRecommend", () => {
     expect(mockResponse.json).toHaveBeenCalledTimes(1);
 
     // 結果が正しいかチェック
-    expect(recommendResult).toEqual(mockRecommendations);
+    expect(recommendResult).toEqual({
+      success: true,
+      recommendations: mockRecommendations,
+      isPremium: true,
+      message: undefined,
+    });
     expect(result.current.loading).toBe(false);
     expect(result.current.error).toBe(null);
   });
@@ -114,14 +119,15 @@ describe("useGetRecommend", () => {
         type: "book",
         title: "おすすめ本1",
         desc: "面白い本です",
-        link: "https://example.com/book1",
+        links: [
+          { site_name: "Google Books", url: "https://example.com/book1" },
+        ],
       },
     ];
 
     const mockBookResponse = {
-      recommendations: JSON.stringify({
-        recommendations: bookRecommendations,
-      }),
+      recommendations: bookRecommendations,
+      isPremium: true,
     };
 
     const mockResponse = {
@@ -147,7 +153,12 @@ describe("useGetRecommend", () => {
     );
 
     // 結果が正しいかチェック
-    expect(recommendResult).toEqual(bookRecommendations);
+    expect(recommendResult).toEqual({
+      success: true,
+      recommendations: bookRecommendations,
+      isPremium: true,
+      message: undefined,
+    });
   });
 
   it("blogタイプでレコメンドの取得に成功した場合", async () => {
@@ -156,14 +167,13 @@ describe("useGetRecommend", () => {
         type: "blog",
         title: "おすすめブログ1",
         desc: "有益な情報です",
-        link: "https://example.com/blog1",
+        links: [],
       },
     ];
 
     const mockBlogResponse = {
-      recommendations: JSON.stringify({
-        recommendations: blogRecommendations,
-      }),
+      recommendations: blogRecommendations,
+      isPremium: true,
     };
 
     const mockResponse = {
@@ -189,7 +199,12 @@ describe("useGetRecommend", () => {
     );
 
     // 結果が正しいかチェック
-    expect(recommendResult).toEqual(blogRecommendations);
+    expect(recommendResult).toEqual({
+      success: true,
+      recommendations: blogRecommendations,
+      isPremium: true,
+      message: undefined,
+    });
   });
 
   it("レコメンドの取得に失敗した場合（レスポンスエラー）", async () => {
@@ -248,17 +263,25 @@ describe("useGetRecommend", () => {
     expect(result.current.error).toBe("Invalid JSON");
   });
 
-  it("JSONパースエラーの場合（二重目のJSON.parse()）", async () => {
-    // 無効なJSONを含むレスポンス
-    const mockInvalidJsonResponse = {
-      recommendations: "invalid json string",
-    };
+  it("未確認の作品もそのまま返される（再パースなし）", async () => {
+    const unverifiedRecommendations: RecommendContentsType[] = [
+      {
+        title: "おすすめ映画3",
+        desc: "提供元の障害中",
+        links: [],
+        unverified: true,
+      },
+    ];
+    const parseSpy = jest.spyOn(JSON, "parse");
 
     const mockResponse = {
       ok: true,
       status: 200,
       statusText: "OK",
-      json: jest.fn().mockResolvedValue(mockInvalidJsonResponse),
+      json: jest.fn().mockResolvedValue({
+        recommendations: unverifiedRecommendations,
+        isPremium: true,
+      }),
     } as unknown as Response;
 
     mockFetch.mockResolvedValueOnce(mockResponse);
@@ -270,13 +293,15 @@ describe("useGetRecommend", () => {
       recommendResult = await result.current.getRecommend("movie");
     });
 
-    // エラー結果が正しいかチェック
+    // 結果が正しいかチェック
     expect(recommendResult).toEqual({
-      success: false,
-      message: expect.stringContaining("Unexpected token"),
+      success: true,
+      recommendations: unverifiedRecommendations,
+      isPremium: true,
+      message: undefined,
     });
-    expect(result.current.loading).toBe(false);
-    expect(result.current.error).toContain("Unexpected token");
+    expect(parseSpy).not.toHaveBeenCalled();
+    parseSpy.mockRestore();
   });
 
   it("ネットワークエラーの場合", async () => {
@@ -324,9 +349,8 @@ describe("useGetRecommend", () => {
 
   it("空のレコメンドリストでも正常に処理される", async () => {
     const mockEmptyResponse = {
-      recommendations: JSON.stringify({
-        recommendations: [],
-      }),
+      recommendations: [],
+      isPremium: true,
     };
 
     const mockResponse = {
@@ -346,7 +370,12 @@ describe("useGetRecommend", () => {
     });
 
     // 空の配列が返されることを確認
-    expect(recommendResult).toEqual([]);
+    expect(recommendResult).toEqual({
+      success: true,
+      recommendations: [],
+      isPremium: true,
+      message: undefined,
+    });
     expect(result.current.loading).toBe(false);
     expect(result.current.error).toBe(null);
   });
@@ -420,10 +449,8 @@ describe("useGetRecommend", () => {
 
   it("recommendationsプロパティが存在しない場合", async () => {
     const mockMalformedResponse = {
-      recommendations: JSON.stringify({
-        // recommendationsプロパティがない
-        data: mockRecommendations,
-      }),
+      // recommendationsプロパティがない
+      isPremium: true,
     };
 
     const mockResponse = {
@@ -442,8 +469,13 @@ describe("useGetRecommend", () => {
       recommendResult = await result.current.getRecommend("movie");
     });
 
-    // undefinedが返されることを確認
-    expect(recommendResult).toBeUndefined();
+    // recommendationsがundefinedで返されることを確認
+    expect(recommendResult).toEqual({
+      success: true,
+      recommendations: undefined,
+      isPremium: true,
+      message: undefined,
+    });
     expect(result.current.loading).toBe(false);
     expect(result.current.error).toBe(null);
   });
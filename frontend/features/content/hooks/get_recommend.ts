@@ -1,6 +1,7 @@
 import { useState } from "react";
 import {
   UseGetRecommendReturn,
+  GetRecommendResponse,
   GetRecommendResult,
   ContentType,
 } from "../types/content_type";
@@ -30,7 +31,7 @@ export const useGetRecommend = (): UseGetRecommendReturn => {
       if (!response.ok) {
         throw new Error(`Failed to get recommend: ${response.statusText}`);
       }
-      const data = await response.json();
+      const data: GetRecommendResponse = await response.json();
       console.log("data: ", data);
 
       // isPremium が false の場合や message がある場合は、そのまま返す
@@ -46,16 +47,10 @@ export const useGetRecommend = (): UseGetRecommendReturn => {
         };
       }
 
-      // recommendations が JSON 文字列の場合はパース
-      let recommendations = data?.recommendations;
-      if (typeof recommendations === "string") {
-        const jsonData = JSON.parse(recommendations);
-        recommendations = jsonData?.recommendations || [];
-      }
-
+      // recommendations はオブジェクトの配列で返却される（再度のパースは不要）
       return {
         success: true,
-        recommendations: recommendations,
+        recommendations: data?.recommendations,
         isPremium: data?.isPremium,
         message: data?.message,
       };
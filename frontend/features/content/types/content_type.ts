@@ -32,11 +32,25 @@ export type WatchlistDataType = {
   status?: string;
 };
 
+export type RecommendLinkType = {
+  site_name: string;
+  url: string;
+};
+
 export type RecommendContentsType = {
   type?: ContentType;
   title: string;
   desc: string;
-  link: string;
+  links?: RecommendLinkType[];
+  // 提供元の障害中で実在確認を行っていない場合 true
+  unverified?: boolean;
+};
+
+// GET /content/recommend のレスポンス
+export type GetRecommendResponse = {
+  recommendations?: RecommendContentsType[];
+  message?: string;
+  isPremium?: boolean;
 };
 
 // TODO: 不要そうであれば後ほど削除